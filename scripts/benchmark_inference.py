@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+CPU per-window latency of SeizureTransformer inference variants.
+
+Times forward passes of the stock model and the inference-optimized variants
+built by `seizure_evaluation.inference.models.load_model` on random windows,
+and checks each variant's max absolute deviation from the stock output.
+Uses Wu's `model.pth` when present, otherwise randomly initialized weights
+(timings do not depend on the weight values).
+
+Usage:
+    python scripts/benchmark_inference.py --batch_size 32 --repeats 5 --threads 8
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+import torch
+import wu_2025.utils
+from wu_2025.architecture import SeizureTransformer
+
+from seizure_evaluation.inference.models import load_model
+
+VARIANTS = {
+    "stock": {},
+    "batch_first": {"batch_first": True},
+    "optimize": {"optimize": True},
+    "optimize+batch_first": {"optimize": True, "batch_first": True},
+}
+
+
+def stock_loader(device: str) -> torch.nn.Module:
+    weights = Path(wu_2025.utils.__file__).parent / "model.pth"
+    if weights.exists():
+        return wu_2025.utils.load_models(device)
+    print("   model.pth not found: using randomly initialized weights")
+    torch.manual_seed(0)
+    return SeizureTransformer().to(device)
+
+
+def time_forward(model, x, repeats: int) -> list[float]:
+    with torch.inference_mode():
+        model(x)  # warm-up (allocator, oneDNN primitive caches)
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model(x)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch_size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=0, help="torch threads (0 = default)")
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=list(VARIANTS))
+    parser.add_argument("--out", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    print(f"torch {torch.__version__}, {torch.get_num_threads()} threads, batch {args.batch_size}")
+
+    torch.manual_seed(1)
+    x = torch.randn(args.batch_size, 19, 15360)
+    with torch.inference_mode():
+        reference = load_model("cpu", loader=stock_loader)(x)
+
+    report = {}
+    for name in args.variants:
+        model = load_model("cpu", loader=stock_loader, **VARIANTS[name])
+        timings = time_forward(model, x, args.repeats)
+        with torch.inference_mode():
+            max_dev = float((model(x) - reference).abs().max())
+        per_window_ms = 1000 * statistics.median(timings) / args.batch_size
+        report[name] = {"per_window_ms": per_window_ms, "max_abs_dev": max_dev}
+
+    base = report.get("stock", {}).get("per_window_ms")
+    print(f"\n{'variant':<24}{'ms/window':>12}{'speedup':>10}{'max|dev|':>12}")
+    for name, row in report.items():
+        speedup = f"{base / row['per_window_ms']:.2f}x" if base else "-"
+        print(f"{name:<24}{row['per_window_ms']:>12.2f}{speedup:>10}{row['max_abs_dev']:>12.2e}")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
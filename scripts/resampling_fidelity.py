@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Fidelity of polyphase resampling against Wu's FFT resampling.
+
+For each input recording, both `--resample` methods of `tusz-eval` are run
+(`normalize_and_resample(..., method="fft" | "polyphase")`). The report gives
+the deviation of the resampled signal, the resampling time, and the deviation
+of the model's per-sample probabilities, including decision flips at the paper
+threshold. Inputs are EDF files (`--edf`) or synthetic 1/f-like recordings at
+`--rates`. Uses Wu's `model.pth` when present, otherwise randomly initialized
+weights (enough to see the deviation propagate, not for absolute numbers).
+
+For a full-dataset sign-off, run `tusz-eval --resample polyphase` and compare
+its checkpoint with `python -m seizure_evaluation.inference.parity`.
+
+Usage:
+    python scripts/resampling_fidelity.py --rates 250 400 512 --seconds 300
+    python scripts/resampling_fidelity.py --edf data/tusz/edf/dev/**/*.edf --out fidelity.json
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+import wu_2025.utils
+from scipy.signal import lfilter
+from wu_2025.architecture import SeizureTransformer
+
+from seizure_evaluation.inference.dataset import (
+    RESAMPLE_METHODS,
+    get_dataloader,
+    normalize_and_resample,
+)
+from seizure_evaluation.inference.models import load_model
+from seizure_evaluation.inference.predict import predict_probabilities
+from seizure_evaluation.tusz.cli import load_recording
+
+THRESHOLD = 0.8
+
+
+def stock_loader(device: str) -> torch.nn.Module:
+    weights = Path(wu_2025.utils.__file__).parent / "model.pth"
+    if weights.exists():
+        return wu_2025.utils.load_models(device)
+    print("   model.pth not found: using randomly initialized weights")
+    torch.manual_seed(0)
+    return SeizureTransformer().to(device)
+
+
+def synthetic_recording(fs: float, seconds: float, seed: int = 0) -> np.ndarray:
+    """19-channel low-pass-weighted noise in microvolts (EEG-like spectrum)."""
+    rng = np.random.default_rng(seed)
+    white = rng.standard_normal((19, int(fs * seconds)))
+    return 30.0 * lfilter([1.0], [1.0, -0.95], white, axis=1)
+
+
+def deviation(a: np.ndarray, b: np.ndarray) -> dict[str, float]:
+    diff = np.abs(np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64))
+    return {
+        "max_abs": float(diff.max()),
+        "mean_abs": float(diff.mean()),
+        "p99_abs": float(np.percentile(diff, 99)),
+    }
+
+
+def compare(model, data: np.ndarray, fs: float, batch_size: int) -> dict:
+    row: dict = {"fs": fs, "seconds": data.shape[1] / fs}
+    resampled, probabilities = {}, {}
+    for method in RESAMPLE_METHODS:
+        start = time.perf_counter()
+        resampled[method] = normalize_and_resample(data, fs, method=method)
+        row[f"{method}_resample_ms"] = 1000 * (time.perf_counter() - start)
+        loader = get_dataloader(data, fs=fs, batch_size=batch_size, resample_method=method)
+        probabilities[method] = predict_probabilities(model, loader, "cpu", data.shape[1])
+
+    row["signal"] = deviation(resampled["polyphase"], resampled["fft"])
+    row["probabilities"] = deviation(probabilities["polyphase"], probabilities["fft"])
+    flips = (probabilities["polyphase"] >= THRESHOLD) != (probabilities["fft"] >= THRESHOLD)
+    row["probabilities"]["decision_flip_fraction"] = float(flips.mean())
+    return row
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edf", nargs="*", default=[], help="EDF files (default: synthetic)")
+    parser.add_argument("--rates", nargs="+", type=float, default=[250, 400, 512])
+    parser.add_argument("--seconds", type=float, default=300, help="Synthetic recording length")
+    parser.add_argument("--batch_size", type=int, default=8)
+    parser.add_argument("--out", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    model = load_model("cpu", loader=stock_loader)
+    if args.edf:
+        inputs = ((Path(p).stem, *load_recording(Path(p))[:2]) for p in args.edf)
+    else:
+        inputs = (
+            (f"synthetic_{fs:g}hz", synthetic_recording(fs, args.seconds), fs) for fs in args.rates
+        )
+
+    report = {}
+    print(
+        f"\n{'recording':<28}{'fs':>6}{'fft ms':>9}{'poly ms':>9}"
+        f"{'signal max':>12}{'prob max':>11}{'prob p99':>11}{'flips':>9}"
+    )
+    for name, data, fs in inputs:
+        row = compare(model, data, fs, args.batch_size)
+        report[name] = row
+        print(
+            f"{name:<28}{fs:>6g}{row['fft_resample_ms']:>9.1f}{row['polyphase_resample_ms']:>9.1f}"
+            f"{row['signal']['max_abs']:>12.2e}{row['probabilities']['max_abs']:>11.2e}"
+            f"{row['probabilities']['p99_abs']:>11.2e}"
+            f"{row['probabilities']['decision_flip_fraction']:>9.2%}"
+        )
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,6 @@
+"""Inference adapters layered on top of the vendored SeizureTransformer.
+
+`wu_2025/` is read-only (see docs/VENDORED_SOURCES.md). Faster drop-in
+replacements for its dataloader and prediction helpers live here and are
+used by `tusz-eval`; model weights and architecture still come from wu_2025.
+"""
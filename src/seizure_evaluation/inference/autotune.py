@@ -0,0 +1,204 @@
+"""
+Startup calibration of batch size and torch thread count for CPU inference.
+
+`autotune` times forward passes of the loaded model on random windows over a
+ladder of batch sizes (ascending) and thread counts. It then picks the
+configuration with the highest windows/s whose peak RSS stayed under a budget.
+Peak RSS is the process high-water mark (`ru_maxrss`). It never decreases, so
+batch sizes are tried in ascending order and the ladder stops at the first
+batch that exceeds the budget, or once throughput has stopped improving.
+
+Choices are persisted in a JSON cache keyed by host (hostname, CPU model, CPU
+count, torch version) and by the calibration settings (model variant, budget,
+ladders), so later runs on the same host skip calibration.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import resource
+import statistics
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import torch
+
+from seizure_evaluation.inference.preprocessing import WINDOW_SIZE
+
+DEFAULT_CACHE_FILE = Path.home() / ".cache" / "seizure_evaluation" / "autotune.json"
+DEFAULT_BATCH_SIZES = (8, 16, 32, 64, 128, 256, 512)
+N_CHANNELS = 19
+
+# (batch_size, threads) -> (seconds per forward, peak RSS bytes after it)
+Measure = Callable[[int, int], tuple[float, int]]
+
+
+@dataclass
+class TuneResult:
+    """Chosen configuration and what it measured."""
+
+    batch_size: int
+    threads: int
+    windows_per_sec: float
+    peak_rss_bytes: int
+
+
+def peak_rss_bytes() -> int:
+    """Process peak resident set size (Linux reports kilobytes, macOS bytes)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+def default_thread_ladder() -> list[int]:
+    """Current torch thread count, and its half and quarter (deduplicated, >= 1)."""
+    n = torch.get_num_threads()
+    return sorted({n, max(1, n // 2), max(1, n // 4)}, reverse=True)
+
+
+def host_key() -> str:
+    """Identifier of this host's CPU and torch build."""
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu = next((line.split(":", 1)[1].strip() for line in f if "model name" in line), cpu)
+    except OSError:
+        pass
+    return f"{platform.node()}|{platform.machine()}|{cpu}|{os.cpu_count()}|torch{torch.__version__}"
+
+
+def model_measure(
+    model: torch.nn.Module, repeats: int = 2, window_size: int = WINDOW_SIZE
+) -> Measure:
+    """Measure function timing `model` on random (batch, 19, window_size) inputs."""
+
+    def measure(batch_size: int, threads: int) -> tuple[float, int]:
+        torch.set_num_threads(threads)
+        x = torch.randn(batch_size, N_CHANNELS, window_size)
+        timings = []
+        with torch.inference_mode():
+            model(x)  # warm-up
+            for _ in range(repeats):
+                start = time.perf_counter()
+                model(x)
+                timings.append(time.perf_counter() - start)
+        return statistics.median(timings), peak_rss_bytes()
+
+    return measure
+
+
+def loader_measure(
+    model_loader: Callable[[str], torch.nn.Module], device: str = "cpu", repeats: int = 2
+) -> Measure:
+    """Like `model_measure`, but loads the model on first use (skipped on a cache hit)."""
+    measure: Measure | None = None
+
+    def lazy(batch_size: int, threads: int) -> tuple[float, int]:
+        nonlocal measure
+        if measure is None:
+            measure = model_measure(model_loader(device).eval(), repeats=repeats)
+        return measure(batch_size, threads)
+
+    return lazy
+
+
+def total_memory_bytes() -> int:
+    """Physical memory of the host."""
+    return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+
+
+def calibrate(
+    measure: Measure,
+    rss_budget_bytes: int,
+    batch_sizes: Sequence[int] = DEFAULT_BATCH_SIZES,
+    threads: Sequence[int] = (1,),
+    patience: int = 2,
+) -> TuneResult:
+    """
+    Pick the fastest (batch_size, threads) whose peak RSS stays under budget.
+
+    Args:
+        measure: Function timing one forward pass for (batch_size, threads)
+        rss_budget_bytes: Peak RSS budget for the process
+        batch_sizes: Batch ladder (tried in ascending order)
+        threads: Thread counts tried at each batch size
+        patience: Stop after this many consecutive batch sizes without a new best
+
+    Returns:
+        TuneResult
+
+    Raises:
+        RuntimeError: If even the smallest configuration exceeds the budget
+    """
+    best: TuneResult | None = None
+    stale = 0
+    for batch_size in sorted(batch_sizes):
+        improved = over_budget = False
+        for n_threads in threads:
+            seconds, peak = measure(batch_size, n_threads)
+            if peak > rss_budget_bytes:
+                over_budget = True
+                break
+            result = TuneResult(batch_size, n_threads, batch_size / seconds, peak)
+            print(
+                f"   batch {batch_size:>4} x {n_threads:>3} threads: "
+                f"{result.windows_per_sec:.2f} windows/s, peak RSS {peak / 2**30:.2f} GiB"
+            )
+            if best is None or result.windows_per_sec > best.windows_per_sec:
+                best, improved = result, True
+        if over_budget:
+            print(f"   batch {batch_size} exceeds the RSS budget; stopping")
+            break
+        stale = 0 if improved else stale + 1
+        if stale >= patience:
+            break
+
+    if best is None:
+        raise RuntimeError(
+            f"No configuration fits the RSS budget of {rss_budget_bytes / 2**30:.2f} GiB"
+        )
+    return best
+
+
+def autotune(
+    measure: Measure,
+    rss_budget_bytes: int,
+    variant: str = "fp32",
+    batch_sizes: Sequence[int] = DEFAULT_BATCH_SIZES,
+    threads: Sequence[int] | None = None,
+    cache_file: Path = DEFAULT_CACHE_FILE,
+) -> TuneResult:
+    """
+    Cached `calibrate`: reuse this host's earlier choice for the same settings.
+
+    Args:
+        measure: See `calibrate` (typically `model_measure(model)`)
+        rss_budget_bytes: Peak RSS budget
+        variant: Model variant label (precision/backend flags); part of the cache key
+        batch_sizes: Batch ladder
+        threads: Thread ladder (default: `default_thread_ladder()`)
+        cache_file: JSON cache path
+
+    Returns:
+        TuneResult
+    """
+    threads = list(threads or default_thread_ladder())
+    settings = f"{variant}|budget={rss_budget_bytes}|b={list(batch_sizes)}|t={threads}"
+    cache_file = Path(cache_file)
+    cache = json.loads(cache_file.read_text()) if cache_file.exists() else {}
+
+    entry = cache.get(host_key(), {}).get(settings)
+    if entry is not None:
+        print(f"   Using cached calibration from {cache_file}")
+        return TuneResult(**entry)
+
+    result = calibrate(measure, rss_budget_bytes, batch_sizes, threads)
+    cache.setdefault(host_key(), {})[settings] = asdict(result)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(cache, indent=2))
+    os.replace(tmp, cache_file)
+    return result
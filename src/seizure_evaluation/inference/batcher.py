@@ -0,0 +1,218 @@
+"""
+Asyncio micro-batching of window requests across callers.
+
+Many small recordings or short streaming chunks arriving at once would each
+run a forward pass on a handful of windows, leaving the batch dimension
+mostly empty. `MicroBatcher` queues (n, 19, window) window arrays from any
+number of coroutines. Once `max_batch` windows are queued, or `max_latency_ms`
+after the oldest queued request arrived, it concatenates them into one batch,
+runs a single forward on a dedicated worker thread (the event loop stays
+responsive) and hands each caller its slice of the output.
+
+Requests larger than `max_batch` are split into `max_batch`-sized chunks;
+smaller ones are never split, so every batch holds at most `max_batch` windows.
+
+`stats()` reports queue depth (windows waiting), mean batch fill ratio and
+p50/p99 request latency (submit to result, over the most recent requests).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import torch
+
+from seizure_evaluation.inference.predict import to_numpy
+
+DEFAULT_MAX_LATENCY_MS = 20.0
+LATENCY_HISTORY = 10_000
+
+
+@dataclass
+class _Request:
+    windows: np.ndarray
+    future: asyncio.Future
+    enqueued: float
+
+
+class MicroBatcher:
+    """Collect window requests into shared forward passes under a latency budget."""
+
+    def __init__(
+        self,
+        model: torch.nn.Module,
+        device: str = "cpu",
+        max_batch: int = 64,
+        max_latency_ms: float = DEFAULT_MAX_LATENCY_MS,
+    ):
+        """
+        Args:
+            model: Model mapping (B, 19, window) float32 batches to (B, window) outputs
+            device: Torch device of `model`
+            max_batch: Windows per forward pass (upper bound)
+            max_latency_ms: Longest a queued request waits for more windows
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.model = model
+        self.model.eval()
+        self.device = device
+        self.max_batch = max_batch
+        self.max_latency = max_latency_ms / 1000
+        self.batches_run = 0
+        self.windows_run = 0
+        self.requests_served = 0
+        self.queued_windows = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_HISTORY)
+        self._queue: asyncio.Queue[_Request] | None = None
+        self._carry: _Request | None = None
+        # One `queue.get()` kept across timeouts: cancelling a get that already
+        # took a request (asyncio.wait_for on 3.10/3.11) would lose that request
+        self._getter: asyncio.Task | None = None
+        self._task: asyncio.Task | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def start(self) -> None:
+        """Start the batching task on the running event loop."""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="forward")
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop batching; requests still queued fail with CancelledError."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        pending = [self._carry] if self._carry else []
+        if self._getter is not None:
+            if self._getter.done() and not self._getter.cancelled():
+                pending.append(self._getter.result())
+            self._getter.cancel()
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for request in pending:
+            request.future.cancel()
+        self._executor.shutdown(wait=True)
+        self._task = self._carry = self._getter = None
+
+    async def __aenter__(self) -> MicroBatcher:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def submit(self, windows: np.ndarray) -> np.ndarray:
+        """
+        Run the model on `windows`, batched with concurrent requests.
+
+        Args:
+            windows: float32 (n, 19, window) preprocessed windows
+
+        Returns:
+            (n, window) model outputs, in order
+        """
+        if self._task is None:
+            await self.start()
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for i in range(0, len(windows), self.max_batch):
+            chunk = np.ascontiguousarray(windows[i : i + self.max_batch], dtype=np.float32)
+            future = loop.create_future()
+            self._queue.put_nowait(_Request(chunk, future, loop.time()))
+            self.queued_windows += len(chunk)
+            futures.append(future)
+        outputs = await asyncio.gather(*futures)
+        self._latencies.append(time.perf_counter() - start)
+        self.requests_served += 1
+        return np.concatenate(outputs) if len(outputs) > 1 else outputs[0]
+
+    def _forward(self, batch: np.ndarray) -> np.ndarray:
+        with torch.inference_mode():
+            output = to_numpy(self.model(torch.from_numpy(batch).to(self.device)))
+        return output.reshape(len(batch), -1)
+
+    async def _get(self, timeout: float | None = None) -> _Request | None:
+        """Next queued request, or None after `timeout` (the pending get is kept)."""
+        if self._getter is None:
+            self._getter = asyncio.ensure_future(self._queue.get())
+        done, _ = await asyncio.wait({self._getter}, timeout=timeout)
+        if not done:
+            return None
+        getter, self._getter = self._getter, None
+        return getter.result()
+
+    async def _next_batch(self) -> list[_Request]:
+        loop = asyncio.get_running_loop()
+        first = self._carry or await self._get()
+        self._carry = None
+        requests, n = [first], len(first.windows)
+        deadline = first.enqueued + self.max_latency
+        while n < self.max_batch:
+            if self._getter is None and not self._queue.empty():
+                request = self._queue.get_nowait()
+            else:
+                # timeout 0 still collects a get that finished at the deadline
+                request = await self._get(max(0.0, deadline - loop.time()))
+                if request is None:
+                    break
+            if n + len(request.windows) > self.max_batch:
+                self._carry = request  # starts the next batch
+                break
+            requests.append(request)
+            n += len(request.windows)
+        return requests
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            requests = await self._next_batch()
+            sizes = [len(r.windows) for r in requests]
+            self.queued_windows -= sum(sizes)
+            batch = (
+                requests[0].windows
+                if len(requests) == 1
+                else np.concatenate([r.windows for r in requests])
+            )
+            try:
+                output = await loop.run_in_executor(self._executor, self._forward, batch)
+            except Exception as e:
+                for request in requests:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+            self.batches_run += 1
+            self.windows_run += len(batch)
+            for request, part in zip(
+                requests, np.split(output, np.cumsum(sizes)[:-1]), strict=True
+            ):
+                if not request.future.done():
+                    request.future.set_result(part)
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth, batch fill ratio, p50/p99 request latency (ms) and counters."""
+        latencies = np.asarray(self._latencies) * 1000
+        capacity = self.batches_run * self.max_batch
+        return {
+            "queue_depth": self.queued_windows,
+            "batches_run": self.batches_run,
+            "windows_run": self.windows_run,
+            "requests_served": self.requests_served,
+            "fill_ratio": self.windows_run / capacity if capacity else 0.0,
+            "latency_p50_ms": float(np.percentile(latencies, 50)) if latencies.size else None,
+            "latency_p99_ms": float(np.percentile(latencies, 99)) if latencies.size else None,
+            "max_batch": self.max_batch,
+            "max_latency_ms": self.max_latency * 1000,
+        }
@@ -0,0 +1,150 @@
+"""
+Bounded-memory inference for multi-hour recordings.
+
+The default path z-scores the whole recording in float64, FFT-resamples it and
+then windows it. That means several full-length copies of a 19 x N array.
+`chunked_predict_probabilities` instead streams the recording:
+
+1. Two passes over the raw samples, chunk by chunk, give the per-channel mean
+   and (population) standard deviation in float64.
+2. For each batch of windows, only the input samples that batch needs (plus
+   FIR context) are normalized in float32 and polyphase-resampled to 256 Hz
+   (`resampling.ChunkedResampler`). The result is cut into windows, filtered
+   and run through the model.
+3. Outputs are written straight into a float32 buffer, optionally a
+   memory-mapped `.npy` file.
+
+Apart from the input array itself (which may be an `np.memmap`) and the
+output, peak memory is O(batch_size x window) rather than O(recording).
+
+Parity: z-scoring is identical up to float rounding. Resampling is polyphase
+rather than FFT, so for fs != 256 outputs differ slightly from the default
+path (measure with `seizure_evaluation.inference.parity`). `filter_mode`
+behaves as in `build_dataset`. "recording" carries the IIR state across
+batches, so it matches filtering the whole resampled recording at once.
+Windows do not overlap.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import torch
+from scipy.signal import sosfilt
+
+from seizure_evaluation.inference.dataset import FILTER_MODES
+from seizure_evaluation.inference.predict import allocate_output, to_numpy
+from seizure_evaluation.inference.preprocessing import (
+    TARGET_FS,
+    WINDOW_SIZE,
+    design_preprocessing_sos,
+    preprocess_windows,
+)
+from seizure_evaluation.inference.resampling import ChunkedResampler
+
+DEFAULT_CHUNK_SAMPLES = 1 << 20  # per-channel samples per statistics pass step
+
+
+def streaming_mean_std(
+    data: np.ndarray, chunk_samples: int = DEFAULT_CHUNK_SAMPLES
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Per-channel mean and population std (ddof=0) in two chunked passes.
+
+    Args:
+        data: (channels, samples) array (may be a memmap)
+        chunk_samples: Samples per channel read at a time
+
+    Returns:
+        (mean, std), each float64 of shape (channels, 1)
+    """
+    n = data.shape[1]
+    total = np.zeros((data.shape[0], 1))
+    for i in range(0, n, chunk_samples):
+        total += np.sum(data[:, i : i + chunk_samples], axis=1, keepdims=True, dtype=np.float64)
+    mean = total / n
+
+    squares = np.zeros_like(mean)
+    for i in range(0, n, chunk_samples):
+        centered = data[:, i : i + chunk_samples] - mean
+        squares += np.sum(centered * centered, axis=1, keepdims=True)
+    return mean, np.sqrt(squares / n)
+
+
+def n_windows_for(n_samples: int, window_size: int = WINDOW_SIZE) -> int:
+    """Number of non-overlapping windows over `n_samples` (as `WindowDataset.__len__`)."""
+    if n_samples < window_size:
+        return 1
+    return 1 + -(-(n_samples - window_size) // window_size)
+
+
+def chunked_predict_probabilities(
+    model: torch.nn.Module,
+    data: np.ndarray,
+    fs: float,
+    device: str,
+    batch_size: int = 64,
+    seq_len: int | None = None,
+    out_path: Path | None = None,
+    filter_mode: str = "window",
+    window_size: int = WINDOW_SIZE,
+) -> np.ndarray:
+    """
+    Stream a raw recording through normalization, resampling, filtering and the model.
+
+    Args:
+        model: SeizureTransformer (outputs per-sample probabilities)
+        data: Raw recording of shape (channels, samples), e.g. an `np.memmap`
+        fs: Sampling frequency of `data` in Hz
+        device: Torch device for inference
+        batch_size: Windows per forward pass (bounds working memory)
+        seq_len: Samples to keep (default: `data.shape[1]`, as `tusz-eval` does)
+        out_path: Optional `.npy` path; outputs are then written to a memmap
+        filter_mode: "window" or "recording", see `build_dataset`
+        window_size: Samples per window at 256 Hz
+
+    Returns:
+        float32 array (or memmap) of shape (min(seq_len, n_windows * window_size),)
+    """
+    if filter_mode not in FILTER_MODES:
+        raise ValueError(f"filter_mode must be one of {FILTER_MODES}, got {filter_mode!r}")
+    n_in = data.shape[1]
+    seq_len = n_in if seq_len is None else seq_len
+    mean, std = streaming_mean_std(data)
+    resampler = ChunkedResampler(fs)
+    n_resampled = resampler.output_length(n_in)
+    n_windows = n_windows_for(n_resampled, window_size)
+    output = allocate_output(min(seq_len, n_windows * window_size), out_path)
+
+    def read_normalized(i0: int, i1: int) -> np.ndarray:
+        return ((data[:, i0:i1] - mean) / std).astype(np.float32)
+
+    sos = design_preprocessing_sos(TARGET_FS)
+    zi = None
+    if filter_mode == "recording":
+        zi = np.zeros((sos.shape[0], data.shape[0], 2), dtype=np.float32)
+
+    model.eval()
+    with torch.no_grad():
+        for first in range(0, n_windows, batch_size):
+            n_batch = min(batch_size, n_windows - first)
+            start = first * window_size
+            if start >= len(output):
+                break  # remaining windows fall beyond seq_len
+            stop = min(start + n_batch * window_size, n_resampled)
+            segment = resampler.segment(read_normalized, n_in, start, stop)
+            if zi is not None:
+                segment, zi = sosfilt(sos, segment, axis=-1, zi=zi)
+            # Zero-pad the final partial window, as WindowDataset does
+            padded = np.zeros((data.shape[0], n_batch * window_size), dtype=np.float32)
+            padded[:, : segment.shape[1]] = segment
+            windows = padded.reshape(data.shape[0], n_batch, window_size).transpose(1, 0, 2)
+            if zi is None:
+                windows = preprocess_windows(windows, fs=TARGET_FS)
+            batch = torch.from_numpy(np.ascontiguousarray(windows)).to(device)
+
+            probs = to_numpy(model(batch)).reshape(-1)
+            end = min(start + probs.size, len(output))
+            output[start:end] = probs[: end - start]
+    return output
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Thin client for the warm inference server (`seizure_evaluation.inference.server`).
+
+Imports only the standard library and NumPy, so a client call costs
+milliseconds instead of a torch import plus model load. Talks HTTP over the
+server's Unix domain socket (`--socket`) or localhost TCP (`--host/--port`).
+
+CLI:
+  seizure-client --socket /tmp/seizure.sock --out_dir preds/ rec1.edf rec2.edf
+  seizure-client --socket /tmp/seizure.sock --events rec1.edf
+  seizure-client --socket /tmp/seizure.sock --health
+
+Per EDF, `--out_dir` receives `<stem>.npy` (per-sample probabilities) or, with
+`--events`, `<stem>.json` (post-processed seizure events in seconds).
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import io
+import json
+import socket
+import sys
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+import numpy as np
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+NPY_CONTENT_TYPE = "application/x-npy"
+JSON_CONTENT_TYPE = "application/json"
+OUTPUTS = ("probabilities", "events")
+
+
+def to_npy_bytes(array: np.ndarray) -> bytes:
+    buf = io.BytesIO()
+    np.save(buf, np.asarray(array), allow_pickle=False)
+    return buf.getvalue()
+
+
+def from_npy_bytes(body: bytes) -> np.ndarray:
+    return np.load(io.BytesIO(body), allow_pickle=False)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket."""
+
+    def __init__(self, socket_path: str, timeout: float | None = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class InferenceClient:
+    """Client for one inference server (Unix socket if `socket_path` is set, else TCP)."""
+
+    def __init__(
+        self,
+        socket_path: str | Path | None = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        timeout: float | None = None,
+    ):
+        self.socket_path = str(socket_path) if socket_path else None
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self.socket_path:
+            return UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _request(
+        self, method: str, path: str, body: bytes | None = None, content_type: str | None = None
+    ) -> tuple[str, bytes]:
+        conn = self._connection()
+        try:
+            headers = {"Content-Type": content_type} if content_type else {}
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            payload = response.read()
+            if response.status != 200:
+                try:
+                    message = json.loads(payload)["error"]
+                except (ValueError, KeyError):
+                    message = payload.decode(errors="replace")
+                raise RuntimeError(f"Server error {response.status}: {message}")
+            return response.getheader("Content-Type", ""), payload
+        finally:
+            conn.close()
+
+    def _predict(self, body: bytes, content_type: str, params: dict[str, Any]) -> Any:
+        if params["output"] not in OUTPUTS:
+            raise ValueError(f"output must be one of {OUTPUTS}, got {params['output']!r}")
+        query = urlencode({k: v for k, v in params.items() if v is not None})
+        response_type, payload = self._request("POST", f"/predict?{query}", body, content_type)
+        if response_type == NPY_CONTENT_TYPE:
+            return from_npy_bytes(payload)
+        return json.loads(payload)
+
+    def health(self) -> dict[str, Any]:
+        """Server status and model/preprocessing settings."""
+        return json.loads(self._request("GET", "/health")[1])
+
+    def predict_edf(
+        self, edf_path: str | Path, output: str = "probabilities", threshold: float | None = None
+    ) -> np.ndarray | dict[str, Any]:
+        """
+        Run the server's model on an EDF it can read.
+
+        Args:
+            edf_path: EDF path (resolved here, so relative paths are fine)
+            output: "probabilities" or "events"
+            threshold: Event threshold (server default: 0.8)
+
+        Returns:
+            float32 per-sample probabilities, or {"events": [[start_sec, end_sec], ...],
+            "n_samples": int, "load_method": str}
+        """
+        body = json.dumps({"edf_path": str(Path(edf_path).resolve())}).encode()
+        return self._predict(body, JSON_CONTENT_TYPE, {"output": output, "threshold": threshold})
+
+    def predict_array(
+        self,
+        data: np.ndarray,
+        fs: float,
+        output: str = "probabilities",
+        threshold: float | None = None,
+    ) -> np.ndarray | dict[str, Any]:
+        """Like `predict_edf`, for a raw (19, samples) recording sampled at `fs` Hz."""
+        params = {"output": output, "threshold": threshold, "fs": fs}
+        return self._predict(to_npy_bytes(data), NPY_CONTENT_TYPE, params)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Query a warm seizure inference server")
+    p.add_argument("edf", nargs="*", help="EDF files to run")
+    p.add_argument("--socket", type=str, default=None, help="Server Unix socket path")
+    p.add_argument("--host", type=str, default=DEFAULT_HOST)
+    p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p.add_argument("--events", action="store_true", help="Return post-processed events")
+    p.add_argument("--threshold", type=float, default=None, help="Event threshold")
+    p.add_argument("--out_dir", type=str, default=None, help="Write <stem>.npy / <stem>.json")
+    p.add_argument("--health", action="store_true", help="Print server status and exit")
+    args = p.parse_args()
+
+    client = InferenceClient(args.socket, host=args.host, port=args.port)
+    if args.health:
+        print(json.dumps(client.health(), indent=2))
+        return 0
+    if not args.edf:
+        p.error("no EDF files given")
+
+    out_dir = Path(args.out_dir) if args.out_dir else None
+    if out_dir is not None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+    output = "events" if args.events else "probabilities"
+    failed = 0
+    for edf in args.edf:
+        try:
+            result = client.predict_edf(edf, output=output, threshold=args.threshold)
+        except RuntimeError as e:
+            print(f"❌ {edf}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        stem = Path(edf).stem
+        if args.events:
+            if out_dir is not None:
+                (out_dir / f"{stem}.json").write_text(json.dumps(result, indent=2))
+            print(f"{stem}: {len(result['events'])} events")
+        else:
+            if out_dir is not None:
+                np.save(out_dir / f"{stem}.npy", result)
+            print(f"{stem}: {result.size} samples, max p={result.max():.3f}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
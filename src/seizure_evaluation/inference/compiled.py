@@ -0,0 +1,156 @@
+"""
+Frozen TorchScript export of SeizureTransformer with an on-disk artifact cache.
+
+`load_models` rebuilds the eager model on every run. `load_compiled` instead
+traces the eval-mode model once for a `(batch_size, 19, 15360)` input, freezes
+it (weights inlined as constants, dropout/BatchNorm folded) and applies
+TorchScript inference optimizations, then caches the artifact at
+
+    <cache_dir>/seizure_transformer-<weights sha256[:16]>-<variant[:8]>-torch<version>-b<batch_size>.pt
+
+next to a `.json` sidecar with the cache key and the equivalence check result.
+The variant hashes the module classes of the model, so variants sharing one
+state dict (stock vs `--batch_first`, folded `--optimize` blocks) get their own
+artifacts. Any change of weights, variant, torch version or batch size gives a
+new artifact.
+
+Every export is checked against eager mode (on a full batch and on a single
+window, since the final packed batch is usually partial) and is rejected if the
+max absolute deviation exceeds `atol`. Only fp32 models are supported.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+import torch
+import torch.nn as nn
+
+from seizure_evaluation.inference.models import load_model
+from seizure_evaluation.inference.preprocessing import WINDOW_SIZE
+
+N_CHANNELS = 19
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "seizure_evaluation" / "compiled"
+DEFAULT_ATOL = 1e-5
+
+
+def weights_hash(model: nn.Module) -> str:
+    """SHA-256 over parameter/buffer names, dtypes, shapes and values."""
+    digest = hashlib.sha256()
+    for name, tensor in sorted(model.state_dict().items()):
+        t = tensor.detach().cpu().contiguous()
+        digest.update(f"{name}:{t.dtype}:{tuple(t.shape)}".encode())
+        digest.update(t.numpy().tobytes())
+    return digest.hexdigest()
+
+
+def model_variant(model: nn.Module) -> str:
+    """SHA-256 over the module tree's names and classes (tells apart same-weight variants)."""
+    digest = hashlib.sha256()
+    for name, module in model.named_modules():
+        digest.update(f"{name}:{type(module).__module__}.{type(module).__qualname__};".encode())
+    return digest.hexdigest()
+
+
+def artifact_path(cache_dir: Path, model: nn.Module, batch_size: int) -> Path:
+    """Cache location for `model` traced at `batch_size` under the running torch version."""
+    version = torch.__version__.replace("+", "_")
+    key = f"{weights_hash(model)[:16]}-{model_variant(model)[:8]}"
+    return Path(cache_dir) / f"seizure_transformer-{key}-torch{version}-b{batch_size}.pt"
+
+
+def _max_abs_dev(eager: nn.Module, compiled: nn.Module, x: torch.Tensor) -> float:
+    with torch.no_grad():
+        return float((eager(x) - compiled(x)).abs().max())
+
+
+def export_torchscript(
+    model: nn.Module,
+    batch_size: int,
+    out_path: Path,
+    atol: float = DEFAULT_ATOL,
+) -> torch.jit.ScriptModule:
+    """
+    Trace, freeze and save `model`, after checking it against eager mode.
+
+    Args:
+        model: Eval-mode fp32 SeizureTransformer
+        batch_size: Batch size of the example input used for tracing
+        out_path: Artifact path (written atomically; parents are created)
+        atol: Max absolute deviation allowed against eager outputs
+
+    Returns:
+        Frozen TorchScript module
+
+    Raises:
+        RuntimeError: If the traced module deviates from eager by more than `atol`
+    """
+    model.eval()
+    device = next(model.parameters()).device
+    gen = torch.Generator().manual_seed(0)
+    example = torch.randn(batch_size, N_CHANNELS, WINDOW_SIZE, generator=gen).to(device)
+
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+        frozen = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+
+    deviation = max(
+        _max_abs_dev(model, frozen, example),
+        _max_abs_dev(model, frozen, example[:1]),
+    )
+    if deviation > atol:
+        raise RuntimeError(
+            f"Compiled model deviates from eager by {deviation:.3g} (> atol {atol:.3g})"
+        )
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(f"{out_path.name}.{os.getpid()}.tmp")
+    torch.jit.save(frozen, str(tmp))
+    os.replace(tmp, out_path)
+    meta = {
+        "weights_sha256": weights_hash(model),
+        "model_class": type(model).__qualname__,
+        "model_variant": model_variant(model),
+        "torch_version": torch.__version__,
+        "batch_size": batch_size,
+        "max_abs_dev_vs_eager": deviation,
+        "atol": atol,
+    }
+    out_path.with_suffix(".json").write_text(json.dumps(meta, indent=2))
+    return frozen
+
+
+def load_compiled(
+    device: str,
+    batch_size: int,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    loader: Callable[[str], nn.Module] = load_model,
+    atol: float = DEFAULT_ATOL,
+) -> torch.jit.ScriptModule:
+    """
+    Load the cached compiled model for the current weights, exporting it on a miss.
+
+    Args:
+        device: Torch device
+        batch_size: Inference batch size (part of the cache key)
+        cache_dir: Artifact cache directory
+        loader: Function returning the eager fp32 model for a device
+        atol: Equivalence tolerance used when exporting
+
+    Returns:
+        Frozen TorchScript module (accepts any batch size; traced at `batch_size`)
+    """
+    model = loader(device)
+    model.eval()
+    path = artifact_path(cache_dir, model, batch_size)
+    if path.exists():
+        print(f"   Using compiled model {path}")
+        return torch.jit.load(str(path), map_location=device)
+
+    print(f"   Compiling model (batch {batch_size}) -> {path}")
+    return export_torchscript(model, batch_size, path, atol=atol)
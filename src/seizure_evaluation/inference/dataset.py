@@ -0,0 +1,253 @@
+"""
+Drop-in replacement for `wu_2025.utils.get_dataloader`.
+
+The dataset yields raw (unfiltered) windows using the same indexing and zero
+padding as `wu_2025.utils.SeizureDataset`, as strided views over one padded
+float32 buffer; the only per-batch copy is the `torch.stack` in collate. With the default
+`filter_mode="window"` filtering happens once per batch in the collate function
+via `preprocess_windows`, reproducing Wu's per-window zero-state filtering.
+`filter_mode="recording"` filters the whole recording once and only slices
+windows afterwards; it is faster but not bit-compatible with the reference, so
+quantify the drift with `seizure_evaluation.inference.parity` before using it.
+
+Resampling defaults to Wu's FFT `scipy.signal.resample`. `resample_method="polyphase"`
+uses cached rational polyphase filter banks in float32 instead
+(`seizure_evaluation.inference.resampling`); its effect on model outputs is
+measured by `scripts/resampling_fidelity.py`.
+
+`get_dataloader` also accepts an already-preprocessed `WindowStack`, e.g.
+memory-mapped from `seizure_evaluation.inference.window_cache.WindowCache`,
+and batches it without copying beyond the per-batch stack.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import torch
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import resample
+
+from seizure_evaluation.inference.preprocessing import (
+    TARGET_FS,
+    WINDOW_SIZE,
+    preprocess_recording,
+    preprocess_windows,
+)
+from seizure_evaluation.inference.resampling import ChunkedResampler
+
+FILTER_MODES = ("window", "recording")
+RESAMPLE_METHODS = ("fft", "polyphase")
+
+
+class WindowDataset(torch.utils.data.Dataset):
+    """
+    Zero-copy windows over a (channels, samples) recording, Wu-compatible indexing.
+
+    The recording is copied once into a float32 buffer that is zero-padded to a
+    multiple of `window_size` covering the last window. Windows are strided views
+    into that buffer (`sliding_window_view`), handed to torch via
+    `torch.from_numpy`, so `__getitem__` allocates no array data.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        window_size: int = WINDOW_SIZE,
+        overlap_ratio: float = 0.0,
+    ):
+        self.n_samples = data.shape[1]
+        self.window_size = window_size
+        self.overlap_ratio = overlap_ratio
+
+        last_start = self.window_start(len(self) - 1)
+        padded_len = window_size * math.ceil((last_start + window_size) / window_size)
+        padded_len = max(padded_len, self.n_samples)
+        self.buffer = np.zeros((data.shape[0], padded_len), dtype=np.float32)
+        self.buffer[:, : self.n_samples] = data
+        # (n_offsets, channels, window_size) view; row i is the window starting at sample i.
+        # Marked writeable only because torch.from_numpy rejects read-only arrays; never written.
+        self.windows = sliding_window_view(
+            self.buffer, window_size, axis=1, writeable=True
+        ).transpose(1, 0, 2)
+
+    def window_start(self, idx: int) -> int:
+        return int(idx * self.window_size * (1 - self.overlap_ratio))
+
+    def window_starts(self) -> np.ndarray:
+        """Start offsets of all windows (vectorized `window_start`)."""
+        return (np.arange(len(self)) * self.window_size * (1 - self.overlap_ratio)).astype(np.int64)
+
+    def __len__(self) -> int:
+        if self.n_samples < self.window_size:
+            return 1
+        hop = (1 - self.overlap_ratio) * self.window_size
+        return 1 + math.ceil((self.n_samples - self.window_size) / hop)
+
+    def __getitem__(self, idx: int) -> torch.Tensor:
+        return torch.from_numpy(self.windows[self.window_start(idx)])
+
+
+class WindowStack(torch.utils.data.Dataset):
+    """
+    Materialized, already-preprocessed (n_windows, channels, window_size) windows.
+
+    float32, or float16 when memory-mapped from a float16 `WindowCache`
+    (batches are cast to float32 by the collate function).
+    """
+
+    def __init__(self, windows: np.ndarray, starts: np.ndarray | None = None):
+        self.windows = windows
+        self.window_size = windows.shape[-1]
+        self.starts = starts  # None: back-to-back windows
+
+    def window_starts(self) -> np.ndarray:
+        if self.starts is None:
+            return np.arange(len(self), dtype=np.int64) * self.window_size
+        return self.starts
+
+    def __len__(self) -> int:
+        return len(self.windows)
+
+    def __getitem__(self, idx: int) -> torch.Tensor:
+        return torch.from_numpy(self.windows[idx])
+
+
+class BatchPreprocessor:
+    """Collate function: stack windows and, unless `fs` is None, filter the batch at once."""
+
+    def __init__(self, fs: int | None = TARGET_FS):
+        self.fs = fs
+
+    def __call__(self, windows: list[torch.Tensor]) -> torch.Tensor:
+        batch = torch.stack(windows)
+        if self.fs is None:
+            return batch.float()  # no-op for float32; float16 cached windows
+        return torch.from_numpy(preprocess_windows(batch.numpy(), fs=self.fs))
+
+
+def normalize_and_resample(data: np.ndarray, fs: float, method: str = "fft") -> np.ndarray:
+    """
+    Per-channel z-score, then resample to 256 Hz.
+
+    "fft" mirrors Wu's get_dataloader (float64). "polyphase" z-scores with
+    float64 statistics, then resamples in float32 with a cached filter bank.
+    """
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(f"resample method must be one of {RESAMPLE_METHODS}, got {method!r}")
+    mean = np.mean(data, axis=1, keepdims=True)
+    std = np.std(data, axis=1, keepdims=True)
+    if method == "polyphase":
+        return ChunkedResampler(fs).resample(((data - mean) / std).astype(np.float32))
+    data = (data - mean) / std
+    if fs != TARGET_FS:
+        new_n_samples = int(data.shape[1] * float(TARGET_FS) / fs)
+        data = resample(data, new_n_samples, axis=1)
+    return data
+
+
+def materialize_windows(dataset: WindowDataset, collate: BatchPreprocessor) -> WindowStack:
+    """
+    Gather every window of `dataset` and apply `collate`'s filtering in one call.
+
+    The result only needs stacking at batch time (`collate_for("recording")`),
+    which lets preprocessing run ahead of inference, e.g. in worker processes.
+    """
+    starts = dataset.window_starts()
+    windows = dataset.windows[starts]
+    if collate.fs is not None:
+        windows = preprocess_windows(windows, fs=collate.fs)
+    return WindowStack(
+        np.ascontiguousarray(windows, dtype=np.float32),
+        starts=starts if dataset.overlap_ratio else None,
+    )
+
+
+def collate_for(filter_mode: str = "window") -> BatchPreprocessor:
+    """Collate function matching datasets built with `filter_mode`."""
+    return BatchPreprocessor(fs=None if filter_mode == "recording" else TARGET_FS)
+
+
+def build_dataset(
+    data: np.ndarray,
+    fs: float,
+    window_size: int = WINDOW_SIZE,
+    filter_mode: str = "window",
+    overlap_ratio: float = 0.0,
+    resample_method: str = "fft",
+) -> tuple[WindowDataset, BatchPreprocessor]:
+    """
+    Normalize/resample a raw recording and window it for the model.
+
+    Args:
+        data: Raw recording of shape (channels, samples)
+        fs: Sampling frequency of `data` in Hz
+        window_size: Samples per window at 256 Hz
+        filter_mode: "window" (Wu-equivalent, zero filter state per window) or
+            "recording" (filter the full recording once, then slice windows)
+        overlap_ratio: Fraction of each window shared with the next, in [0, 1);
+            outputs must then be stitched (`stitching.overlap_add`)
+        resample_method: "fft" (Wu-equivalent) or "polyphase", see
+            `normalize_and_resample`
+
+    Returns:
+        (dataset, collate_fn); collate_fn turns a list of windows into a model batch
+    """
+    if filter_mode not in FILTER_MODES:
+        raise ValueError(f"filter_mode must be one of {FILTER_MODES}, got {filter_mode!r}")
+    if not 0.0 <= overlap_ratio < 1.0:
+        raise ValueError(f"overlap_ratio must be in [0, 1), got {overlap_ratio}")
+    data = normalize_and_resample(data, fs, method=resample_method)
+    if filter_mode == "recording":
+        data = preprocess_recording(data, fs=TARGET_FS)
+    dataset = WindowDataset(data, window_size=window_size, overlap_ratio=overlap_ratio)
+    return dataset, collate_for(filter_mode)
+
+
+def get_dataloader(
+    data: np.ndarray | WindowStack,
+    fs: float | None,
+    batch_size: int = 256,
+    window_size: int = WINDOW_SIZE,
+    filter_mode: str = "window",
+    overlap_ratio: float = 0.0,
+    resample_method: str = "fft",
+) -> torch.utils.data.DataLoader:
+    """
+    Build a DataLoader of preprocessed (B, 19, window_size) float32 batches.
+
+    Args:
+        data: Raw recording of shape (channels, samples), or preprocessed windows
+            (`WindowStack`, e.g. from `WindowCache`), which are batched as is
+        fs: Sampling frequency of `data` in Hz (ignored for a `WindowStack`)
+        batch_size: Windows per batch
+        window_size: Samples per window at 256 Hz
+        filter_mode: See `build_dataset`
+        overlap_ratio: See `build_dataset`
+        resample_method: See `build_dataset`
+
+    Returns:
+        DataLoader yielding float32 (B, channels, window_size) tensors
+    """
+    if isinstance(data, WindowStack):
+        return torch.utils.data.DataLoader(
+            data,
+            batch_size=batch_size,
+            shuffle=False,
+            collate_fn=collate_for("recording"),
+        )
+    dataset, collate = build_dataset(
+        data,
+        fs,
+        window_size=window_size,
+        filter_mode=filter_mode,
+        overlap_ratio=overlap_ratio,
+        resample_method=resample_method,
+    )
+    return torch.utils.data.DataLoader(
+        dataset,
+        batch_size=batch_size,
+        shuffle=False,
+        collate_fn=collate,
+    )
@@ -0,0 +1,123 @@
+"""
+Model loading with optional inference-time precision modes.
+
+Weights and architecture always come from the vendored `wu_2025` package;
+precision transforms are applied to the loaded eval-mode model.
+
+Precisions:
+- fp32: Wu's model unchanged (reference)
+- int8: dynamic INT8 quantization of every `nn.Linear` (transformer feed-forward
+  layers; attention output projections are excluded by PyTorch). PyTorch has no
+  dynamic-quantized Conv1d kernels, so the Conv1d encoder/decoder stays fp32.
+  CPU only. Not bit-exact: sign off with `seizure_evaluation.inference.parity`.
+- bf16: CPU autocast to bfloat16 under `torch.inference_mode()`; the final
+  sigmoid and the returned probabilities stay fp32. Only enabled on CPUs with
+  native bf16 (AVX512-BF16 / AMX); elsewhere it falls back to fp32 with a
+  warning, since emulated bf16 is slower than fp32. Not bit-exact.
+"""
+
+from __future__ import annotations
+
+import warnings
+from collections.abc import Callable
+
+import torch
+import torch.nn as nn
+from wu_2025.utils import load_models
+
+from seizure_evaluation.inference.optimize import optimize_for_inference, to_batch_first
+
+PRECISIONS = ("fp32", "int8", "bf16")
+
+
+def cpu_has_native_bf16() -> bool:
+    """True if oneDNN reports native bf16 support (AVX512-BF16, AMX or Arm BF16)."""
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def _wu_logits(m: nn.Module, x: torch.Tensor) -> torch.Tensor:
+    """`SeizureTransformer.forward` up to (excluding) the final sigmoid."""
+    x, skips = m.encoder(x)
+    res_x = m.res_cnn_stack(x)
+    x = res_x.permute(2, 0, 1)
+    x = m.position_encoding(x)
+    x = m.transformer_encoder(x)
+    x = x.permute(1, 2, 0)
+    x = x + res_x
+    return m.conv_d(m.decoder_d(x, skips))
+
+
+class Bf16AutocastModel(nn.Module):
+    """SeizureTransformer forward under CPU bf16 autocast with an fp32 sigmoid/output.
+
+    Stops the autocast region at the final conv logits (`model.logits` when the
+    model provides it, else a mirror of `wu_2025.architecture.SeizureTransformer.forward`)
+    so the sigmoid runs in fp32.
+    """
+
+    def __init__(self, model: nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        with torch.inference_mode(), torch.autocast("cpu", dtype=torch.bfloat16):
+            if hasattr(self.model, "logits"):
+                logits = self.model.logits(x)
+            else:
+                logits = _wu_logits(self.model, x)
+        with torch.inference_mode():
+            return torch.sigmoid(logits.float()).squeeze(1)
+
+
+def quantize_int8(model: nn.Module) -> nn.Module:
+    """Dynamically quantize Linear layers to INT8 (weights int8, activations quantized per batch)."""
+    from torch.ao.quantization import quantize_dynamic
+
+    return quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+
+def load_model(
+    device: str = "cpu",
+    precision: str = "fp32",
+    loader: Callable[[str], nn.Module] = load_models,
+    optimize: bool = False,
+    batch_first: bool = False,
+) -> nn.Module:
+    """
+    Load SeizureTransformer in eval mode at the requested precision.
+
+    Args:
+        device: Torch device
+        precision: One of PRECISIONS
+        loader: Function returning the fp32 model for a device (wu_2025.utils.load_models)
+        optimize: Apply `optimize.optimize_for_inference` (BatchNorm folding) first
+        batch_first: Convert to `optimize.BatchFirstSeizureTransformer` (fused encoder)
+
+    Returns:
+        Eval-mode model (bf16 falls back to plain fp32 without native CPU support)
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {PRECISIONS}, got {precision!r}")
+    if precision in ("int8", "bf16") and device != "cpu":
+        raise ValueError(f"{precision} precision is CPU-only; use --device cpu")
+    if precision == "int8" and batch_first:
+        # The fused encoder fast path reads linear weights as tensors; quantized ones are not
+        raise ValueError("int8 precision cannot be combined with batch_first")
+    if precision == "bf16" and not cpu_has_native_bf16():
+        warnings.warn("CPU has no native bf16 support; falling back to fp32", stacklevel=2)
+        precision = "fp32"
+
+    model = loader(device)
+    model.eval()
+    if optimize:
+        model = optimize_for_inference(model)
+    if batch_first:
+        model = to_batch_first(model)
+    if precision == "int8":
+        model = quantize_int8(model)
+    elif precision == "bf16":
+        model = Bf16AutocastModel(model).eval()
+    return model
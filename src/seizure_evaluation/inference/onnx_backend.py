@@ -0,0 +1,179 @@
+"""
+ONNX export of SeizureTransformer and an onnxruntime CPU backend.
+
+`export_onnx` exports the eval-mode fp32 model, including the manual padding in
+`Encoder`/`ResCNNBlock`, the `Decoder` crops and the positional encoding, with
+a dynamic batch axis. It then checks onnxruntime outputs against eager mode.
+`OnnxRuntimeModel` runs windows through the CPU execution provider with all
+graph optimizations enabled and configurable intra/inter-op thread pools.
+
+This module imports torch only inside the export functions: scoring-only
+environments can construct `OnnxRuntimeModel` from an existing `.onnx` file
+with just numpy and onnxruntime installed (`pip install .[onnx]`).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+OPSET = 17
+INPUT_NAME = "windows"
+OUTPUT_NAME = "probabilities"
+DEFAULT_ATOL = 1e-4
+
+
+class OnnxRuntimeModel:
+    """Callable (B, 19, 15360) -> (B, 15360) probabilities backed by onnxruntime."""
+
+    def __init__(self, onnx_path: Path, intra_op_threads: int = 0, inter_op_threads: int = 0):
+        """
+        Args:
+            onnx_path: Exported model (see `export_onnx`)
+            intra_op_threads: Threads used inside one operator (0 = onnxruntime default)
+            inter_op_threads: Threads used across independent operators (0 = default)
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        self.onnx_path = Path(onnx_path)
+        self.session = ort.InferenceSession(
+            str(onnx_path), options, providers=["CPUExecutionProvider"]
+        )
+
+    def __call__(self, batch: Any) -> np.ndarray:
+        windows = np.ascontiguousarray(batch, dtype=np.float32)
+        return self.session.run([OUTPUT_NAME], {INPUT_NAME: windows})[0]
+
+    def eval(self) -> OnnxRuntimeModel:
+        """No-op, so the backend drops into code written for `nn.Module` models."""
+        return self
+
+
+def export_onnx(
+    model: Any,
+    out_path: Path,
+    batch_size: int = 2,
+    atol: float = DEFAULT_ATOL,
+) -> Path:
+    """
+    Export `model` to ONNX and check onnxruntime against eager mode.
+
+    Args:
+        model: Eval-mode fp32 SeizureTransformer (on CPU)
+        out_path: Destination `.onnx` path (written atomically; parents are created)
+        batch_size: Batch size of the example input (the batch axis is dynamic)
+        atol: Max absolute deviation allowed against eager outputs
+
+    Returns:
+        `out_path`
+
+    Raises:
+        RuntimeError: If onnxruntime deviates from eager by more than `atol`
+    """
+    import torch
+
+    from seizure_evaluation.inference.compiled import N_CHANNELS
+    from seizure_evaluation.inference.preprocessing import WINDOW_SIZE
+
+    model.eval()
+    gen = torch.Generator().manual_seed(0)
+    example = torch.randn(batch_size, N_CHANNELS, WINDOW_SIZE, generator=gen)
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(f"{out_path.name}.{os.getpid()}.tmp")
+    # The fused encoder fast path (batch-first variant) has no ONNX symbolic;
+    # trace the equivalent unfused ops instead (the toggle exists in torch>=2.2)
+    mha = getattr(torch.backends, "mha", None)
+    fastpath = mha.get_fastpath_enabled() if mha else None
+    if mha:
+        mha.set_fastpath_enabled(False)
+    try:
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (example,),
+                str(tmp),
+                input_names=[INPUT_NAME],
+                output_names=[OUTPUT_NAME],
+                dynamic_axes={INPUT_NAME: {0: "batch"}, OUTPUT_NAME: {0: "batch"}},
+                opset_version=OPSET,
+                dynamo=False,
+            )
+    finally:
+        if mha:
+            mha.set_fastpath_enabled(fastpath)
+
+    # Check a batch size other than the exported one, since the batch axis is dynamic
+    check = torch.randn(batch_size + 1, N_CHANNELS, WINDOW_SIZE, generator=gen)
+    with torch.no_grad():
+        expected = model(check).numpy()
+    deviation = float(np.abs(OnnxRuntimeModel(tmp)(check.numpy()) - expected).max())
+    if deviation > atol:
+        tmp.unlink()
+        raise RuntimeError(f"ONNX model deviates from eager by {deviation:.3g} (> atol {atol:.3g})")
+
+    os.replace(tmp, out_path)
+    meta = {"opset": OPSET, "torch_version": torch.__version__, "max_abs_dev_vs_eager": deviation}
+    out_path.with_suffix(".json").write_text(json.dumps(meta, indent=2))
+    return out_path
+
+
+def load_onnxruntime(
+    device: str = "cpu",
+    onnx_path: Path | None = None,
+    cache_dir: Path | None = None,
+    intra_op_threads: int = 0,
+    inter_op_threads: int = 0,
+    loader: Callable[[str], Any] | None = None,
+) -> OnnxRuntimeModel:
+    """
+    Build the onnxruntime backend, exporting the model on a cache miss.
+
+    Args:
+        device: Must be "cpu" (CPU execution provider only)
+        onnx_path: Existing `.onnx` file to use as-is (no torch import)
+        cache_dir: Export cache directory, used when `onnx_path` is None; artifacts
+            are keyed by weights hash, model variant and torch version
+        intra_op_threads: See `OnnxRuntimeModel`
+        inter_op_threads: See `OnnxRuntimeModel`
+        loader: Function returning the eager fp32 model (default: `models.load_model`)
+
+    Returns:
+        OnnxRuntimeModel
+    """
+    if device != "cpu":
+        raise ValueError("onnxruntime backend is CPU-only; use --device cpu")
+
+    if onnx_path is None:
+        import torch
+
+        from seizure_evaluation.inference.compiled import (
+            DEFAULT_CACHE_DIR,
+            model_variant,
+            weights_hash,
+        )
+        from seizure_evaluation.inference.models import load_model
+
+        model = (loader or load_model)(device)
+        model.eval()
+        version = torch.__version__.replace("+", "_")
+        key = f"{weights_hash(model)[:16]}-{model_variant(model)[:8]}"
+        name = f"seizure_transformer-{key}-torch{version}-opset{OPSET}.onnx"
+        onnx_path = Path(cache_dir or DEFAULT_CACHE_DIR) / name
+        if onnx_path.exists():
+            print(f"   Using ONNX model {onnx_path}")
+        else:
+            print(f"   Exporting ONNX model -> {onnx_path}")
+            export_onnx(model, onnx_path)
+
+    return OnnxRuntimeModel(onnx_path, intra_op_threads, inter_op_threads)
@@ -0,0 +1,135 @@
+"""
+Inference-time graph simplification of SeizureTransformer (eval mode only).
+
+Each `ResCNNBlock` computes, twice over,
+    BatchNorm1d -> ReLU -> SpatialDropout1d -> [pad] -> Conv1d
+In eval mode the dropout (and its unsqueeze/squeeze round-trip) is an identity,
+and the second BatchNorm directly follows the first Conv1d, so it is a fixed
+per-channel affine map that can be folded into that convolution's weights and
+bias. The first BatchNorm sits behind the residual input and before a ReLU, so
+it cannot be folded and stays a single fused BatchNorm call. ReLUs then run in
+place on intermediates the block owns.
+
+Wu's Encoder/Decoder ELUs are already `nn.ELU(inplace=True)` on fresh conv
+outputs, so they are left as they are. The transformer encoder is unchanged.
+
+`BatchFirstSeizureTransformer` lays the 8-layer transformer encoder out
+batch-first so PyTorch's fused encoder fast path applies at inference.
+
+Both change float rounding, so outputs match the stock model to tolerance
+(~1e-5 absolute), not bitwise.
+"""
+
+from __future__ import annotations
+
+import copy
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from wu_2025.architecture import ResCNNBlock, SeizureTransformer
+
+
+def fold_batchnorm_into_conv(conv: nn.Conv1d, bn: nn.BatchNorm1d) -> nn.Conv1d:
+    """Return a Conv1d computing `bn(conv(x))` with eval-mode BatchNorm statistics."""
+    scale = bn.weight / torch.sqrt(bn.running_var + bn.eps)
+    bias = conv.bias if conv.bias is not None else torch.zeros_like(bn.running_mean)
+
+    folded = copy.deepcopy(conv)
+    with torch.no_grad():
+        folded.weight.copy_(conv.weight * scale[:, None, None])
+        folded.bias = nn.Parameter((bias - bn.running_mean) * scale + bn.bias)
+    return folded
+
+
+class FoldedResCNNBlock(nn.Module):
+    """Eval-only ResCNNBlock: no dropout, second BatchNorm folded into `conv1`."""
+
+    def __init__(self, block: ResCNNBlock):
+        super().__init__()
+        self.manual_padding = block.manual_padding
+        self.norm1 = copy.deepcopy(block.norm1)
+        self.conv1 = fold_batchnorm_into_conv(block.conv1, block.norm2)
+        self.conv2 = copy.deepcopy(block.conv2)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        y = F.relu(self.norm1(x), inplace=True)
+        if self.manual_padding:
+            y = F.pad(y, (0, 1), "constant", 0)
+        y = F.relu(self.conv1(y), inplace=True)
+        if self.manual_padding:
+            y = F.pad(y, (0, 1), "constant", 0)
+        return x + self.conv2(y)
+
+
+def optimize_for_inference(model: nn.Module) -> nn.Module:
+    """
+    Copy of an eval-mode SeizureTransformer with every ResCNNBlock folded.
+
+    Args:
+        model: SeizureTransformer (left unmodified)
+
+    Returns:
+        Eval-mode model for inference only (training would bypass dropout and
+        use the frozen BatchNorm statistics)
+    """
+    optimized = copy.deepcopy(model).eval()
+    stack = optimized.res_cnn_stack
+    stack.members = nn.ModuleList(FoldedResCNNBlock(block) for block in stack.members)
+    return optimized.eval()
+
+
+class BatchFirstSeizureTransformer(SeizureTransformer):
+    """SeizureTransformer with a batch-first encoder eligible for PyTorch's fused fast path.
+
+    Wu's forward permutes the ResCNN output to (seq, batch, d) for a
+    non-batch-first `nn.TransformerEncoder`, which disqualifies the fused
+    encoder kernels (native multi-head attention with scaled-dot-product
+    attention), and permutes back afterwards. Here the encoder layers are
+    `batch_first=True`, so the (batch, d, seq) conv output only needs a
+    transpose view to (batch, seq, d). Parameter names are unchanged, so Wu's
+    `model.pth` state dict loads directly.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        layer = self.transformer_encoder_layer
+        self.transformer_encoder_layer = nn.TransformerEncoderLayer(
+            d_model=layer.self_attn.embed_dim,
+            nhead=layer.self_attn.num_heads,
+            dim_feedforward=layer.linear1.out_features,
+            dropout=layer.dropout.p,
+            batch_first=True,
+        )
+        self.transformer_encoder = nn.TransformerEncoder(
+            self.transformer_encoder_layer,
+            num_layers=self.transformer_encoder.num_layers,
+            enable_nested_tensor=False,  # windows are never padded
+        )
+
+    def logits(self, x: torch.Tensor) -> torch.Tensor:
+        """Detection logits of shape (batch, 1, samples) (everything but the sigmoid)."""
+        x, skips = self.encoder(x)
+        res_x = self.res_cnn_stack(x)
+
+        x = res_x.transpose(1, 2)  # (batch, seq, d) view
+        x = x + self.position_encoding.pe[: x.size(1), 0]  # eval: positional dropout is identity
+        x = self.transformer_encoder(x)
+        x = x.transpose(1, 2) + res_x
+
+        return self.conv_d(self.decoder_d(x, skips))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        assert x.ndim == 3
+        assert x.shape[1:] == (self.in_channels, self.in_samples)
+        return torch.sigmoid(self.logits(x)).squeeze(1)
+
+
+def to_batch_first(model: nn.Module) -> BatchFirstSeizureTransformer:
+    """Copy `model`'s weights (stock or folded blocks) into a BatchFirstSeizureTransformer."""
+    fast = BatchFirstSeizureTransformer(
+        in_channels=model.in_channels, in_samples=model.in_samples, drop_rate=model.drop_rate
+    )
+    fast.res_cnn_stack = copy.deepcopy(model.res_cnn_stack)
+    fast.load_state_dict(model.state_dict())
+    return fast.to(next(model.parameters()).device).eval()
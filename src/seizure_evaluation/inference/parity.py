@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Parity report between two `tusz-eval` checkpoints.
+
+Used to sign off faster-but-not-bit-exact inference modes (for example
+`--filter_mode recording` or `--precision int8`) against the Wu-equivalent
+baseline: run `tusz-eval` twice on the same reference subset, then compare the
+two checkpoints.
+
+CLI:
+  python -m seizure_evaluation.inference.parity \
+    --baseline experiments/dev/baseline/checkpoint.pkl \
+    --candidate experiments/dev/recording_filter/checkpoint.pkl \
+    --out experiments/dev/recording_filter/parity_report.json
+
+Reported:
+  - AUROC of each run and the delta (candidate - baseline)
+  - Sample-probability drift: max/mean/p99 absolute deviation
+  - Fraction of samples whose decision flips at the paper threshold (0.8)
+  - Event-level OVERLAP (native scorer, paper post-processing): sensitivity,
+    FA/24h, hits/misses/false alarms for both runs and their deltas
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pickle
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+from seizure_evaluation.ovlp.overlap_scorer import Event, OverlapMetrics, OverlapScorer
+from seizure_evaluation.ovlp.post_processing import apply_seizure_transformer_postprocessing
+from seizure_evaluation.tusz.cli import create_binary_labels
+
+
+def load_results(checkpoint_pkl: Path) -> dict[str, Any]:
+    """Load the `results` mapping from a tusz-eval checkpoint."""
+    with open(checkpoint_pkl, "rb") as f:
+        ckpt = pickle.load(f)
+    return ckpt.get("results", ckpt)
+
+
+def _overlap_metrics(
+    results: dict[str, Any], file_ids: list[str], threshold: float, fs: int
+) -> OverlapMetrics:
+    """Micro-averaged native OVERLAP metrics with the paper's post-processing."""
+    scorer = OverlapScorer()
+    total = OverlapMetrics(hits=0, misses=0, false_alarms=0, total_duration_sec=0.0)
+    for fid in file_ids:
+        preds = np.asarray(results[fid]["predictions"])
+        duration = len(preds) / fs
+        ref = [Event(s, e) for s, e in results[fid].get("seizure_events") or []]
+        hyp = [
+            Event(s, e)
+            for s, e in apply_seizure_transformer_postprocessing(preds, threshold=threshold, fs=fs)
+        ]
+        m = scorer.score_events(ref, hyp, duration)
+        total.hits += m.hits
+        total.misses += m.misses
+        total.false_alarms += m.false_alarms
+        total.bckg_false_alarms += m.bckg_false_alarms
+        total.total_duration_sec += duration
+    return total
+
+
+def _overlap_summary(m: OverlapMetrics) -> dict[str, float]:
+    return {
+        "hits": m.hits,
+        "misses": m.misses,
+        "false_alarms": m.false_alarms,
+        "sensitivity": m.sensitivity,
+        "fa_per_24h": m.fa_per_24h,
+    }
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    candidate: dict[str, Any],
+    threshold: float = 0.8,
+    fs: int = 256,
+) -> dict[str, Any]:
+    """
+    Compare per-file predictions from two checkpoint result maps.
+
+    Args:
+        baseline: `results` mapping (file_id -> entry) of the reference run
+        candidate: `results` mapping of the run under test
+        threshold: Decision threshold used to count flipped samples
+        fs: Sampling rate of predictions (Hz)
+
+    Returns:
+        JSON-serializable report dict
+    """
+    common = sorted(
+        fid
+        for fid in baseline.keys() & candidate.keys()
+        if baseline[fid].get("predictions") is not None
+        and candidate[fid].get("predictions") is not None
+    )
+
+    base_all: list[np.ndarray] = []
+    cand_all: list[np.ndarray] = []
+    labels_all: list[np.ndarray] = []
+    per_file: dict[str, dict[str, float]] = {}
+
+    for fid in common:
+        base = np.asarray(baseline[fid]["predictions"], dtype=np.float64)
+        cand = np.asarray(candidate[fid]["predictions"], dtype=np.float64)
+        n = min(len(base), len(cand))
+        base, cand = base[:n], cand[:n]
+        labels = create_binary_labels(baseline[fid].get("seizure_events") or [], n, fs=fs)
+
+        dev = np.abs(cand - base)
+        per_file[fid] = {
+            "max_abs_dev": float(dev.max()) if n else 0.0,
+            "mean_abs_dev": float(dev.mean()) if n else 0.0,
+        }
+        base_all.append(base)
+        cand_all.append(cand)
+        labels_all.append(labels)
+
+    report: dict[str, Any] = {
+        "files_compared": len(common),
+        "files_only_in_baseline": sorted(baseline.keys() - candidate.keys()),
+        "files_only_in_candidate": sorted(candidate.keys() - baseline.keys()),
+        "threshold": threshold,
+    }
+    if not common:
+        return report
+
+    base_cat = np.concatenate(base_all)
+    cand_cat = np.concatenate(cand_all)
+    labels_cat = np.concatenate(labels_all)
+    dev = np.abs(cand_cat - base_cat)
+
+    auroc_base = auroc_cand = None
+    if 0 < labels_cat.sum() < len(labels_cat):
+        auroc_base = float(roc_auc_score(labels_cat, base_cat))
+        auroc_cand = float(roc_auc_score(labels_cat, cand_cat))
+
+    report.update(
+        {
+            "total_samples": int(len(dev)),
+            "auroc_baseline": auroc_base,
+            "auroc_candidate": auroc_cand,
+            "auroc_delta": (
+                auroc_cand - auroc_base
+                if auroc_base is not None and auroc_cand is not None
+                else None
+            ),
+            "max_abs_dev": float(dev.max()),
+            "mean_abs_dev": float(dev.mean()),
+            "p99_abs_dev": float(np.percentile(dev, 99)),
+            "decision_flip_fraction": float(
+                np.mean((base_cat > threshold) != (cand_cat > threshold))
+            ),
+            "per_file": per_file,
+        }
+    )
+
+    ovlp_base = _overlap_summary(_overlap_metrics(baseline, common, threshold, fs))
+    ovlp_cand = _overlap_summary(_overlap_metrics(candidate, common, threshold, fs))
+    report["overlap"] = {
+        "baseline": ovlp_base,
+        "candidate": ovlp_cand,
+        "delta": {k: ovlp_cand[k] - ovlp_base[k] for k in ovlp_base},
+    }
+    return report
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Compare two tusz-eval checkpoints")
+    p.add_argument("--baseline", type=str, required=True, help="Reference checkpoint.pkl")
+    p.add_argument("--candidate", type=str, required=True, help="Checkpoint.pkl under test")
+    p.add_argument("--out", type=str, default=None, help="Optional path for the JSON report")
+    p.add_argument("--threshold", type=float, default=0.8, help="Probability threshold")
+    args = p.parse_args()
+
+    report = compare_results(
+        load_results(Path(args.baseline)),
+        load_results(Path(args.candidate)),
+        threshold=args.threshold,
+    )
+
+    summary = {k: v for k, v in report.items() if k != "per_file"}
+    print(json.dumps(summary, indent=2))
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with open(out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+"""
+Prefetching EDF decode + preprocessing pipeline for `tusz-eval`.
+
+`RecordingPrefetcher` is the producer side of a producer/consumer pipeline: a
+pool of worker processes loads upcoming EDFs, z-scores, resamples, windows and
+filters them while the main process runs the model on earlier recordings.
+At most `prefetch_depth` recordings are in flight or waiting to be consumed, so
+memory stays bounded no matter how fast the workers are (backpressure: a new
+recording is only submitted when the consumer takes one). Recordings are
+yielded in submission order.
+
+With a `WindowCache`, recordings preprocessed by an earlier run are
+memory-mapped from the cache instead of being decoded, and newly prepared
+ones are added to it.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from seizure_evaluation.inference.dataset import WindowStack, build_dataset, materialize_windows
+from seizure_evaluation.inference.window_cache import WindowCache
+
+# (edf_path) -> (data, fs, load_method); must be a module-level function when workers > 0
+RecordingLoader = Callable[[Path], tuple[np.ndarray, float, str]]
+
+
+@dataclass
+class PreparedRecording:
+    """One recording ready for the model, or the error that prevented it."""
+
+    idx: int
+    edf_path: Path
+    windows: WindowStack | None
+    seq_len: int
+    load_method: str | None
+    error: str | None = None
+    window_cache_status: str | None = None  # see window_cache.LOOKUP_STATUSES
+
+    @property
+    def file_id(self) -> str:
+        return self.edf_path.stem
+
+
+def prepare_recording(
+    idx: int,
+    edf_path: Path,
+    loader: RecordingLoader,
+    filter_mode: str = "window",
+    overlap_ratio: float = 0.0,
+    resample_method: str = "fft",
+    window_cache: WindowCache | None = None,
+) -> PreparedRecording:
+    """Load, normalize, resample, window and filter one EDF (never raises).
+
+    With a `window_cache`, a cached entry replaces all of that, and freshly
+    prepared windows are stored (and returned memory-mapped from the cache).
+    The outcome is reported in `window_cache_status`, since this may run in a
+    worker process whose counters would be lost.
+    """
+    config = {
+        "filter_mode": filter_mode,
+        "overlap_ratio": overlap_ratio,
+        "resample_method": resample_method,
+    }
+    status = None
+    try:
+        if window_cache is not None:
+            cached = window_cache.get(edf_path, **config)
+            if cached is not None:
+                windows, manifest = cached
+                return PreparedRecording(
+                    idx,
+                    edf_path,
+                    windows,
+                    manifest["seq_len"],
+                    manifest["load_method"],
+                    window_cache_status="hit",
+                )
+            status = "miss"
+        data, fs, load_method = loader(edf_path)
+        dataset, collate = build_dataset(
+            data,
+            fs,
+            filter_mode=filter_mode,
+            overlap_ratio=overlap_ratio,
+            resample_method=resample_method,
+        )
+        windows = materialize_windows(dataset, collate)
+        if window_cache is not None:
+            windows = window_cache.put(edf_path, windows, data.shape[1], load_method, **config)
+            status = "stored"
+    except Exception as e:
+        return PreparedRecording(
+            idx, edf_path, None, 0, None, error=str(e), window_cache_status=status
+        )
+    return PreparedRecording(
+        idx, edf_path, windows, data.shape[1], load_method, window_cache_status=status
+    )
+
+
+class RecordingPrefetcher:
+    """Iterate prepared recordings, preparing up to `prefetch_depth` ahead in worker processes."""
+
+    def __init__(
+        self,
+        jobs: Iterable[tuple[int, Path]],
+        loader: RecordingLoader,
+        filter_mode: str = "window",
+        workers: int = 0,
+        prefetch_depth: int = 4,
+        overlap_ratio: float = 0.0,
+        resample_method: str = "fft",
+        window_cache: WindowCache | None = None,
+    ):
+        """
+        Args:
+            jobs: (index, edf_path) pairs in processing order
+            loader: Function loading one EDF as (data, fs, load_method)
+            filter_mode: See `seizure_evaluation.inference.dataset.build_dataset`
+            workers: Worker processes; 0 prepares recordings inline (no pipelining)
+            prefetch_depth: Max recordings in flight or buffered (>= 1)
+            overlap_ratio: Window overlap, see `build_dataset`
+            resample_method: "fft" or "polyphase", see `build_dataset`
+            window_cache: Optional cache of preprocessed windows, see `prepare_recording`
+        """
+        if prefetch_depth < 1:
+            raise ValueError("prefetch_depth must be >= 1")
+        self.jobs = list(jobs)
+        self.loader = loader
+        self.filter_mode = filter_mode
+        self.workers = workers
+        self.prefetch_depth = prefetch_depth
+        self.overlap_ratio = overlap_ratio
+        self.resample_method = resample_method
+        self.window_cache = window_cache
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def __iter__(self) -> Iterator[PreparedRecording]:
+        if self.workers <= 0:
+            for idx, edf_path in self.jobs:
+                yield prepare_recording(
+                    idx,
+                    edf_path,
+                    self.loader,
+                    self.filter_mode,
+                    self.overlap_ratio,
+                    self.resample_method,
+                    self.window_cache,
+                )
+            return
+
+        # spawn: workers must not inherit the parent's torch/OpenMP thread state
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx) as pool:
+            jobs = iter(self.jobs)
+            in_flight: deque[Future[PreparedRecording]] = deque()
+
+            def submit_next() -> None:
+                job = next(jobs, None)
+                if job is not None:
+                    idx, edf_path = job
+                    in_flight.append(
+                        pool.submit(
+                            prepare_recording,
+                            idx,
+                            edf_path,
+                            self.loader,
+                            self.filter_mode,
+                            self.overlap_ratio,
+                            self.resample_method,
+                            self.window_cache,
+                        )
+                    )
+
+            for _ in range(self.prefetch_depth):
+                submit_next()
+            while in_flight:
+                prepared = in_flight.popleft().result()
+                submit_next()
+                yield prepared
@@ -0,0 +1,95 @@
+"""
+Prediction helpers replacing `wu_2025.utils.predict`.
+
+Wu's `predict` grows its output with `torch.cat` once per batch (quadratic
+copying for long recordings). Here the number of windows is known up front
+from the dataset, so every batch is written straight into one preallocated
+float32 buffer (optionally a memory-mapped `.npy` file) and a view truncated to
+`seq_len` is returned. Overlapping windows are instead accumulated batch by
+batch into a `stitching.OverlapAdd` timeline (the same preallocated buffer or
+memmap), without keeping every window's output.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import torch
+from wu_2025.utils import morphological_filter_1d, remove_short_events
+
+from seizure_evaluation.inference.stitching import OverlapAdd, is_contiguous
+
+
+def allocate_output(n_samples: int, out_path: Path | None = None) -> np.ndarray:
+    """Allocate a float32 output buffer in memory, or as a memory-mapped `.npy` file."""
+    if out_path is None:
+        return np.empty(n_samples, dtype=np.float32)
+    return np.lib.format.open_memmap(out_path, mode="w+", dtype=np.float32, shape=(n_samples,))
+
+
+def to_numpy(output: torch.Tensor | np.ndarray) -> np.ndarray:
+    """Model output as a numpy array (torch models return tensors, onnxruntime arrays)."""
+    if isinstance(output, torch.Tensor):
+        return output.detach().cpu().numpy()
+    return np.asarray(output)
+
+
+def predict_probabilities(
+    model: torch.nn.Module,
+    dataloader: torch.utils.data.DataLoader,
+    device: str,
+    seq_len: int,
+    out_path: Path | None = None,
+    stitch: str = "hann",
+) -> np.ndarray:
+    """
+    Run the model over a window dataloader.
+
+    Args:
+        model: SeizureTransformer (outputs per-sample probabilities)
+        dataloader: Unshuffled loader whose dataset has `window_size`, `window_starts`
+            and `__len__`
+        device: Torch device for inference
+        seq_len: Number of samples to keep (original recording length)
+        out_path: Optional `.npy` path; outputs are then written to a memmap
+        stitch: Overlap-add weighting for overlapping windows (see `stitching`)
+
+    Returns:
+        float32 array (or memmap view) of shape (seq_len,)
+    """
+    dataset = dataloader.dataset
+    window_size = dataset.window_size
+    starts = dataset.window_starts()
+    model.eval()
+    if not is_contiguous(starts, window_size):
+        stitcher = OverlapAdd(starts, window_size, seq_len, kind=stitch, out_path=out_path)
+        with torch.no_grad():
+            for batch in dataloader:
+                stitcher.add(to_numpy(model(batch.to(device))).reshape(-1, window_size))
+        return stitcher.result()
+
+    output = allocate_output(len(dataset) * window_size, out_path)
+    offset = 0
+    with torch.no_grad():
+        for batch in dataloader:
+            probs = to_numpy(model(batch.to(device)))
+            n = probs.size
+            output[offset : offset + n] = probs.reshape(-1)
+            offset += n
+    return output[:seq_len]
+
+
+def predict(
+    model: torch.nn.Module,
+    dataloader: torch.utils.data.DataLoader,
+    device: str,
+    seq_len: int,
+) -> np.ndarray:
+    """Binary seizure mask with Wu's post-processing (drop-in for `wu_2025.utils.predict`)."""
+    y_predict = predict_probabilities(model, dataloader, device, seq_len)
+
+    binary_output = (y_predict > 0.8).astype(int)
+    binary_output = morphological_filter_1d(binary_output, operation="opening", kernel_size=5)
+    binary_output = morphological_filter_1d(binary_output, operation="closing", kernel_size=5)
+    return remove_short_events(binary_output, min_length=2.0, fs=256)
@@ -0,0 +1,213 @@
+"""
+Content-addressed cache of per-recording predictions.
+
+A `tusz-eval` run in a fresh `out_dir` normally recomputes every recording.
+With `--prediction_cache`, each recording's float32 probabilities are stored
+under a key that covers everything they depend on:
+
+- the EDF content (SHA-256; a per-path size + mtime index skips re-hashing
+  unchanged files)
+- the model weights (SHA-256 of `model.pth`, or of the loaded state dict)
+- the run parameters (filter mode, resampling, overlap/stitching, precision,
+  backend, ...) and the preprocessing itself (filter coefficients, window
+  length, sampling rate)
+
+A hit skips EDF decoding and inference entirely. Entries are `.npy` files with
+a JSON sidecar, written atomically, so concurrent `--workers` processes can
+share one cache. Each hit refreshes the entry's mtime, and once the cache
+exceeds its disk budget the least recently used entries are evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from seizure_evaluation.inference.preprocessing import (
+    TARGET_FS,
+    WINDOW_SIZE,
+    design_preprocessing_sos,
+)
+from seizure_evaluation.inference.resampling import KAISER_BETA
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "seizure_evaluation" / "predictions"
+DEFAULT_MAX_BYTES = 10 * 2**30
+HASH_CHUNK_BYTES = 1 << 20
+
+
+def sha256_file(path: Path) -> str:
+    """SHA-256 of a file's content, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_weights_file() -> Path | None:
+    """Wu's `model.pth` next to the vendored `wu_2025.utils`, if present."""
+    spec = importlib.util.find_spec("wu_2025.utils")
+    if spec is None or spec.origin is None:
+        return None
+    weights = Path(spec.origin).parent / "model.pth"
+    return weights if weights.exists() else None
+
+
+def preprocessing_fingerprint() -> str:
+    """Hash of the fixed preprocessing: filter coefficients, window, rate, resampling FIR."""
+    digest = hashlib.sha256(design_preprocessing_sos(TARGET_FS).tobytes())
+    digest.update(f"fs={TARGET_FS}|window={WINDOW_SIZE}|kaiser={KAISER_BETA}".encode())
+    return digest.hexdigest()
+
+
+def write_atomic(path: Path, write: Callable[[Path], Any]) -> None:
+    """Write `path` via `write(tmp)` on a per-process temporary name, then rename it."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def write_npy_atomic(path: Path, array: np.ndarray) -> None:
+    """`np.save` to `path` atomically (see `write_atomic`)."""
+
+    def save(tmp: Path) -> None:
+        with open(tmp, "wb") as f:  # a file object keeps np.save from appending ".npy"
+            np.save(f, array)
+
+    write_atomic(path, save)
+
+
+class FileDigestIndex:
+    """Persistent path -> (size, mtime_ns, SHA-256) index; files are re-hashed only when changed."""
+
+    def __init__(self, index_file: Path):
+        self.index_file = Path(index_file)
+        self._index: dict[str, list] | None = None
+
+    def digest(self, path: Path) -> str:
+        """SHA-256 of `path`, reused while its size and mtime are unchanged."""
+        path = Path(path).resolve()
+        st = path.stat()
+        if self._index is None:
+            try:
+                self._index = json.loads(self.index_file.read_text())
+            except (OSError, ValueError):
+                self._index = {}
+        entry = self._index.get(str(path))
+        if entry is not None and entry[:2] == [st.st_size, st.st_mtime_ns]:
+            return entry[2]
+        digest = sha256_file(path)
+        self._index[str(path)] = [st.st_size, st.st_mtime_ns, digest]
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.index_file, lambda tmp: tmp.write_text(json.dumps(self._index)))
+        return digest
+
+
+class PredictionCache:
+    """Disk cache of predictions keyed by EDF content, model and preprocessing."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir: Cache directory (created on first write)
+            max_bytes: Disk budget for cached predictions; LRU entries beyond it are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._digests = FileDigestIndex(self.cache_dir / "file_index.json")
+        self._size: int | None = None
+
+    @property
+    def _entries(self) -> Path:
+        return self.cache_dir / "entries"
+
+    def file_digest(self, path: Path) -> str:
+        """SHA-256 of `path`, reused while its size and mtime are unchanged."""
+        return self._digests.digest(path)
+
+    def key(self, file_digest: str, model_fingerprint: str, params: dict[str, Any]) -> str:
+        """Cache key of one recording under one model and parameter set."""
+        payload = {
+            "edf": file_digest,
+            "model": model_fingerprint,
+            "params": params,
+            "preprocessing": preprocessing_fingerprint(),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._entries / key[:2] / f"{key}.npy"
+
+    def get(self, key: str) -> tuple[np.ndarray, dict[str, Any]] | None:
+        """(predictions, metadata) on a hit (refreshing its LRU position), else None."""
+        path = self._path(key)
+        try:
+            predictions = np.load(path)
+            meta = json.loads(path.with_suffix(".json").read_text())
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return predictions, meta
+
+    def put(self, key: str, predictions: np.ndarray, meta: dict[str, Any]) -> None:
+        """Store predictions (float32) and metadata, then enforce the disk budget."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path.with_suffix(".json"), lambda tmp: tmp.write_text(json.dumps(meta)))
+        write_npy_atomic(path, np.asarray(predictions, dtype=np.float32))
+        self.stores += 1
+        if self._size is not None:
+            self._size += path.stat().st_size
+        self.evict()
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self._entries.glob("*/*.npy"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue  # evicted by another process
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits `max_bytes`."""
+        if self._size is not None and self._size <= self.max_bytes:
+            return
+        entries = sorted(self._scan())
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+            self._size -= size
+            self.evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss/store/eviction counts and the cache's size on disk."""
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._scan())
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,82 @@
+"""
+Vectorized signal preprocessing matching `wu_2025.utils.SeizureDataset`.
+
+Wu's dataset filters every 60 s window with three `lfilter` calls in float64:
+a 3rd-order Butterworth bandpass (0.5–120 Hz) followed by 1 Hz and 60 Hz
+`iirnotch` filters (Q=30). All three are linear time-invariant, so they are
+folded here into a single second-order-sections (SOS) cascade and applied to a
+whole `(B, 19, 15360)` stack with one `sosfilt` call in float32.
+
+Each window still starts from zero filter state, exactly like the reference.
+`preprocess_recording` is the opt-in alternative that filters a whole recording
+once, so filter state carries across window boundaries (see `filter_mode` in
+`seizure_evaluation.inference.dataset.get_dataloader`).
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+from scipy.signal import butter, iirnotch, sosfilt, tf2sos
+
+TARGET_FS = 256  # Model input rate (Hz)
+WINDOW_SIZE = 15360  # 60 s at 256 Hz
+LOWCUT_HZ = 0.5
+HIGHCUT_HZ = 120.0
+BANDPASS_ORDER = 3
+NOTCH_FREQS_HZ = (1.0, 60.0)
+NOTCH_Q = 30.0
+
+
+@lru_cache(maxsize=8)
+def design_preprocessing_sos(fs: int = TARGET_FS) -> np.ndarray:
+    """
+    Build the bandpass + notch cascade as one SOS matrix.
+
+    Args:
+        fs: Sampling frequency of the signal being filtered
+
+    Returns:
+        Cached float32 array of shape (n_sections, 6); do not modify in place
+    """
+    nyq = 0.5 * fs
+    sections = [
+        butter(BANDPASS_ORDER, [LOWCUT_HZ / nyq, HIGHCUT_HZ / nyq], btype="band", output="sos")
+    ]
+    for freq in NOTCH_FREQS_HZ:
+        b, a = iirnotch(freq, Q=NOTCH_Q, fs=fs)
+        sections.append(tf2sos(b, a))
+    return np.vstack(sections).astype(np.float32)
+
+
+def preprocess_windows(windows: np.ndarray, fs: int = TARGET_FS) -> np.ndarray:
+    """
+    Filter a stack of windows along the last axis in a single call.
+
+    Args:
+        windows: Array of shape (..., n_samples), e.g. (B, 19, 15360)
+        fs: Sampling frequency in Hz
+
+    Returns:
+        Filtered float32 array with the same shape as `windows`
+    """
+    x = np.asarray(windows, dtype=np.float32)
+    return sosfilt(design_preprocessing_sos(fs), x, axis=-1).astype(np.float32, copy=False)
+
+
+def preprocess_recording(data: np.ndarray, fs: int = TARGET_FS) -> np.ndarray:
+    """
+    Filter a full (channels, samples) recording once, carrying filter state.
+
+    Unlike `preprocess_windows`, filter warm-up happens only at the start of the
+    recording, so outputs differ from Wu's per-window filtering near window starts.
+
+    Args:
+        data: Normalized, resampled recording of shape (channels, samples)
+        fs: Sampling frequency in Hz
+
+    Returns:
+        Filtered float32 array of the same shape
+    """
+    return preprocess_windows(data, fs=fs)
@@ -0,0 +1,204 @@
+"""
+Rational polyphase resampling to 256 Hz, whole-recording or in chunks.
+
+Wu's pipeline resamples with `scipy.signal.resample` (one FFT over the whole
+recording). Here the rate change fs_in -> 256 Hz is expressed as a reduced
+fraction up/down (250 Hz: 128/125, 400 Hz: 16/25, 512 Hz: 1/2) and applied with
+`scipy.signal.resample_poly` using the same Kaiser-windowed FIR that
+`resample_poly` designs by default. Filter banks are designed once per
+(fs_in, 256) pair and cached (`filter_bank`), and resampling runs in float32.
+
+`ChunkedResampler.segment` produces any range of output samples from a slice of
+the input with enough context on both sides for the FIR. The slice start is
+aligned to the polyphase period, so chunked output matches resampling the
+whole recording at once. Recording edges see the same zero padding.
+
+`StreamingResampler` applies the same filter to a live stream, emitting each
+output sample once the input its FIR needs has arrived.
+
+Output lengths follow the FFT path: int(n_in * 256 / fs_in) samples.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from fractions import Fraction
+from functools import lru_cache
+
+import numpy as np
+from scipy.signal import firwin, resample_poly
+
+from seizure_evaluation.inference.preprocessing import TARGET_FS
+
+KAISER_BETA = 5.0  # resample_poly's default window
+
+
+def rational_ratio(fs_in: float, fs_out: int = TARGET_FS) -> tuple[int, int]:
+    """(up, down) with fs_out / fs_in = up / down in lowest terms."""
+    ratio = Fraction(fs_out) / Fraction(fs_in).limit_denominator(10_000)
+    return ratio.numerator, ratio.denominator
+
+
+def design_resampling_filter(up: int, down: int) -> np.ndarray:
+    """Anti-aliasing FIR taps as designed by `scipy.signal.resample_poly` (unscaled)."""
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    return firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", KAISER_BETA))
+
+
+@lru_cache(maxsize=32)
+def _cached_taps(up: int, down: int) -> np.ndarray:
+    taps = design_resampling_filter(up, down).astype(np.float32)
+    taps.setflags(write=False)
+    return taps
+
+
+def filter_bank(fs_in: float, fs_out: int = TARGET_FS) -> tuple[int, int, np.ndarray | None]:
+    """
+    (up, down, taps) for resampling fs_in -> fs_out, designed once per ratio.
+
+    Taps are float32 and read-only (`resample_poly` copies them before scaling);
+    None when no resampling is needed.
+    """
+    up, down = rational_ratio(fs_in, fs_out)
+    if up == down:
+        return up, down, None
+    return up, down, _cached_taps(up, down)
+
+
+def resampled_length(n_in: int, fs_in: float, fs_out: int = TARGET_FS) -> int:
+    """Output length of Wu's FFT resampling (`int(n_in * fs_out / fs_in)`)."""
+    return int(n_in * float(fs_out) / fs_in)
+
+
+class ChunkedResampler:
+    """Polyphase resampler from `fs_in` to 256 Hz over ranges of output samples."""
+
+    def __init__(self, fs_in: float, fs_out: int = TARGET_FS):
+        self.fs_in = fs_in
+        self.fs_out = fs_out
+        self.up, self.down, self.taps = filter_bank(fs_in, fs_out)
+        self.margin = 0
+        if not self.is_identity:
+            half_len = (len(self.taps) - 1) // 2
+            # Input samples of context the FIR needs on each side of a segment
+            self.margin = math.ceil(half_len / self.up) + 1
+
+    @property
+    def is_identity(self) -> bool:
+        return self.up == self.down
+
+    def output_length(self, n_in: int) -> int:
+        return resampled_length(n_in, self.fs_in, self.fs_out)
+
+    def resample(self, x: np.ndarray, chunk_samples: int | None = None) -> np.ndarray:
+        """
+        Resample a whole (channels, samples) array along the last axis, in float32.
+
+        Args:
+            x: Input recording
+            chunk_samples: If set, produce the output this many samples at a time
+                (bounds the temporary memory of `resample_poly`)
+
+        Returns:
+            float32 array of shape (channels, output_length(samples))
+        """
+        x = np.asarray(x, dtype=np.float32)
+        if self.is_identity:
+            return x
+        n_in = x.shape[-1]
+        n_out = self.output_length(n_in)
+        if chunk_samples is None:
+            y = resample_poly(x, self.up, self.down, axis=-1, window=self.taps)
+            return y[..., :n_out]
+
+        out = np.empty((*x.shape[:-1], n_out), dtype=np.float32)
+        for start in range(0, n_out, chunk_samples):
+            stop = min(start + chunk_samples, n_out)
+            out[..., start:stop] = self.segment(lambda i0, i1: x[..., i0:i1], n_in, start, stop)
+        return out
+
+    def segment(
+        self, read: Callable[[int, int], np.ndarray], n_in: int, start: int, stop: int
+    ) -> np.ndarray:
+        """
+        Output samples [start, stop) of resampling a length-`n_in` signal.
+
+        Args:
+            read: Function returning input samples [i0, i1) as (channels, i1 - i0)
+            n_in: Total number of input samples
+            start: First output sample
+            stop: End of the output range (exclusive, <= output_length(n_in))
+
+        Returns:
+            float32 array of shape (channels, stop - start)
+        """
+        if self.is_identity:
+            return read(start, stop)
+        i0 = max(0, start * self.down // self.up - self.margin)
+        i0 -= i0 % self.down  # align to the polyphase period
+        i1 = min(n_in, -(-stop * self.down // self.up) + self.margin)
+        chunk = np.asarray(read(i0, i1), dtype=np.float32)
+        y = resample_poly(chunk, self.up, self.down, axis=-1, window=self.taps)
+        offset = start - i0 * self.up // self.down
+        return y[:, offset : offset + stop - start]
+
+
+class StreamingResampler:
+    """
+    Stateful polyphase resampler for a stream of (channels, n) chunks.
+
+    Emits each output sample as soon as all input samples its FIR needs have
+    arrived, i.e. with a lookahead of `margin` input samples. The concatenated
+    output of `push` calls plus `finish` equals `ChunkedResampler.resample` of
+    the whole stream exactly.
+    """
+
+    def __init__(self, fs_in: float, n_channels: int, fs_out: int = TARGET_FS):
+        self._resampler = ChunkedResampler(fs_in, fs_out)
+        self._buffer = np.empty((n_channels, 0), dtype=np.float32)
+        self._buffer_start = 0  # input index of self._buffer[:, 0]
+        self.n_in = 0
+        self.n_out = 0
+
+    @property
+    def lookahead_sec(self) -> float:
+        """Input seconds an output sample waits for (FIR half-length)."""
+        return self._resampler.margin / self._resampler.fs_in
+
+    def _read(self, i0: int, i1: int) -> np.ndarray:
+        return self._buffer[:, i0 - self._buffer_start : i1 - self._buffer_start]
+
+    def _emit(self, stop: int, n_in: int) -> np.ndarray:
+        r = self._resampler
+        start = self.n_out
+        if stop <= start:
+            return self._buffer[:, :0]
+        out = r.segment(self._read, n_in, start, stop)
+        self.n_out = stop
+        # Keep only the input the next segment can reach back to
+        i0 = max(0, stop * r.down // r.up - r.margin)
+        i0 -= i0 % r.down
+        if i0 > self._buffer_start:
+            self._buffer = self._buffer[:, i0 - self._buffer_start :]
+            self._buffer_start = i0
+        return out
+
+    def push(self, chunk: np.ndarray) -> np.ndarray:
+        """Add input samples; return the output samples that became final (float32)."""
+        chunk = np.asarray(chunk, dtype=np.float32)
+        self.n_in += chunk.shape[1]
+        r = self._resampler
+        if r.is_identity:
+            self.n_out = self.n_in
+            return chunk
+        self._buffer = np.concatenate([self._buffer, chunk], axis=1)
+        ready = max(0, (self.n_in - r.margin) * r.up // r.down)
+        return self._emit(min(ready, r.output_length(self.n_in)), self.n_in)
+
+    def finish(self) -> np.ndarray:
+        """Remaining output samples, treating the stream as ended (zero padding)."""
+        if self._resampler.is_identity:
+            return self._buffer[:, :0]
+        return self._emit(self._resampler.output_length(self.n_in), self.n_in)
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Warm inference server: keeps SeizureTransformer loaded between requests.
+
+Every `tusz-eval` run pays the torch import, `torch.load` of `model.pth` and
+first-call overhead (oneDNN primitive creation) before its first window. The
+server pays this once, then answers requests over HTTP on a Unix domain socket
+(`--socket`) or on localhost TCP (`--host/--port`). Everything is local and
+offline (standard library `http.server`, no external services).
+
+API:
+  GET  /health                      server status and settings (JSON)
+  POST /predict?output=...          run the model on one recording
+       body: JSON {"edf_path": "/abs/path.edf"}          (Content-Type application/json)
+          or a (19, samples) `.npy` array, with `&fs=...` (Content-Type application/x-npy)
+       output=probabilities (default): float32 per-sample probabilities as `.npy`
+       output=events: JSON {"events": [[start_sec, end_sec], ...], "n_samples", "load_method"}
+       optional: threshold, kernel, min_duration (paper post-processing: 0.8, 5, 2.0)
+
+Preprocessing and prediction are exactly those of `tusz-eval` for the same
+flags, and forward passes are serialized, so concurrent clients are safe.
+With `--max_latency_ms`, windows of concurrent requests are instead pooled
+into shared forward passes by an asyncio `MicroBatcher` (up to `--batch_size`
+windows, waiting at most that long for more); /health then includes its
+queue depth, fill ratio and p50/p99 latency.
+Use `seizure_evaluation.inference.client` (`seizure-client`) to query it.
+
+CLI:
+  seizure-serve --socket /tmp/seizure.sock --precision fp32 --batch_size 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socketserver
+import stat
+import threading
+import time
+from collections.abc import Callable
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import torch
+
+from seizure_evaluation.inference.batcher import MicroBatcher
+from seizure_evaluation.inference.client import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    JSON_CONTENT_TYPE,
+    NPY_CONTENT_TYPE,
+    OUTPUTS,
+    from_npy_bytes,
+    to_npy_bytes,
+)
+from seizure_evaluation.inference.dataset import (
+    FILTER_MODES,
+    RESAMPLE_METHODS,
+    build_dataset,
+    get_dataloader,
+    materialize_windows,
+)
+from seizure_evaluation.inference.models import PRECISIONS, load_model
+from seizure_evaluation.inference.predict import predict_probabilities
+from seizure_evaluation.inference.preprocessing import TARGET_FS, WINDOW_SIZE
+from seizure_evaluation.inference.stitching import overlap_add
+from seizure_evaluation.ovlp.post_processing import apply_seizure_transformer_postprocessing
+
+N_CHANNELS = 19
+
+RecordingLoader = Callable[[Path], tuple[np.ndarray, float, str]]
+
+
+class InferenceService:
+    """A loaded model plus the `tusz-eval` preprocessing settings it serves with."""
+
+    def __init__(
+        self,
+        model: torch.nn.Module,
+        device: str = "cpu",
+        batch_size: int = 64,
+        filter_mode: str = "window",
+        resample_method: str = "fft",
+        recording_loader: RecordingLoader | None = None,
+        max_latency_ms: float | None = None,
+    ):
+        """
+        Args:
+            model: Model returning per-sample probabilities for (B, 19, 15360) windows
+            device: Torch device of `model`
+            batch_size: Windows per forward pass
+            filter_mode: See `seizure_evaluation.inference.dataset.build_dataset`
+            resample_method: See `build_dataset`
+            recording_loader: EDF loader returning (data, fs, load_method)
+                (default: `tusz-eval`'s `load_recording`)
+            max_latency_ms: If set, pool windows of concurrent requests with a
+                `MicroBatcher` (batches of up to `batch_size` windows)
+        """
+        if recording_loader is None:
+            from seizure_evaluation.tusz.cli import load_recording as recording_loader
+        self.model = model
+        self.model.eval()
+        self.device = device
+        self.batch_size = batch_size
+        self.filter_mode = filter_mode
+        self.resample_method = resample_method
+        self.recording_loader = recording_loader
+        self.started = time.time()
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._batcher: MicroBatcher | None = None
+        if max_latency_ms is not None:
+            # The batcher's event loop runs in its own thread; HTTP threads submit to it
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, name="batcher", daemon=True).start()
+            self._batcher = MicroBatcher(model, device, batch_size, max_latency_ms)
+            asyncio.run_coroutine_threadsafe(self._batcher.start(), self._loop).result()
+
+    def warm_up(self) -> None:
+        """One forward pass on a zero batch (allocator, oneDNN primitive caches)."""
+        x = torch.zeros(self.batch_size, N_CHANNELS, WINDOW_SIZE, device=self.device)
+        with self._lock, torch.inference_mode():
+            self.model(x)
+
+    def predict_array(self, data: np.ndarray, fs: float) -> np.ndarray:
+        """Per-sample probabilities of a raw (19, samples) recording, as `tusz-eval` computes them."""
+        if data.ndim != 2 or data.shape[0] != N_CHANNELS:
+            raise ValueError(f"Expected ({N_CHANNELS}, samples) data, got shape {data.shape}")
+        if self._batcher is not None:
+            return self._predict_batched(data, fs)
+        dataloader = get_dataloader(
+            data,
+            fs=fs,
+            batch_size=self.batch_size,
+            filter_mode=self.filter_mode,
+            resample_method=self.resample_method,
+        )
+        with self._lock:
+            self.requests += 1
+            return predict_probabilities(self.model, dataloader, self.device, data.shape[1])
+
+    def _predict_batched(self, data: np.ndarray, fs: float) -> np.ndarray:
+        dataset, collate = build_dataset(
+            data, fs, filter_mode=self.filter_mode, resample_method=self.resample_method
+        )
+        windows = materialize_windows(dataset, collate)
+        submitted = asyncio.run_coroutine_threadsafe(
+            self._batcher.submit(windows.windows), self._loop
+        )
+        outputs = submitted.result()
+        with self._lock:
+            self.requests += 1
+        return overlap_add(outputs, windows.window_starts(), data.shape[1])
+
+    def close(self) -> None:
+        """Stop the micro-batcher, if any."""
+        if self._batcher is not None:
+            asyncio.run_coroutine_threadsafe(self._batcher.close(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._batcher = None
+
+    def predict_edf(self, edf_path: Path) -> tuple[np.ndarray, str]:
+        """(probabilities, load_method) for an EDF readable by the server."""
+        data, fs, load_method = self.recording_loader(Path(edf_path))
+        return self.predict_array(data, fs), load_method
+
+    def status(self) -> dict[str, Any]:
+        status = {
+            "status": "ok",
+            "device": self.device,
+            "batch_size": self.batch_size,
+            "filter_mode": self.filter_mode,
+            "resample_method": self.resample_method,
+            "requests": self.requests,
+            "uptime_sec": time.time() - self.started,
+        }
+        if self._batcher is not None:
+            status["batcher"] = self._batcher.stats()
+        return status
+
+
+def events_for(predictions: np.ndarray, params: dict[str, str]) -> list[tuple[float, float]]:
+    """Paper post-processing with optional threshold/kernel/min_duration overrides."""
+    return apply_seizure_transformer_postprocessing(
+        predictions,
+        threshold=float(params.get("threshold", 0.8)),
+        morph_kernel_size=int(params.get("kernel", 5)),
+        min_duration_sec=float(params.get("min_duration", 2.0)),
+        fs=TARGET_FS,
+    )
+
+
+class InferenceRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler; `self.server.service` is the InferenceService."""
+
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "local"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+        self._send(status, json.dumps(payload).encode(), JSON_CONTENT_TYPE)
+
+    def do_GET(self) -> None:
+        if urlparse(self.path).path != "/health":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        self._send_json(200, self.server.service.status())
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if url.path != "/predict":
+            self._send_json(404, {"error": f"Unknown path {url.path}"})
+            return
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            self._predict(params, body)
+        except (ValueError, KeyError, FileNotFoundError) as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+    def _predict(self, params: dict[str, str], body: bytes) -> None:
+        service: InferenceService = self.server.service
+        output = params.get("output", "probabilities")
+        if output not in OUTPUTS:
+            raise ValueError(f"output must be one of {OUTPUTS}, got {output!r}")
+
+        content_type = self.headers.get("Content-Type", JSON_CONTENT_TYPE)
+        if content_type == NPY_CONTENT_TYPE:
+            if "fs" not in params:
+                raise ValueError("fs query parameter is required for array requests")
+            predictions = service.predict_array(from_npy_bytes(body), float(params["fs"]))
+            load_method = "array"
+        else:
+            request = json.loads(body)
+            predictions, load_method = service.predict_edf(Path(request["edf_path"]))
+
+        if output == "probabilities":
+            self._send(200, to_npy_bytes(predictions.astype(np.float32)), NPY_CONTENT_TYPE)
+            return
+        payload = {
+            "events": [list(e) for e in events_for(predictions, params)],
+            "n_samples": int(predictions.size),
+            "load_method": load_method,
+        }
+        self._send_json(200, payload)
+
+
+class LocalHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        try:
+            mode = os.lstat(self.server_address).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(
+                    f"--socket path exists and is not a socket: {self.server_address}"
+                )
+            os.unlink(self.server_address)  # stale socket from an earlier run
+        super().server_bind()
+        os.chmod(self.server_address, 0o600)  # owner-only, like the model files
+
+
+def make_server(
+    service: InferenceService,
+    socket_path: str | Path | None = None,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    verbose: bool = False,
+) -> socketserver.BaseServer:
+    """
+    Bind an HTTP server for `service` (Unix socket if `socket_path`, else TCP).
+
+    Returns:
+        Server; call `serve_forever()` (and `shutdown()` from another thread)
+    """
+    if socket_path is not None:
+        server = UnixHTTPServer(str(socket_path), InferenceRequestHandler)
+    else:
+        server = LocalHTTPServer((host, port), InferenceRequestHandler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Serve SeizureTransformer from a warm process")
+    p.add_argument("--socket", type=str, default=None, help="Unix socket path (default: TCP)")
+    p.add_argument("--host", type=str, default=DEFAULT_HOST, help="TCP host (localhost only)")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p.add_argument("--device", type=str, default="auto", choices=["auto", "cuda", "cpu"])
+    p.add_argument("--batch_size", type=int, default=64)
+    p.add_argument(
+        "--max_latency_ms",
+        type=float,
+        default=None,
+        help="Pool windows of concurrent requests, waiting at most this long (e.g. 20)",
+    )
+    p.add_argument("--filter_mode", type=str, default="window", choices=list(FILTER_MODES))
+    p.add_argument("--resample", type=str, default="fft", choices=list(RESAMPLE_METHODS))
+    p.add_argument("--precision", type=str, default="fp32", choices=list(PRECISIONS))
+    p.add_argument("--optimize", action="store_true", help="Fold ResCNN BatchNorm into Conv1d")
+    p.add_argument("--batch_first", action="store_true", help="Batch-first encoder fast path")
+    p.add_argument("--verbose", action="store_true", help="Log every request")
+    args = p.parse_args()
+
+    if args.host not in ("127.0.0.1", "localhost"):
+        p.error("--host must be a loopback address; the server has no authentication")
+    device = args.device
+    if device == "auto":
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    from wu_2025.utils import load_models
+
+    print("Loading model...")
+    model_loader = partial(
+        load_model,
+        precision=args.precision,
+        loader=load_models,
+        optimize=args.optimize,
+        batch_first=args.batch_first,
+    )
+    service = InferenceService(
+        model_loader(device),
+        device=device,
+        batch_size=args.batch_size,
+        filter_mode=args.filter_mode,
+        resample_method=args.resample,
+        max_latency_ms=args.max_latency_ms,
+    )
+    service.warm_up()
+    server = make_server(service, args.socket, args.host, args.port, verbose=args.verbose)
+    where = args.socket or f"http://{args.host}:{args.port}"
+    print(f"✅ Serving on {where} ({device}, {args.precision}, batch {args.batch_size})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
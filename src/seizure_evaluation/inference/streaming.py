@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Real-time streaming seizure detection.
+
+`StreamingSeizureDetector` takes arbitrary-sized (19, n) chunks at the native
+sampling rate and carries every stage's state across chunks:
+
+1. z-score with running per-channel statistics (Welford, float64), or with
+   fixed `mean`/`std` from a calibration recording
+2. polyphase resampling to 256 Hz (`resampling.StreamingResampler`)
+3. bandpass + notch IIR filtering with carried `sosfilt` state (as
+   `--filter_mode recording`)
+4. a ring buffer holding the last 15360 filtered samples (one model window)
+
+Once the first 60 s have arrived, the model runs on the ring buffer every
+`hop_sec`. Each run emits probabilities for the newest `hop_sec` of the
+stream (the first run emits its whole window), so the emitted probabilities
+form one contiguous 256 Hz timeline. Windows reached within a single `push`
+run in batches of at most `batch_size`, so one large chunk (e.g. unpaced
+`replay`) never holds more than one batch of windows in memory. `StreamingPostProcessor` applies the paper post-processing
+(threshold, opening/closing, minimum duration) incrementally and emits
+onset/offset events. Its events equal `apply_seizure_transformer_postprocessing`
+of the emitted probabilities.
+
+Latency (from a sample arriving to its probability being emitted), worst case,
+excluding model compute:
+    resampler lookahead (FIR half-length, ~45 ms for 250/400/512 Hz input)
+    + hop_sec (a sample waits for the next model run)
+An onset event is additionally confirmed only once the event has lasted
+`min_duration_sec` (2 s) and after the morphological holdback
+(POSTPROCESS_HOLDBACK samples, 62.5 ms). `latency_bound_sec` returns these
+bounds. Model compute adds one forward per hop (measure it with `replay`).
+Nothing is emitted during the first 60 s of a stream.
+
+Differences from offline `tusz-eval`: statistics are causal (unless fixed),
+resampling is polyphase, filtering carries state across windows, and each
+sample is scored near the right edge of its window (little right context).
+
+CLI (replay harness):
+  python -m seizure_evaluation.inference.streaming --edf rec.edf --speed 10 --hop_sec 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import torch
+from scipy.ndimage import binary_closing, binary_opening
+from scipy.signal import sosfilt
+
+from seizure_evaluation.inference.predict import to_numpy
+from seizure_evaluation.inference.preprocessing import (
+    TARGET_FS,
+    WINDOW_SIZE,
+    design_preprocessing_sos,
+)
+from seizure_evaluation.inference.resampling import StreamingResampler
+
+N_CHANNELS = 19
+# Opening then closing with a k-sample kernel reaches 2 * (k - 1) samples either side
+POSTPROCESS_HOLDBACK = 16
+
+
+@dataclass
+class StreamEvent:
+    """A seizure onset or offset on the 256 Hz stream timeline."""
+
+    kind: str  # "onset" or "offset"
+    time_sec: float
+
+
+@dataclass
+class StreamUpdate:
+    """Output of one `push`/`finish`: new probabilities and events."""
+
+    start_sample: int  # 256 Hz index of probabilities[0]
+    probabilities: np.ndarray
+    events: list[StreamEvent] = field(default_factory=list)
+
+
+class StreamingPostProcessor:
+    """Incremental threshold -> opening -> closing -> minimum-duration events."""
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        morph_kernel_size: int = 5,
+        min_duration_sec: float = 2.0,
+        fs: int = TARGET_FS,
+    ):
+        if 2 * (morph_kernel_size - 1) > POSTPROCESS_HOLDBACK:
+            raise ValueError(f"morph_kernel_size must be <= {POSTPROCESS_HOLDBACK // 2 + 1}")
+        self.threshold = threshold
+        self.kernel = np.ones(morph_kernel_size, dtype=bool)
+        self.min_samples = int(min_duration_sec * fs)
+        self.fs = fs
+        self.events: list[tuple[float, float]] = []  # completed (start_sec, end_sec)
+        self._raw = np.zeros(0, dtype=bool)  # thresholded samples from _raw_start on
+        self._raw_start = 0
+        self._final = 0  # samples with a final post-processed decision
+        self._open: int | None = None  # start sample of the current event
+        self._onset_emitted = False
+
+    def _finalize(self, stop: int) -> list[StreamEvent]:
+        context = max(0, self._final - POSTPROCESS_HOLDBACK)
+        raw = self._raw[context - self._raw_start :]
+        # Same operations as apply_seizure_transformer_postprocessing; the context
+        # and holdback keep the window borders out of reach of final decisions
+        binary = binary_closing(binary_opening(raw, structure=self.kernel), structure=self.kernel)
+        decisions = binary[self._final - context : stop - context]
+
+        out: list[StreamEvent] = []
+        padded = np.concatenate([[self._open is not None], decisions])
+        edges = np.flatnonzero(np.diff(padded.astype(np.int8))) + self._final
+        for edge in [*edges.tolist(), None]:
+            if self._open is not None and not self._onset_emitted:
+                reached = self._open + self.min_samples
+                if reached <= (stop if edge is None else edge):
+                    out.append(StreamEvent("onset", self._open / self.fs))
+                    self._onset_emitted = True
+            if edge is None:
+                break
+            if self._open is None:
+                self._open, self._onset_emitted = edge, False
+            else:
+                if self._onset_emitted:
+                    out.append(StreamEvent("offset", edge / self.fs))
+                    self.events.append((self._open / self.fs, edge / self.fs))
+                self._open = None
+        self._final = stop
+
+        keep = max(0, self._final - POSTPROCESS_HOLDBACK)
+        self._raw = self._raw[keep - self._raw_start :]
+        self._raw_start = keep
+        return out
+
+    def push(self, probabilities: np.ndarray) -> list[StreamEvent]:
+        """Add the next probabilities; return events that became final."""
+        self._raw = np.concatenate([self._raw, np.asarray(probabilities) > self.threshold])
+        stop = self._raw_start + len(self._raw) - POSTPROCESS_HOLDBACK
+        return self._finalize(stop) if stop > self._final else []
+
+    def finish(self) -> list[StreamEvent]:
+        """Finalize the remaining samples and close an open event at the end of the stream."""
+        end = self._raw_start + len(self._raw)
+        out = self._finalize(end) if end > self._final else []
+        if self._open is not None:
+            if self._onset_emitted:
+                out.append(StreamEvent("offset", end / self.fs))
+                self.events.append((self._open / self.fs, end / self.fs))
+            self._open = None
+        return out
+
+
+class StreamingSeizureDetector:
+    """Chunk-by-chunk SeizureTransformer inference with incremental events."""
+
+    def __init__(
+        self,
+        model: torch.nn.Module,
+        fs: float,
+        device: str = "cpu",
+        hop_sec: float = 1.0,
+        mean: np.ndarray | None = None,
+        std: np.ndarray | None = None,
+        threshold: float = 0.8,
+        morph_kernel_size: int = 5,
+        min_duration_sec: float = 2.0,
+        window_size: int = WINDOW_SIZE,
+        batch_size: int = 32,
+    ):
+        """
+        Args:
+            model: Model returning per-sample probabilities for (B, 19, window_size)
+            fs: Native sampling rate of the pushed chunks in Hz
+            device: Torch device of `model`
+            hop_sec: Seconds of stream between model runs (<= window length)
+            mean: Fixed per-channel mean of shape (19,) (default: running mean)
+            std: Fixed per-channel std of shape (19,) (default: running std)
+            threshold: Event threshold (paper: 0.8)
+            morph_kernel_size: Opening/closing kernel in samples (paper: 5)
+            min_duration_sec: Minimum event duration (paper: 2.0)
+            window_size: Samples per model window at 256 Hz
+            batch_size: Max windows per forward pass
+        """
+        self.hop = int(round(hop_sec * TARGET_FS))
+        if not 1 <= self.hop <= window_size:
+            raise ValueError(f"hop_sec must be in (0, {window_size / TARGET_FS}], got {hop_sec}")
+        if (mean is None) != (std is None):
+            raise ValueError("mean and std must be given together")
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self.model = model
+        self.model.eval()
+        self.device = device
+        self.fs = fs
+        self.window_size = window_size
+        self.batch_size = batch_size
+        self.postprocessor = StreamingPostProcessor(threshold, morph_kernel_size, min_duration_sec)
+
+        self._fixed_stats = mean is not None
+        self._mean = np.zeros(N_CHANNELS) if mean is None else np.asarray(mean, dtype=np.float64)
+        self._m2 = np.zeros(N_CHANNELS)  # Welford sum of squared deviations
+        self._std = None if std is None else np.asarray(std, dtype=np.float64)
+        self._n_raw = 0
+
+        self._resampler = StreamingResampler(fs, N_CHANNELS)
+        self._sos = design_preprocessing_sos(TARGET_FS)
+        self._zi = np.zeros((self._sos.shape[0], N_CHANNELS, 2), dtype=np.float32)
+        self._ring = np.zeros((N_CHANNELS, window_size), dtype=np.float32)
+        self.n_filtered = 0  # 256 Hz samples written to the ring so far
+        self.n_emitted = 0  # 256 Hz samples with emitted probabilities
+        self.model_runs = 0
+
+    @property
+    def latency_bound_sec(self) -> dict[str, float]:
+        """Worst-case latency bounds in seconds, excluding model compute."""
+        probabilities = self._resampler.lookahead_sec + self.hop / TARGET_FS
+        onset = probabilities + POSTPROCESS_HOLDBACK / TARGET_FS
+        return {
+            "probabilities": probabilities,
+            "onset_event": onset + self.postprocessor.min_samples / TARGET_FS,
+            "offset_event": onset,
+        }
+
+    def _normalize(self, chunk: np.ndarray) -> np.ndarray:
+        if not self._fixed_stats:
+            # Chan et al. parallel update of the running mean / M2 with this chunk
+            n, n_b = self._n_raw, chunk.shape[1]
+            mean_b = chunk.mean(axis=1)
+            delta = mean_b - self._mean
+            total = n + n_b
+            self._mean = self._mean + delta * n_b / total
+            self._m2 = self._m2 + ((chunk - mean_b[:, None]) ** 2).sum(axis=1)
+            self._m2 += delta**2 * n * n_b / total
+            self._n_raw = total
+            self._std = np.sqrt(self._m2 / total)
+        std = np.where(self._std > 0, self._std, 1.0)
+        return ((chunk - self._mean[:, None]) / std[:, None]).astype(np.float32)
+
+    def _write_ring(self, samples: np.ndarray) -> None:
+        n = samples.shape[1]
+        pos = self.n_filtered % self.window_size
+        first = min(n, self.window_size - pos)
+        self._ring[:, pos : pos + first] = samples[:, :first]
+        self._ring[:, : n - first] = samples[:, first:]
+        self.n_filtered += n
+
+    def _window(self) -> np.ndarray:
+        """Copy of the ring in time order (oldest sample first)."""
+        pos = self.n_filtered % self.window_size
+        return np.concatenate([self._ring[:, pos:], self._ring[:, :pos]], axis=1)
+
+    def _forward(self, windows: list[np.ndarray]) -> np.ndarray:
+        with torch.inference_mode():
+            batch = torch.from_numpy(np.stack(windows)).to(self.device)
+            output = to_numpy(self.model(batch))
+        self.model_runs += len(windows)
+        return output.reshape(len(windows), -1)
+
+    def _run(self, windows: list[np.ndarray], spans: list) -> list[np.ndarray]:
+        """
+        Model outputs of due windows, each cut to the stream samples it emits.
+
+        Each span is (first, stop, window_start): the window emits stream samples
+        [first, stop) and its sample 0 is stream sample window_start.
+        """
+        outputs = self._forward(windows)
+        return [out[a - w : b - w] for out, (a, b, w) in zip(outputs, spans, strict=True)]
+
+    def _feed(self, filtered: np.ndarray, parts: list[np.ndarray]) -> None:
+        """Write filtered samples hop by hop, running due windows `batch_size` at a time."""
+        windows, spans = [], []
+        i = 0
+        while i < filtered.shape[1]:
+            if self.n_filtered < self.window_size:
+                due = self.window_size
+            else:
+                due = self.n_emitted + self.hop
+            take = min(filtered.shape[1] - i, due - self.n_filtered)
+            self._write_ring(filtered[:, i : i + take])
+            i += take
+            if self.n_filtered == due:
+                windows.append(self._window())
+                spans.append((self.n_emitted, self.n_filtered, self.n_filtered - self.window_size))
+                self.n_emitted = self.n_filtered
+                if len(windows) == self.batch_size:
+                    parts += self._run(windows, spans)
+                    windows, spans = [], []
+        if windows:
+            parts += self._run(windows, spans)
+
+    def _update(self, parts: list[np.ndarray], start: int) -> StreamUpdate:
+        if not parts:
+            return StreamUpdate(start, np.zeros(0, dtype=np.float32))
+        probabilities = np.concatenate(parts).astype(np.float32, copy=False)
+        return StreamUpdate(start, probabilities, self.postprocessor.push(probabilities))
+
+    def _filter(self, resampled: np.ndarray) -> np.ndarray:
+        if resampled.shape[1] == 0:
+            return resampled
+        filtered, self._zi = sosfilt(self._sos, resampled, axis=-1, zi=self._zi)
+        return filtered.astype(np.float32, copy=False)
+
+    def push(self, chunk: np.ndarray) -> StreamUpdate:
+        """
+        Feed (19, n) samples at the native rate.
+
+        Returns:
+            StreamUpdate with probabilities for 256 Hz samples
+            [start_sample, start_sample + len(probabilities)) and any new events
+        """
+        chunk = np.asarray(chunk)
+        if chunk.ndim != 2 or chunk.shape[0] != N_CHANNELS:
+            raise ValueError(f"Expected ({N_CHANNELS}, n) chunks, got shape {chunk.shape}")
+        start = self.n_emitted
+        if chunk.shape[1] == 0:
+            return StreamUpdate(start, np.zeros(0, dtype=np.float32))
+        parts: list[np.ndarray] = []
+        self._feed(self._filter(self._resampler.push(self._normalize(chunk))), parts)
+        return self._update(parts, start)
+
+    def finish(self) -> StreamUpdate:
+        """End of stream: score the remaining samples and close open events."""
+        start = self.n_emitted
+        parts: list[np.ndarray] = []
+        self._feed(self._filter(self._resampler.finish()), parts)
+        if self.n_filtered > self.n_emitted:
+            if self.n_filtered < self.window_size:
+                # Shorter than one window: zero-pad on the right, as WindowDataset does
+                window = np.zeros_like(self._ring)
+                window[:, : self.n_filtered] = self._ring[:, : self.n_filtered]
+                span = (0, self.n_filtered, 0)
+            else:
+                window = self._window()
+                span = (self.n_emitted, self.n_filtered, self.n_filtered - self.window_size)
+            self.n_emitted = self.n_filtered
+            parts += self._run([window], [span])
+        update = self._update(parts, start)
+        update.events += self.postprocessor.finish()
+        return update
+
+
+@dataclass
+class ReplayReport:
+    """What `replay` observed."""
+
+    probabilities: np.ndarray
+    events: list[tuple[float, float]]
+    event_log: list[dict[str, float]]  # per emitted event: stream time, wall lag
+    chunk_seconds: list[float]  # processing time per chunk
+    stream_sec: float
+    wall_sec: float
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "stream_sec": self.stream_sec,
+            "wall_sec": self.wall_sec,
+            "real_time_factor": self.stream_sec / max(sum(self.chunk_seconds), 1e-9),
+            "chunks": len(self.chunk_seconds),
+            "chunk_p50_sec": statistics.median(self.chunk_seconds) if self.chunk_seconds else 0,
+            "chunk_max_sec": max(self.chunk_seconds, default=0.0),
+            "events": [list(e) for e in self.events],
+            "event_log": self.event_log,
+        }
+
+
+def replay(
+    detector: StreamingSeizureDetector,
+    data: np.ndarray,
+    fs: float,
+    chunk_sec: float = 1.0,
+    speed: float = 1.0,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> ReplayReport:
+    """
+    Feed a recording to `detector` in chunks, as if it were arriving live.
+
+    Args:
+        detector: Fresh StreamingSeizureDetector for sampling rate `fs`
+        data: (19, samples) recording
+        fs: Sampling rate of `data`
+        chunk_sec: Seconds of signal per chunk
+        speed: Playback speed (1.0 = real time, 10.0 = 10x); 0 feeds as fast as possible
+        clock: Monotonic clock (seconds)
+        sleep: Sleep function, used to pace chunk arrival
+
+    Returns:
+        ReplayReport; `event_log` lag is wall time from the chunk that confirmed
+        an event arriving to the event being emitted
+    """
+    step = max(1, int(round(chunk_sec * fs)))
+    probabilities, event_log, chunk_seconds = [], [], []
+    t0 = clock()
+    for i in range(0, data.shape[1], step):
+        if speed > 0:
+            arrival = t0 + min(i + step, data.shape[1]) / fs / speed
+            wait = arrival - clock()
+            if wait > 0:
+                sleep(wait)
+        arrived = clock()
+        update = detector.push(data[:, i : i + step])
+        done = clock()
+        chunk_seconds.append(done - arrived)
+        probabilities.append(update.probabilities)
+        for event in update.events:
+            event_log.append(
+                {"kind": event.kind, "time_sec": event.time_sec, "lag_sec": done - arrived}
+            )
+    update = detector.finish()
+    probabilities.append(update.probabilities)
+    for event in update.events:
+        event_log.append({"kind": event.kind, "time_sec": event.time_sec, "lag_sec": 0.0})
+    return ReplayReport(
+        probabilities=np.concatenate(probabilities),
+        events=list(detector.postprocessor.events),
+        event_log=event_log,
+        chunk_seconds=chunk_seconds,
+        stream_sec=data.shape[1] / fs,
+        wall_sec=clock() - t0,
+    )
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Replay an EDF through the streaming detector")
+    p.add_argument("--edf", type=str, required=True)
+    p.add_argument("--device", type=str, default="cpu")
+    p.add_argument("--hop_sec", type=float, default=1.0)
+    p.add_argument("--chunk_sec", type=float, default=1.0)
+    p.add_argument("--speed", type=float, default=1.0, help="Playback speed; 0 = unpaced")
+    p.add_argument("--threshold", type=float, default=0.8)
+    p.add_argument("--batch_size", type=int, default=32, help="Max windows per forward pass")
+    p.add_argument("--out", type=str, default=None, help="Optional JSON report path")
+    args = p.parse_args()
+
+    from wu_2025.utils import load_models
+
+    from seizure_evaluation.tusz.cli import load_recording
+
+    data, fs, _ = load_recording(Path(args.edf))
+    detector = StreamingSeizureDetector(
+        load_models(args.device),
+        fs,
+        args.device,
+        args.hop_sec,
+        threshold=args.threshold,
+        batch_size=args.batch_size,
+    )
+    print(f"Replaying {data.shape[1] / fs:.0f}s at {fs:g} Hz, speed {args.speed or 'max'}")
+    print(f"Latency bounds (excluding compute): {detector.latency_bound_sec}")
+    report = replay(detector, data, fs, chunk_sec=args.chunk_sec, speed=args.speed)
+    summary = report.summary()
+    for entry in report.event_log:
+        print(f"   {entry['kind']:<6} at {entry['time_sec']:8.2f}s (lag {entry['lag_sec']:.3f}s)")
+    print(
+        f"✅ {len(report.events)} events; real-time factor {summary['real_time_factor']:.1f}x, "
+        f"max chunk {summary['chunk_max_sec']:.3f}s"
+    )
+    if args.out:
+        Path(args.out).write_text(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
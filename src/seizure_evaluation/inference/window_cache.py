@@ -0,0 +1,185 @@
+"""
+Disk cache of preprocessed model windows.
+
+Comparing checkpoints or running ablations on one eval set repeats the same
+EDF decode, z-scoring, resampling and filtering before every forward pass.
+`WindowCache` stores each recording's preprocessed (n_windows, 19, window)
+tensor as a `.npy` file (float32, or float16 at half the size). Each entry has
+a JSON manifest recording the EDF content hash, the preprocessing
+configuration, shape and dtype, the original sample count and the load method.
+The key hashes the EDF content together with everything that shapes the
+windows: filter mode, overlap, resampling method, window length, storage dtype
+and the preprocessing filter coefficients.
+
+Hits are memory-mapped copy-on-write (`mmap_mode="c"`), so a `WindowStack`
+served from the cache reads pages from the OS page cache without decoding or
+copying the recording; `get_dataloader` and `RecordingPacker` batch it as is.
+float32 entries reproduce uncached preprocessing bit for bit; float16 entries
+round each sample to ~3 significant digits, so validate them with
+`seizure_evaluation.inference.parity` before relying on them.
+
+Lookups often run in prefetch or shard worker processes, so the hit/miss
+counters are fed by the consumer: `prepare_recording` reports each outcome in
+`PreparedRecording.window_cache_status` and the caller passes it to `record`;
+`merge` adds counts reported by other processes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from seizure_evaluation.inference.dataset import WindowStack
+from seizure_evaluation.inference.prediction_cache import (
+    FileDigestIndex,
+    preprocessing_fingerprint,
+    write_atomic,
+    write_npy_atomic,
+)
+from seizure_evaluation.inference.preprocessing import WINDOW_SIZE
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "seizure_evaluation" / "windows"
+WINDOW_DTYPES = ("float32", "float16")
+# Outcomes of one recording's lookup: served from the cache, missed and stored,
+# or missed without storing (preparation failed)
+LOOKUP_STATUSES = ("hit", "stored", "miss")
+
+
+class WindowCache:
+    """Memory-mappable preprocessed windows keyed by EDF content and preprocessing config."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, dtype: str = "float32"):
+        """
+        Args:
+            cache_dir: Cache directory (created on first write)
+            dtype: Storage dtype of new entries, "float32" (exact) or "float16"
+        """
+        if dtype not in WINDOW_DTYPES:
+            raise ValueError(f"dtype must be one of {WINDOW_DTYPES}, got {dtype!r}")
+        self.cache_dir = Path(cache_dir)
+        self.dtype = dtype
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._digests = FileDigestIndex(self.cache_dir / "file_index.json")
+
+    def config(
+        self,
+        filter_mode: str = "window",
+        overlap_ratio: float = 0.0,
+        resample_method: str = "fft",
+        window_size: int = WINDOW_SIZE,
+    ) -> dict[str, Any]:
+        """Preprocessing configuration an entry is keyed by (besides the EDF content)."""
+        return {
+            "filter_mode": filter_mode,
+            "overlap_ratio": overlap_ratio,
+            "resample_method": resample_method,
+            "window_size": window_size,
+            "dtype": self.dtype,
+            "preprocessing": preprocessing_fingerprint(),
+        }
+
+    def key(self, edf_path: Path, config: dict[str, Any]) -> str:
+        """Cache key of `edf_path`'s windows under `config`."""
+        payload = {"edf": self._digests.digest(edf_path), "config": config}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / "entries" / key[:2] / f"{key}.npy"
+
+    def get(self, edf_path: Path, **config: Any) -> tuple[WindowStack, dict[str, Any]] | None:
+        """
+        Memory-mapped windows of `edf_path`, if cached.
+
+        Args:
+            edf_path: Source EDF
+            **config: Keyword arguments of `config` (filter_mode, overlap_ratio, ...)
+
+        Returns:
+            (windows, manifest) on a hit, where manifest holds "seq_len" (samples of
+            the original recording) and "load_method"; None on a miss
+        """
+        path = self._path(self.key(edf_path, self.config(**config)))
+        try:
+            manifest = json.loads(path.with_suffix(".json").read_text())
+            windows = self._open(path, manifest)
+        except (OSError, ValueError):
+            return None
+        return windows, manifest
+
+    def put(
+        self,
+        edf_path: Path,
+        windows: WindowStack,
+        seq_len: int,
+        load_method: str | None,
+        **config: Any,
+    ) -> WindowStack:
+        """
+        Store the preprocessed windows of `edf_path`.
+
+        Returns:
+            The stored windows, memory-mapped, so callers see the same (possibly
+            float16) values on this run as on later cache hits
+        """
+        config = self.config(**config)
+        path = self._path(self.key(edf_path, config))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        array = np.ascontiguousarray(windows.windows, dtype=self.dtype)
+        write_npy_atomic(path, array)
+        manifest = {
+            "edf_sha256": self._digests.digest(edf_path),
+            "config": config,
+            "shape": list(array.shape),
+            "dtype": self.dtype,
+            "seq_len": int(seq_len),
+            "load_method": load_method,
+            "starts": None,
+        }
+        if windows.starts is not None:
+            manifest["starts"] = path.with_suffix(".starts.npy").name
+            write_npy_atomic(path.with_suffix(".starts.npy"), np.asarray(windows.starts))
+        # The manifest goes last: its presence means the entry is complete
+        write_atomic(path.with_suffix(".json"), lambda tmp: tmp.write_text(json.dumps(manifest)))
+        return self._open(path, manifest)
+
+    def _open(self, path: Path, manifest: dict[str, Any]) -> WindowStack:
+        # Copy-on-write: zero-copy reads, and writable as torch.from_numpy requires
+        windows = np.load(path, mmap_mode="c")
+        if list(windows.shape) != manifest["shape"]:
+            raise ValueError(f"Truncated window cache entry: {path}")
+        starts = None
+        if manifest["starts"] is not None:
+            starts = np.load(path.parent / manifest["starts"])
+        return WindowStack(windows, starts=starts)
+
+    def record(self, status: str) -> None:
+        """Count one lookup outcome, one of LOOKUP_STATUSES (a store is also a miss)."""
+        if status not in LOOKUP_STATUSES:
+            raise ValueError(f"status must be one of {LOOKUP_STATUSES}, got {status!r}")
+        if status == "hit":
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.stores += status == "stored"
+
+    def merge(self, stats: dict[str, Any]) -> None:
+        """Add the counts of another instance's `stats()` (e.g. a worker process)."""
+        self.hits += stats["hits"]
+        self.misses += stats["misses"]
+        self.stores += stats["stores"]
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss/store counts recorded on this instance."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+        }
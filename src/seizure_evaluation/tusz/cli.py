@@ -15,8 +15,12 @@ Or via entry point (after editable install):
 
 import argparse
 import json
+import multiprocessing
+import os
 import pickle
+import time
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
 import numpy as np
@@ -25,54 +29,122 @@ from sklearn.metrics import roc_auc_score
 from tqdm import tqdm
 
 # First-party imports
+from seizure_evaluation.inference.autotune import (
+    DEFAULT_CACHE_FILE,
+    autotune,
+    loader_measure,
+    total_memory_bytes,
+)
+from seizure_evaluation.inference.chunked import chunked_predict_probabilities
+from seizure_evaluation.inference.compiled import DEFAULT_CACHE_DIR, load_compiled, weights_hash
+from seizure_evaluation.inference.dataset import RESAMPLE_METHODS, collate_for, get_dataloader
+from seizure_evaluation.inference.models import PRECISIONS, load_model
+from seizure_evaluation.inference.onnx_backend import OnnxRuntimeModel, load_onnxruntime
+from seizure_evaluation.inference.packing import RecordingPacker
+from seizure_evaluation.inference.pipeline import RecordingPrefetcher, prepare_recording
+from seizure_evaluation.inference.predict import predict_probabilities
+from seizure_evaluation.inference.prediction_cache import (
+    DEFAULT_CACHE_DIR as DEFAULT_PREDICTION_CACHE_DIR,
+)
+from seizure_evaluation.inference.prediction_cache import (
+    PredictionCache,
+    default_weights_file,
+)
+from seizure_evaluation.inference.stitching import STITCH_WEIGHTS
+from seizure_evaluation.inference.window_cache import (
+    DEFAULT_CACHE_DIR as DEFAULT_WINDOW_CACHE_DIR,
+)
+from seizure_evaluation.inference.window_cache import WINDOW_DTYPES, WindowCache
+from seizure_evaluation.tusz.sharding import balanced_shards
 from seizure_evaluation.utils.edf_repair import load_with_fallback
-from wu_2025.utils import get_dataloader, load_models
+from wu_2025.utils import load_models
 
 
-def process_single_file(edf_path, model, device, batch_size: int = 512):
+def load_recording(edf_path, native: bool = False):
+    """Load one EDF and validate it for the model.
+
+    With `native=True` the NumPy EDF reader is tried first (see `load_with_fallback`).
+
+    Returns:
+        tuple[data, fs, load_method]; raises ValueError on wrong channel count
+    """
+    # Load EDF with robust fallback/repair
+    # Prefer pyedflib; if header issue encountered, repair header and retry; optional MNE fallback
+    eeg, load_method = load_with_fallback(edf_path, native=native)
+    if eeg.data.shape[0] != 19:
+        raise ValueError(f"Wrong channels: {eeg.data.shape[0]}")
+    return eeg.data, eeg.fs, load_method
+
+
+def load_recording_native(edf_path):
+    """`load_recording` via the NumPy EDF reader (module-level, so worker processes can use it)."""
+    return load_recording(edf_path, native=True)
+
+
+def process_single_file(
+    edf_path,
+    model,
+    device,
+    batch_size: int = 512,
+    filter_mode: str = "window",
+    overlap_ratio: float = 0.0,
+    stitch: str = "hann",
+    resample_method: str = "fft",
+    window_cache: WindowCache | None = None,
+):
     """Process one EDF file.
 
+    `filter_mode` is forwarded to `get_dataloader` ("window" reproduces Wu's
+    per-window filtering; "recording" filters the whole recording once).
+    With `overlap_ratio > 0` window outputs are overlap-added with `stitch` weights.
+    `resample_method` selects FFT (Wu) or polyphase resampling to 256 Hz.
+    With a `window_cache`, cached preprocessed windows are read (memory-mapped)
+    instead of decoding the EDF; otherwise the prepared windows are cached.
+
     Returns:
         tuple[predictions_or_none, error_or_none, load_method_or_none]
         - predictions: np.ndarray of per-sample probabilities, or None on failure
         - error: error string if failed, else None
-        - load_method: one of {"pyedflib", "pyedflib+repaired", "mne"} or None
+        - load_method: one of {"pyedflib", "native", "native+repaired", "mne"} or None
     """
     try:
-        # Load EDF with robust fallback/repair
-        # Prefer pyedflib; if header issue encountered, repair header and retry; optional MNE fallback
-        eeg, _load_method = load_with_fallback(edf_path)
-        data = eeg.data
-        fs = eeg.fs
-        seq_len = data.shape[1]
-
-        # Skip if wrong channel count
-        if data.shape[0] != 19:
-            return None, f"Wrong channels: {data.shape[0]}"
-
-        # Get predictions
-        dataloader = get_dataloader(data, fs=fs, batch_size=batch_size)
-        predictions = []
+        if window_cache is not None:
+            prepared = prepare_recording(
+                0,
+                edf_path,
+                load_recording,
+                filter_mode=filter_mode,
+                overlap_ratio=overlap_ratio,
+                resample_method=resample_method,
+                window_cache=window_cache,
+            )
+            if prepared.error is not None:
+                return None, prepared.error, None
+            dataloader = get_dataloader(prepared.windows, fs=None, batch_size=batch_size)
+            predictions = predict_probabilities(
+                model, dataloader, device, prepared.seq_len, stitch=stitch
+            )
+            return (predictions, None, prepared.load_method)
 
-        with torch.no_grad():
-            for batch in dataloader:
-                batch = batch.to(device)
-                # Model already outputs probabilities (sigmoid inside architecture)
-                output = model(batch)
-                predictions.append(output.detach().cpu().numpy())
+        data, fs, _load_method = load_recording(edf_path)
+        seq_len = data.shape[1]
 
-        if predictions:
-            # Flatten all predictions
-            predictions = np.concatenate(predictions, axis=0).flatten()
-            # Truncate to original sequence length (mirror OSS utils.predict)
-            predictions = predictions[:seq_len]
-            return (predictions, None, _load_method)
+        # Get predictions (model outputs probabilities; sigmoid inside architecture),
+        # written into a preallocated buffer and truncated to the original length
+        dataloader = get_dataloader(
+            data,
+            fs=fs,
+            batch_size=batch_size,
+            filter_mode=filter_mode,
+            overlap_ratio=overlap_ratio,
+            resample_method=resample_method,
+        )
+        predictions = predict_probabilities(model, dataloader, device, seq_len, stitch=stitch)
+        return (predictions, None, _load_method)
 
     except Exception as e:
         return None, str(e), None
 
-    return None, "Unknown error", None
-
 
 def load_labels_for_file(edf_path):
     """Load ground truth labels from .csv_bi file. Returns list of (start_sec, end_sec)."""
@@ -110,6 +182,353 @@ def create_binary_labels(seizure_events, duration_samples, fs=256):
     return labels
 
 
+def write_checkpoint(
+    checkpoint_file: Path, results: dict, next_idx: int, shard: dict | None = None
+) -> None:
+    """Write the tusz-eval checkpoint layout consumed by nedc-run/szcore-run.
+
+    `shard` (multi-node runs only) records which files this checkpoint covers;
+    see `seizure_evaluation.tusz.sharding`.
+    """
+    checkpoint = {"results": results, "next_idx": next_idx}
+    if shard is not None:
+        checkpoint["shard"] = shard
+    with open(checkpoint_file, "wb") as f:
+        pickle.dump(checkpoint, f)
+
+
+def load_checkpoint(checkpoint_file: Path, shard: dict | None = None) -> dict | None:
+    """Load `checkpoint_file` if it exists, refusing one written for another file list.
+
+    `next_idx` indexes into the file list, so resuming a checkpoint whose
+    `shard["files"]` differs from `shard`'s (e.g. after changing --workers or
+    --num_shards) would skip or repeat recordings.
+
+    Raises:
+        ValueError: if the checkpoint's file list differs from `shard`'s
+    """
+    if not checkpoint_file.exists():
+        return None
+    with open(checkpoint_file, "rb") as f:
+        checkpoint = pickle.load(f)
+    if (checkpoint.get("shard") or {}).get("files") != (shard or {}).get("files"):
+        raise ValueError(
+            f"{checkpoint_file} was written for a different file list (changed --workers, "
+            "--num_shards or --shard_index?); use a new --out_dir or delete it"
+        )
+    return checkpoint
+
+
+def order_results(results: dict, edf_files) -> dict:
+    """Reorder results to follow `edf_files`; entries for other files are kept at the end."""
+    ordered = {p.stem: results[p.stem] for p in edf_files if p.stem in results}
+    ordered.update((fid, res) for fid, res in results.items() if fid not in ordered)
+    return ordered
+
+
+def _model_fingerprint(model, prediction_cache: PredictionCache) -> str:
+    """Prediction cache fingerprint of a loaded model: weights hash or `.onnx` digest."""
+    if isinstance(model, torch.nn.Module):
+        return weights_hash(model)
+    if isinstance(model, OnnxRuntimeModel):
+        return prediction_cache.file_digest(model.onnx_path)
+    raise TypeError(f"Cannot fingerprint {type(model).__name__}; pass model_fingerprint")
+
+
+def run_inference(
+    edf_files,
+    checkpoint_file: Path,
+    device: str,
+    batch_size: int = 512,
+    filter_mode: str = "window",
+    prefetch_workers: int = 0,
+    prefetch_depth: int = 4,
+    model_loader=load_models,
+    recording_loader=load_recording,
+    shard: dict | None = None,
+    overlap_ratio: float = 0.0,
+    stitch: str = "hann",
+    chunked: bool = False,
+    resample_method: str = "fft",
+    prediction_cache: PredictionCache | None = None,
+    cache_params: dict | None = None,
+    model_fingerprint: str | None = None,
+    window_cache: WindowCache | None = None,
+) -> dict:
+    """Run the model over `edf_files`, resuming from and saving to `checkpoint_file`.
+
+    With `chunked=True` recordings are processed one at a time with
+    `chunked_predict_probabilities` (bounded memory, polyphase resampling) and
+    predictions are memory-mapped from `<checkpoint dir>/predictions/<file_id>.npy`
+    (chunked mode always resamples polyphase; `resample_method` applies otherwise).
+
+    With a `prediction_cache`, recordings whose EDF content, model
+    (`model_fingerprint`, default: hash of the loaded weights, or of the `.onnx`
+    file for the onnxruntime backend) and `cache_params`
+    match a cached entry are taken from the cache without decoding or inference;
+    computed predictions are added to it. The model is only loaded once some
+    recording is neither in the checkpoint nor in the cache (or to hash the
+    weights when no `model_fingerprint` is given).
+
+    A `window_cache` serves preprocessed windows of recordings seen before
+    (memory-mapped; no EDF decoding) and stores new ones. It is not used in
+    chunked mode, which never materializes a recording's windows.
+
+    Returns:
+        results mapping file_id -> {"predictions", "seizure_events", "error", "load_method",
+        "inference_sec"} (model seconds attributed to the file; None if it failed)
+    """
+    model = None
+
+    def get_model():
+        nonlocal model
+        if model is None:
+            print("\nLoading model...")
+            model = model_loader(device)
+            model.eval()
+            print("✅ Model loaded")
+        return model
+
+    # Load checkpoint if exists
+    checkpoint = load_checkpoint(checkpoint_file, shard)
+    if checkpoint is not None:
+        print("\n📂 Loading checkpoint...")
+        results = checkpoint["results"]
+        start_idx = checkpoint["next_idx"]
+        print(f"   Resuming from file {start_idx}/{len(edf_files)}")
+    else:
+        results = {}
+        start_idx = 0
+
+    # Process files
+    print("\nProcessing files...")
+
+    # Upcoming EDFs are decoded/preprocessed ahead of inference (in worker processes
+    # with --prefetch_workers); windows from consecutive recordings are packed into
+    # full model batches and results are recorded as each recording completes.
+    jobs = []
+    queued = set(results)
+    for idx in range(start_idx, len(edf_files)):
+        file_id = edf_files[idx].stem
+        # Skip if already processed
+        if file_id not in queued:
+            queued.add(file_id)
+            jobs.append((idx, edf_files[idx]))
+
+    cache_keys: dict[str, str] = {}  # file_id -> prediction cache key (cache misses)
+
+    def store_result(file_id, edf_path, predictions, error, load_method, inference_sec=None):
+        results[file_id] = {
+            "predictions": predictions,
+            "seizure_events": load_labels_for_file(edf_path),
+            "error": error,
+            "load_method": load_method,
+            "inference_sec": inference_sec,
+        }
+        key = cache_keys.pop(file_id, None)
+        if key is not None and predictions is not None:
+            prediction_cache.put(key, predictions, {"load_method": load_method})
+
+    if prediction_cache is not None:
+        if model_fingerprint is None:
+            model_fingerprint = _model_fingerprint(get_model(), prediction_cache)
+        remaining = []
+        for idx, edf_path in jobs:
+            try:
+                digest = prediction_cache.file_digest(edf_path)
+            except OSError:
+                remaining.append((idx, edf_path))  # unreadable: let the loader report it
+                continue
+            key = prediction_cache.key(digest, model_fingerprint, cache_params or {})
+            cached = prediction_cache.get(key)
+            if cached is None:
+                cache_keys[edf_path.stem] = key
+                remaining.append((idx, edf_path))
+            else:
+                predictions, meta = cached
+                store_result(edf_path.stem, edf_path, predictions, None, meta["load_method"], 0.0)
+        if len(remaining) < len(jobs):
+            print(f"   {len(jobs) - len(remaining)} recordings served from the prediction cache")
+        jobs = remaining
+
+    def report_cache():
+        if window_cache is not None:
+            stats = window_cache.stats()
+            print(
+                f"\n🗄️  Window cache: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['stores']} stored"
+            )
+        if prediction_cache is not None:
+            stats = prediction_cache.stats()
+            print(
+                f"\n🗄️  Prediction cache: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['evictions']} evictions; {stats['size_bytes'] / 2**30:.2f}/"
+                f"{stats['max_bytes'] / 2**30:.2f} GiB"
+            )
+
+    if not jobs:
+        # Everything was resumed or served from the cache: skip loading the model
+        report_cache()
+        results = order_results(results, edf_files)
+        write_checkpoint(checkpoint_file, results, len(edf_files), shard)
+        return results
+    get_model()
+
+    if chunked:
+        # Bounded memory: one recording at a time, streamed in batches, outputs memory-mapped
+        predictions_dir = checkpoint_file.parent / "predictions"
+        predictions_dir.mkdir(parents=True, exist_ok=True)
+        for idx, edf_path in tqdm(jobs, initial=len(edf_files) - len(jobs), total=len(edf_files)):
+            try:
+                data, fs, load_method = recording_loader(edf_path)
+                start = time.perf_counter()
+                predictions = chunked_predict_probabilities(
+                    model,
+                    data,
+                    fs,
+                    device,
+                    batch_size=batch_size,
+                    out_path=predictions_dir / f"{edf_path.stem}.npy",
+                    filter_mode=filter_mode,
+                )
+                seconds = time.perf_counter() - start
+                store_result(edf_path.stem, edf_path, predictions, None, load_method, seconds)
+            except Exception as e:
+                store_result(edf_path.stem, edf_path, None, str(e), None)
+            if idx % 10 == 0:
+                write_checkpoint(checkpoint_file, results, idx + 1, shard)
+        report_cache()
+        results = order_results(results, edf_files)
+        write_checkpoint(checkpoint_file, results, len(edf_files), shard)
+        return results
+
+    prefetcher = RecordingPrefetcher(
+        jobs,
+        recording_loader,
+        filter_mode=filter_mode,
+        workers=prefetch_workers,
+        prefetch_depth=prefetch_depth,
+        overlap_ratio=overlap_ratio,
+        resample_method=resample_method,
+        window_cache=window_cache,
+    )
+    packer = RecordingPacker(
+        model, device, collate=collate_for("recording"), batch_size=batch_size, stitch=stitch
+    )
+    pending: dict[str, tuple[int, Path, str]] = {}  # file_id -> (idx, edf_path, load_method)
+
+    def store_completed(completed):
+        for file_id, predictions in completed:
+            _, edf_path, load_method = pending.pop(file_id)
+            seconds = packer.inference_sec.pop(file_id, None)
+            store_result(file_id, edf_path, predictions, None, load_method, seconds)
+
+    def run_packer(step, *step_args):
+        try:
+            store_completed(step(*step_args))
+        except Exception as e:
+            # A failed batch invalidates every recording with windows still queued
+            store_completed(packer.take_completed())
+            for file_id in packer.drop_pending():
+                _, edf_path, _ = pending.pop(file_id)
+                store_result(file_id, edf_path, None, str(e), None)
+
+    for rec in tqdm(prefetcher, initial=len(edf_files) - len(jobs), total=len(edf_files)):
+        if rec.window_cache_status is not None:
+            window_cache.record(rec.window_cache_status)
+        if rec.error is not None:
+            store_result(rec.file_id, rec.edf_path, None, rec.error, None)
+        else:
+            pending[rec.file_id] = (rec.idx, rec.edf_path, rec.load_method)
+            run_packer(packer.add, rec.file_id, rec.windows, rec.seq_len)
+
+        # Save checkpoint every 10 files (resume from the oldest unfinished file)
+        if rec.idx % 10 == 0:
+            next_idx = min((i for i, _, _ in pending.values()), default=rec.idx + 1)
+            write_checkpoint(checkpoint_file, results, next_idx, shard)
+
+    run_packer(packer.flush)
+    if packer.batches_run:
+        print(
+            f"\nPacked {packer.windows_run} windows into {packer.batches_run} batches "
+            f"(mean fill {packer.windows_run / packer.batches_run:.1f}/{batch_size}); "
+            f"model time {packer.seconds_run:.1f}s "
+            f"({packer.windows_run / max(packer.seconds_run, 1e-9):.1f} windows/s)"
+        )
+
+    report_cache()
+    # Save final checkpoint (in file-list order, independent of batch completion order)
+    results = order_results(results, edf_files)
+    write_checkpoint(checkpoint_file, results, len(edf_files), shard)
+    return results
+
+
+def _run_shard_worker(edf_files, checkpoint_file, shard, threads, run_kwargs):
+    torch.set_num_threads(threads)
+    run_inference(edf_files, checkpoint_file, shard=shard, **run_kwargs)
+    window_cache = run_kwargs.get("window_cache")
+    if window_cache is not None:
+        # Counts live in this process; the parent merges them (run_local_shards)
+        stats_file = checkpoint_file.with_name("window_cache.json")
+        stats_file.write_text(json.dumps(window_cache.stats()))
+
+
+def run_local_shards(
+    edf_files,
+    out_dir: Path,
+    workers: int,
+    data_dir: Path,
+    threads_per_worker: int = 1,
+    **run_kwargs,
+) -> dict:
+    """Split `edf_files` across `workers` processes on this host and merge their results.
+
+    Each process loads its own model copy, uses `threads_per_worker` intra-op
+    threads and keeps a resumable checkpoint under `out_dir/shards/` recording its
+    file list (relative to `data_dir`, as for multi-node shards); resuming with a
+    different split (another `workers`) is refused.
+    Results are merged in `edf_files` order, so the output does not depend on timing.
+    The workers' window cache counts are merged into `run_kwargs["window_cache"]`.
+
+    Raises:
+        ValueError: if an existing worker checkpoint covers a different file list
+    """
+    shard_paths = balanced_shards(edf_files, workers)
+    shards = [
+        {"index": k, "num_shards": workers, "files": [str(p.relative_to(data_dir)) for p in files]}
+        for k, files in enumerate(shard_paths)
+    ]
+    shard_files = [out_dir / "shards" / f"shard_{k:02d}" / "checkpoint.pkl" for k in range(workers)]
+    # Check before spawning, so a mismatch fails here rather than in every worker
+    for shard, shard_file in zip(shards, shard_files, strict=True):
+        load_checkpoint(shard_file, shard)
+
+    ctx = multiprocessing.get_context("spawn")
+    procs = []
+    for files, shard, shard_file in zip(shard_paths, shards, shard_files, strict=True):
+        shard_file.parent.mkdir(parents=True, exist_ok=True)
+        proc = ctx.Process(
+            target=_run_shard_worker,
+            args=(files, shard_file, shard, threads_per_worker, run_kwargs),
+        )
+        proc.start()
+        procs.append(proc)
+    for proc in procs:
+        proc.join()
+    failed = [k for k, proc in enumerate(procs) if proc.exitcode != 0]
+    if failed:
+        raise RuntimeError(f"Shard workers failed: {failed} (rerun to resume)")
+
+    merged: dict = {}
+    window_cache = run_kwargs.get("window_cache")
+    for shard_file in shard_files:
+        with open(shard_file, "rb") as f:
+            merged.update(pickle.load(f)["results"])
+        if window_cache is not None:
+            window_cache.merge(json.loads(shard_file.with_name("window_cache.json").read_text()))
+    return order_results(merged, edf_files)
+
+
 def main():
     """Run bulletproof evaluation."""
     parser = argparse.ArgumentParser(description="Run TUSZ evaluation")
@@ -136,7 +555,231 @@ def main():
         "--batch_size",
         type=int,
         default=512,
-        help="Batch size for inference (use lower for memory-constrained systems)",
+        help=(
+            "Windows per forward pass, packed across consecutive recordings "
+            "(use lower for memory-constrained systems)"
+        ),
+    )
+    parser.add_argument(
+        "--autotune",
+        action="store_true",
+        help=(
+            "Calibrate batch size and torch threads on this host at startup (overrides "
+            "--batch_size; cached per host in --autotune_cache)"
+        ),
+    )
+    parser.add_argument(
+        "--rss_budget_gb",
+        type=float,
+        default=None,
+        help="Peak RSS budget for --autotune (default: half of physical memory)",
+    )
+    parser.add_argument(
+        "--autotune_cache",
+        type=str,
+        default=str(DEFAULT_CACHE_FILE),
+        help="Per-host calibration cache file for --autotune",
+    )
+    parser.add_argument(
+        "--filter_mode",
+        type=str,
+        default="window",
+        choices=["window", "recording"],
+        help=(
+            "window: filter each 60s window from zero state (paper-equivalent); "
+            "recording: filter the whole recording once (faster, check drift with "
+            "python -m seizure_evaluation.inference.parity)"
+        ),
+    )
+    parser.add_argument(
+        "--resample",
+        type=str,
+        default="fft",
+        choices=list(RESAMPLE_METHODS),
+        help=(
+            "Resampling to 256 Hz: fft (paper-equivalent) or polyphase (cached float32 "
+            "filter banks; check fidelity with scripts/resampling_fidelity.py)"
+        ),
+    )
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help=(
+            "Bounded-memory mode for long recordings: streaming z-score, chunked polyphase "
+            "resampling, memory-mapped outputs (one recording at a time; no overlap)"
+        ),
+    )
+    parser.add_argument(
+        "--overlap_ratio",
+        type=float,
+        default=0.0,
+        help=(
+            "Fraction of each 60 s window shared with the next, in [0, 1); outputs are "
+            "overlap-added. Compute scales as 1/(1 - overlap_ratio): 0.25 -> 1.33x, 0.5 -> 2x"
+        ),
+    )
+    parser.add_argument(
+        "--stitch",
+        type=str,
+        default="hann",
+        choices=list(STITCH_WEIGHTS),
+        help="Overlap-add weighting: hann (taper towards window edges) or mean",
+    )
+    parser.add_argument(
+        "--precision",
+        type=str,
+        default="fp32",
+        choices=list(PRECISIONS),
+        help=(
+            "fp32: reference; int8: dynamic INT8 quantization of Linear layers; "
+            "bf16: CPU autocast, falls back to fp32 without native bf16 (both CPU only, "
+            "check drift with python -m seizure_evaluation.inference.parity)"
+        ),
+    )
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help=(
+            "Fold ResCNN BatchNorms into convs and drop eval-mode dropout "
+            "(tolerance-level parity, not bitwise)"
+        ),
+    )
+    parser.add_argument(
+        "--batch_first",
+        action="store_true",
+        help=(
+            "Batch-first transformer encoder (PyTorch fused fast path; same weights, "
+            "tolerance-level parity; not with --precision int8)"
+        ),
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help=(
+            "Run a frozen TorchScript export of the model (fp32 only), cached by weights "
+            "hash, torch version and batch size; checked against eager on export"
+        ),
+    )
+    parser.add_argument(
+        "--compile_cache_dir",
+        type=str,
+        default=str(DEFAULT_CACHE_DIR),
+        help="Directory for compiled model artifacts (TorchScript and ONNX exports)",
+    )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default="torch",
+        choices=["torch", "onnxruntime"],
+        help=(
+            "torch: PyTorch model; onnxruntime: ONNX export run on onnxruntime's CPU "
+            "execution provider (fp32, CPU only; requires pip install .[onnx])"
+        ),
+    )
+    parser.add_argument(
+        "--onnx_model",
+        type=str,
+        default=None,
+        help="Existing .onnx file for --backend onnxruntime (default: export and cache)",
+    )
+    parser.add_argument(
+        "--intra_op_threads",
+        type=int,
+        default=0,
+        help="onnxruntime threads within an operator (0 = onnxruntime default)",
+    )
+    parser.add_argument(
+        "--inter_op_threads",
+        type=int,
+        default=0,
+        help="onnxruntime threads across independent operators (0 = onnxruntime default)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes splitting the EDF list on this host, each with its own model copy",
+    )
+    parser.add_argument(
+        "--threads_per_worker",
+        type=int,
+        default=None,
+        help="torch intra-op threads per --workers process (default: cpu_count // workers)",
+    )
+    parser.add_argument(
+        "--shard_index",
+        "--shard-index",
+        type=int,
+        default=0,
+        help="This node's shard (0-based) when splitting the EDF list across machines",
+    )
+    parser.add_argument(
+        "--num_shards",
+        "--num-shards",
+        type=int,
+        default=1,
+        help="Total shards across machines; merge shard checkpoints with tusz-merge",
+    )
+    parser.add_argument(
+        "--prefetch_workers",
+        type=int,
+        default=0,
+        help="Worker processes decoding/preprocessing upcoming EDFs (0 = inline, serial)",
+    )
+    parser.add_argument(
+        "--prediction_cache",
+        action="store_true",
+        help=(
+            "Reuse predictions across runs, keyed by EDF content, model weights and "
+            "preprocessing/model flags (hits skip decoding and inference)"
+        ),
+    )
+    parser.add_argument(
+        "--prediction_cache_dir",
+        type=str,
+        default=str(DEFAULT_PREDICTION_CACHE_DIR),
+        help="Directory of the --prediction_cache",
+    )
+    parser.add_argument(
+        "--prediction_cache_gb",
+        type=float,
+        default=10.0,
+        help="Disk budget of the --prediction_cache (least recently used entries are evicted)",
+    )
+    parser.add_argument(
+        "--edf_reader",
+        choices=("pyedflib", "native"),
+        default="pyedflib",
+        help=(
+            "EDF decoding: pyedflib via epilepsy2bids (reference) or the NumPy reader "
+            "(19 channels only, no header repair copy; falls back to pyedflib on failure)"
+        ),
+    )
+    parser.add_argument(
+        "--window_cache",
+        action="store_true",
+        help=(
+            "Cache preprocessed windows as memory-mapped .npy files, keyed by EDF content and "
+            "preprocessing flags (hits skip decoding and preprocessing)"
+        ),
+    )
+    parser.add_argument(
+        "--window_cache_dir",
+        type=str,
+        default=str(DEFAULT_WINDOW_CACHE_DIR),
+        help="Directory of the --window_cache",
+    )
+    parser.add_argument(
+        "--window_cache_dtype",
+        choices=WINDOW_DTYPES,
+        default="float32",
+        help="Storage dtype of new --window_cache entries (float16 halves disk use, not exact)",
+    )
+    parser.add_argument(
+        "--prefetch_depth",
+        type=int,
+        default=4,
+        help="Max recordings decoded ahead of inference (bounds memory)",
     )
     args = parser.parse_args()
     print("=" * 60)
@@ -149,75 +792,181 @@ def main():
     else:
         device = args.device
     print(f"Device: {device}")
-
-    # Load model
-    print("\nLoading model...")
-    model = load_models(device)
-    model.eval()
-    print("✅ Model loaded")
+    print(f"Filter mode: {args.filter_mode}")
+    print(f"Resampling: {'polyphase' if args.chunked else args.resample}")
+    print(f"EDF reader: {args.edf_reader}")
+    if not 0.0 <= args.overlap_ratio < 1.0:
+        parser.error("--overlap_ratio must be in [0, 1)")
+    if args.chunked and args.overlap_ratio:
+        parser.error("--chunked does not support --overlap_ratio")
+    if args.chunked and args.window_cache:
+        parser.error("--chunked does not support --window_cache")
+    if args.chunked:
+        print("Chunked mode: bounded memory, polyphase resampling")
+    if args.overlap_ratio:
+        print(f"Window overlap: {args.overlap_ratio} ({args.stitch} overlap-add)")
+    print(f"Precision: {args.precision}{' (compiled)' if args.compile else ''}")
+    if args.compile and args.precision != "fp32":
+        parser.error("--compile supports --precision fp32 only")
+    if args.batch_first and args.precision == "int8":
+        parser.error("--batch_first cannot be combined with --precision int8")
+    if args.backend == "onnxruntime":
+        if args.precision != "fp32" or args.compile or device != "cpu":
+            parser.error(
+                "--backend onnxruntime requires --precision fp32, --device cpu, no --compile"
+            )
+        print("Backend: onnxruntime (CPUExecutionProvider)")
 
     # Find TUSZ eval files
     data_dir = Path(args.data_dir)
     edf_files = sorted(data_dir.glob("**/*.edf"))
     print(f"\n✅ Found {len(edf_files)} EDF files")
 
-    # Checkpoint file
+    # Multi-node: keep only this node's deterministic, duration-balanced subset
+    shard = None
+    if args.num_shards > 1:
+        if not 0 <= args.shard_index < args.num_shards:
+            parser.error("--shard_index must be in [0, --num_shards)")
+        total_files = len(edf_files)
+        edf_files = balanced_shards(edf_files, args.num_shards)[args.shard_index]
+        shard = {
+            "index": args.shard_index,
+            "num_shards": args.num_shards,
+            "files": [str(p.relative_to(data_dir)) for p in edf_files],
+        }
+        print(
+            f"   Shard {args.shard_index + 1}/{args.num_shards}: "
+            f"{len(edf_files)}/{total_files} files (merge with tusz-merge)"
+        )
+
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
     checkpoint_file = out_dir / "checkpoint.pkl"
+    eager_loader = partial(
+        load_model,
+        precision=args.precision,
+        loader=load_models,
+        optimize=args.optimize,
+        batch_first=args.batch_first,
+    )
 
-    # Load checkpoint if exists
-    if checkpoint_file.exists():
-        print("\n📂 Loading checkpoint...")
-        with open(checkpoint_file, "rb") as f:
-            checkpoint = pickle.load(f)
-        results = checkpoint["results"]
-        start_idx = checkpoint["next_idx"]
-        print(f"   Resuming from file {start_idx}/{len(edf_files)}")
-    else:
-        results = {}
-        start_idx = 0
-
-    # Process files
-    print("\nProcessing files...")
-    files_with_labels = 0
-    total_label_events = 0
-
-    for idx in tqdm(range(start_idx, len(edf_files)), initial=start_idx, total=len(edf_files)):
-        edf_path = edf_files[idx]
-        file_id = edf_path.stem
-
-        # Skip if already processed
-        if file_id in results:
-            continue
+    def backend_loader(batch_size: int):
+        """Loader of the model the run will use (compiled artifacts are traced per batch size)."""
+        if args.compile:
+            return partial(
+                load_compiled,
+                batch_size=batch_size,
+                cache_dir=Path(args.compile_cache_dir),
+                loader=eager_loader,
+            )
+        if args.backend == "onnxruntime":
+            return partial(
+                load_onnxruntime,
+                onnx_path=Path(args.onnx_model) if args.onnx_model else None,
+                cache_dir=Path(args.compile_cache_dir),
+                intra_op_threads=args.intra_op_threads,
+                inter_op_threads=args.inter_op_threads,
+                loader=eager_loader,
+            )
+        return eager_loader
 
-        # Process file
-        predictions, error, load_method = process_single_file(
-            edf_path, model, device, batch_size=args.batch_size
+    threads = None
+    if args.workers > 1:
+        threads = args.threads_per_worker or max(1, (os.cpu_count() or 1) // args.workers)
+    if args.autotune:
+        if args.backend != "torch" or device != "cpu":
+            parser.error("--autotune supports --backend torch on --device cpu only")
+        budget_gb = args.rss_budget_gb or total_memory_bytes() / 2 / 2**30
+        budget = int(budget_gb * 2**30 / max(1, args.workers))
+        print(f"\nCalibrating batch size/threads (peak RSS budget {budget / 2**30:.1f} GiB)...")
+        variant = (
+            f"{args.precision}|optimize={args.optimize}|batch_first={args.batch_first}"
+            f"|compile={args.compile}"
         )
-
-        # Load labels
-        seizure_events = load_labels_for_file(edf_path)
-        if seizure_events:
-            files_with_labels += 1
-            total_label_events += len(seizure_events)
-
-        # Store result
-        results[file_id] = {
-            "predictions": predictions,
-            "seizure_events": seizure_events,
-            "error": error,
-            "load_method": load_method,
+        # Time the model that will run (the frozen artifact with --compile, traced at
+        # the pre-tuning batch size; it serves every batch size)
+        tuned = autotune(
+            loader_measure(backend_loader(args.batch_size), device),
+            budget,
+            variant=variant,
+            threads=[threads] if threads else None,
+            cache_file=Path(args.autotune_cache),
+        )
+        args.batch_size = tuned.batch_size
+        if threads is None:
+            torch.set_num_threads(tuned.threads)
+        print(
+            f"✅ Batch size {tuned.batch_size}, {tuned.threads} threads "
+            f"({tuned.windows_per_sec:.2f} windows/s)"
+        )
+    model_loader = backend_loader(args.batch_size)
+    prediction_cache = cache_params = model_fingerprint = None
+    if args.prediction_cache:
+        prediction_cache = PredictionCache(
+            Path(args.prediction_cache_dir), int(args.prediction_cache_gb * 2**30)
+        )
+        # Everything besides the EDF and the weights that changes the predictions
+        cache_params = {
+            "filter_mode": args.filter_mode,
+            "resample": "polyphase" if args.chunked else args.resample,
+            "chunked": args.chunked,
+            "overlap_ratio": args.overlap_ratio,
+            "stitch": args.stitch if args.overlap_ratio else None,
+            "precision": args.precision,
+            "optimize": args.optimize,
+            "batch_first": args.batch_first,
+            "backend": args.backend,
+            "compile": args.compile,
         }
+        if args.window_cache and args.window_cache_dtype != "float32":
+            cache_params["window_dtype"] = args.window_cache_dtype
+        weights_file = default_weights_file()
+        if args.backend == "onnxruntime" and args.onnx_model:
+            # A user-supplied export is the model itself: key by its content
+            model_fingerprint = prediction_cache.file_digest(Path(args.onnx_model))
+        elif weights_file is not None:
+            model_fingerprint = prediction_cache.file_digest(weights_file)
+        print(f"Prediction cache: {args.prediction_cache_dir}")
+    window_cache = None
+    if args.window_cache:
+        window_cache = WindowCache(Path(args.window_cache_dir), dtype=args.window_cache_dtype)
+        print(f"Window cache: {args.window_cache_dir} ({args.window_cache_dtype})")
+    recording_loader = load_recording_native if args.edf_reader == "native" else load_recording
+    run_kwargs = {
+        "device": device,
+        "batch_size": args.batch_size,
+        "filter_mode": args.filter_mode,
+        "prefetch_workers": args.prefetch_workers,
+        "prefetch_depth": args.prefetch_depth,
+        "overlap_ratio": args.overlap_ratio,
+        "stitch": args.stitch,
+        "chunked": args.chunked,
+        "resample_method": args.resample,
+        "prediction_cache": prediction_cache,
+        "cache_params": cache_params,
+        "model_fingerprint": model_fingerprint,
+        "window_cache": window_cache,
+        "model_loader": model_loader,
+        "recording_loader": recording_loader,
+    }
 
-        # Save checkpoint every 10 files
-        if idx % 10 == 0:
-            with open(checkpoint_file, "wb") as f:
-                pickle.dump({"results": results, "next_idx": idx + 1}, f)
+    if args.workers > 1:
+        print(f"\nSharding across {args.workers} worker processes ({threads} threads each)...")
+        results = run_local_shards(
+            edf_files, out_dir, args.workers, data_dir, threads_per_worker=threads, **run_kwargs
+        )
+        write_checkpoint(checkpoint_file, results, len(edf_files), shard)
+    else:
+        results = run_inference(edf_files, checkpoint_file, shard=shard, **run_kwargs)
 
-    # Save final checkpoint
-    with open(checkpoint_file, "wb") as f:
-        pickle.dump({"results": results, "next_idx": len(edf_files)}, f)
+    files_with_labels = sum(
+        1 for r in results.values() if r.get("error") is None and r.get("seizure_events")
+    )
+    total_label_events = sum(
+        len(r["seizure_events"])
+        for r in results.values()
+        if r.get("error") is None and r.get("seizure_events")
+    )
 
     # Ground truth validation warning
     processed_files = len([r for r in results.values() if r.get("error") is None])
@@ -315,20 +1064,22 @@ def main():
 
         # Save results
         results_file = out_dir / "results.json"
+        summary = {
+            "auroc": (float(auroc) if auroc is not None else None),
+            "sensitivity": sensitivity,
+            "specificity": specificity,
+            "threshold": threshold,
+            "total_samples": len(all_preds_array),
+            "seizure_percentage": float(all_labels_array.mean()),
+            "timestamp": datetime.now().isoformat(),
+        }
+        if prediction_cache is not None and args.workers <= 1:
+            # With --workers, each worker process counts its own hits and misses
+            summary["prediction_cache"] = prediction_cache.stats()
+        if window_cache is not None:
+            summary["window_cache"] = window_cache.stats()
         with open(results_file, "w") as f:
-            json.dump(
-                {
-                    "auroc": (float(auroc) if auroc is not None else None),
-                    "sensitivity": sensitivity,
-                    "specificity": specificity,
-                    "threshold": threshold,
-                    "total_samples": len(all_preds_array),
-                    "seizure_percentage": float(all_labels_array.mean()),
-                    "timestamp": datetime.now().isoformat(),
-                },
-                f,
-                indent=2,
-            )
+            json.dump(summary, f, indent=2)
 
         print(f"\n✅ Results saved to {results_file}")
     else:
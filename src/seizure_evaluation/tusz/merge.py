@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Merge shard checkpoints written by `tusz-eval --shard_index i --num_shards N`.
+
+CLI:
+  tusz-merge \
+    --shards node0/checkpoint.pkl node1/checkpoint.pkl node2/checkpoint.pkl \
+    --out_dir experiments/eval/baseline
+
+Writes `<out_dir>/checkpoint.pkl` in the standard layout (`results` keyed by
+file_id, `next_idx`) consumed by `nedc-run`, `szcore-run` and
+`convert_predictions.py`, plus `<out_dir>/merge_report.json`. Exits non-zero on
+duplicate or missing files/shards unless `--allow_incomplete` is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pickle
+from pathlib import Path
+
+from seizure_evaluation.tusz.sharding import merge_shard_checkpoints
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Merge tusz-eval shard checkpoints")
+    p.add_argument("--shards", nargs="+", required=True, help="Shard checkpoint.pkl files")
+    p.add_argument("--out_dir", type=str, required=True, help="Directory for merged checkpoint")
+    p.add_argument(
+        "--data_dir",
+        type=str,
+        default=None,
+        help="Optional EDF root; also report files in **/*.edf missing from every shard",
+    )
+    p.add_argument(
+        "--allow_incomplete",
+        action="store_true",
+        help="Write the merged checkpoint even with missing or duplicate files",
+    )
+    args = p.parse_args()
+
+    checkpoints = []
+    for shard_path in args.shards:
+        with open(shard_path, "rb") as f:
+            checkpoints.append(pickle.load(f))
+    merged, report = merge_shard_checkpoints(checkpoints)
+
+    if args.data_dir:
+        on_disk = {path.stem for path in Path(args.data_dir).glob("**/*.edf")}
+        report["missing"] = sorted(set(report["missing"]) | (on_disk - merged["results"].keys()))
+
+    print(f"Merged {report['shards_merged']} shard(s): {report['files']} files")
+    problems = {k: report[k] for k in ("duplicates", "missing", "missing_shards") if report[k]}
+    for key, value in problems.items():
+        print(f"⚠️  {key}: {len(value)} -> {sorted(value)[:10]}")
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with open(out_dir / "merge_report.json", "w") as f:
+        json.dump(report, f, indent=2)
+
+    if problems and not args.allow_incomplete:
+        print("❌ Not writing merged checkpoint (use --allow_incomplete to override)")
+        return 1
+
+    checkpoint_file = out_dir / "checkpoint.pkl"
+    with open(checkpoint_file, "wb") as f:
+        pickle.dump(merged, f)
+    print(f"✅ Merged checkpoint: {checkpoint_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
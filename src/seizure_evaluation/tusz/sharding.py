@@ -0,0 +1,108 @@
+"""
+Deterministic sharding of the TUSZ EDF list and merging of shard checkpoints.
+
+Shards are balanced by recording duration read from each EDF header (number of
+data records x record duration), using a greedy longest-first assignment with
+path tie-breaks. Every node that sees the same sorted `**/*.edf` list computes
+the same assignment, so no coordination service is needed.
+
+Shard checkpoints carry a `shard` entry next to `results`/`next_idx`:
+    {"index": i, "num_shards": N, "files": [relative EDF paths in this shard]}
+which `merge_shard_checkpoints` uses to detect missing and duplicate files.
+"""
+
+from __future__ import annotations
+
+import heapq
+from pathlib import Path
+from typing import Any
+
+N_RECORDS_OFFSET = 236  # EDF header: number of data records [236:244]
+RECORD_DURATION_OFFSET = 244  # EDF header: duration of a data record [244:252]
+
+
+def edf_duration_sec(edf_path: Path) -> float:
+    """Recording duration from the EDF fixed header; falls back to file size if unparsable."""
+    try:
+        with open(edf_path, "rb") as f:
+            f.seek(N_RECORDS_OFFSET)
+            n_records = int(f.read(8).decode("ascii").strip())
+            record_duration = float(f.read(8).decode("ascii").strip())
+        if n_records >= 0 and record_duration > 0:
+            return n_records * record_duration
+    except (OSError, ValueError):
+        pass
+    # Unknown record count (-1) or malformed header: size is a usable proxy for balancing
+    return float(Path(edf_path).stat().st_size)
+
+
+def balanced_shards(edf_files: list[Path], num_shards: int) -> list[list[Path]]:
+    """
+    Split `edf_files` into `num_shards` duration-balanced subsets.
+
+    Args:
+        edf_files: EDF paths (any order; assignment depends only on the set)
+        num_shards: Number of shards (>= 1)
+
+    Returns:
+        List of shards, each sorted by path
+    """
+    if num_shards < 1:
+        raise ValueError("num_shards must be >= 1")
+    durations = {p: edf_duration_sec(p) for p in edf_files}
+    by_duration = sorted(edf_files, key=lambda p: (-durations[p], str(p)))
+    heap = [(0.0, k) for k in range(num_shards)]  # (assigned seconds, shard index)
+    shards: list[list[Path]] = [[] for _ in range(num_shards)]
+    for path in by_duration:
+        total, k = heapq.heappop(heap)
+        shards[k].append(path)
+        heapq.heappush(heap, (total + durations[path], k))
+    return [sorted(shard) for shard in shards]
+
+
+def merge_shard_checkpoints(
+    checkpoints: list[dict[str, Any]],
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Combine shard checkpoints into one `tusz-eval` checkpoint.
+
+    Args:
+        checkpoints: Loaded shard checkpoint dicts
+
+    Returns:
+        (merged_checkpoint, report); report lists duplicate file ids, file ids
+        assigned to a shard but without a result, and shard indices never seen
+    """
+    results: dict[str, Any] = {}
+    owners: dict[str, list[int]] = {}
+    expected: dict[str, str] = {}  # file_id -> relative path (ordering key)
+    seen_shards: set[int] = set()
+    num_shards = None
+
+    for pos, ckpt in enumerate(checkpoints):
+        shard = ckpt.get("shard") or {}
+        index = shard.get("index", pos)
+        seen_shards.add(index)
+        if shard.get("num_shards") is not None:
+            num_shards = shard["num_shards"]
+        for rel in shard.get("files", []):
+            expected[Path(rel).stem] = rel
+        for file_id, entry in ckpt["results"].items():
+            owners.setdefault(file_id, []).append(index)
+            results.setdefault(file_id, entry)
+
+    duplicates = {fid: idx for fid, idx in owners.items() if len(idx) > 1}
+    missing = sorted(fid for fid in expected if fid not in results)
+    missing_shards = sorted(set(range(num_shards)) - seen_shards) if num_shards is not None else []
+
+    order = sorted(results, key=lambda fid: (fid not in expected, expected.get(fid, fid)))
+    merged = {"results": {fid: results[fid] for fid in order}, "next_idx": len(order)}
+    report = {
+        "shards_merged": len(checkpoints),
+        "num_shards": num_shards,
+        "files": len(order),
+        "duplicates": duplicates,
+        "missing": missing,
+        "missing_shards": missing_shards,
+    }
+    return merged, report
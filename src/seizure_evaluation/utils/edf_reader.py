@@ -0,0 +1,329 @@
+"""
+NumPy EDF/EDF+ reader for the 19 evaluation channels.
+
+`load_with_fallback` normally goes through `epilepsy2bids.Eeg.loadEdf`, which
+opens the file with pyedflib and rejects headers with a malformed startdate
+(the known TUSZ file has `01:01:85` at bytes 168-176). This reader:
+
+- parses the fixed and per-signal headers once, keeping the date/time fields
+  as raw strings (never validated, so malformed separators are harmless and
+  the file is never copied or rewritten)
+- maps labels such as `EEG FP1-REF`, `EEG T7-LE` or `Fp1` to the 10-20 order
+  used by `Eeg.loadEdf` (`EEG_19_CHANNELS`), with the same matching rules
+- memory-maps the data records and views them with `np.frombuffer`, then
+  gathers only the requested signals
+- converts digital to physical values for all channels at once, with
+  edflib's arithmetic (so results equal pyedflib's `readSignal`)
+
+EDF+ annotation signals are skipped; EDF+D records are concatenated like pyedflib does.
+
+Sources can be paths or binary file objects, e.g. an EDF whose header was
+patched in memory (`edf_repair.open_repaired_edf`). File objects with a
+`fileno()` have their data records memory-mapped through it; others are read.
+"""
+
+from __future__ import annotations
+
+import mmap
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+# `epilepsy2bids.Eeg.ELECTRODES_10_20`, the channel order the model was trained on
+EEG_19_CHANNELS = (
+    "Fp1",
+    "F3",
+    "C3",
+    "P3",
+    "O1",
+    "F7",
+    "T3",
+    "T5",
+    "Fz",
+    "Cz",
+    "Pz",
+    "Fp2",
+    "F4",
+    "C4",
+    "P4",
+    "O2",
+    "F8",
+    "T4",
+    "T6",
+)
+ANNOTATION_LABEL = "EDF Annotations"
+FIXED_HEADER_BYTES = 256
+# Per-signal header fields: (name, width); each is stored for all signals in turn
+SIGNAL_FIELDS = (
+    ("label", 16),
+    ("transducer", 80),
+    ("physical_dimension", 8),
+    ("physical_min", 8),
+    ("physical_max", 8),
+    ("digital_min", 8),
+    ("digital_max", 8),
+    ("prefilter", 80),
+    ("samples_per_record", 8),
+    ("reserved", 32),
+)
+# Old and new names of the same 10-20 positions, as in `Eeg._electrodeSynonymRegex`
+_SYNONYMS = {
+    "T3": "(T3|T7)",
+    "T7": "(T3|T7)",
+    "T4": "(T4|T8)",
+    "T8": "(T4|T8)",
+    "T5": "(T5|P7)",
+    "P7": "(T5|P7)",
+    "T6": "(T6|P8)",
+    "P8": "(T6|P8)",
+    "O1": "(O1|01)",
+}
+
+
+@dataclass
+class EdfHeader:
+    """Parsed EDF(+) header; per-signal arrays cover every signal, annotations included."""
+
+    version: str
+    patient: str
+    recording: str
+    startdate: str  # raw "DD.MM.YY"; not validated (TUSZ has malformed separators)
+    starttime: str  # raw "HH.MM.SS"
+    header_bytes: int
+    reserved: str  # "EDF+C" / "EDF+D" for EDF+
+    n_records: int
+    record_duration: float
+    labels: list[str]
+    physical_min: np.ndarray
+    physical_max: np.ndarray
+    digital_min: np.ndarray
+    digital_max: np.ndarray
+    samples_per_record: np.ndarray
+
+    @property
+    def n_signals(self) -> int:
+        return len(self.labels)
+
+    @property
+    def record_samples(self) -> int:
+        """int16 samples per data record, all signals."""
+        return int(self.samples_per_record.sum())
+
+    @property
+    def signal_indices(self) -> list[int]:
+        """Indices of the ordinary (non-annotation) signals, in file order."""
+        return [i for i, label in enumerate(self.labels) if label != ANNOTATION_LABEL]
+
+    def sample_frequency(self, index: int) -> float:
+        return float(self.samples_per_record[index] / self.record_duration)
+
+
+@dataclass
+class EdfRecording:
+    """Physical signals of the requested channels (missing channels are zeros)."""
+
+    data: np.ndarray  # (channels, samples)
+    fs: float
+    channels: list[str]  # EDF label, or the electrode name when missing
+    missing: list[str]
+    header: EdfHeader
+
+
+def _field(raw: bytes) -> str:
+    return raw.decode("latin-1").strip()
+
+
+def _number(raw: str, name: str) -> float:
+    try:
+        return float(raw)
+    except ValueError:
+        raise ValueError(f"Invalid EDF header field {name}: {raw!r}") from None
+
+
+@contextmanager
+def _opened(source: Path | BinaryIO) -> Iterator[BinaryIO]:
+    """`source` as a binary file positioned at 0 (file objects are not closed)."""
+    if hasattr(source, "read"):
+        source.seek(0)
+        yield source
+    else:
+        with open(source, "rb") as f:
+            yield f
+
+
+@contextmanager
+def _data_buffer(f: BinaryIO) -> Iterator[bytes | mmap.mmap]:
+    """Whole-file buffer: a read-only mmap via `fileno()`, else the bytes read."""
+    try:
+        fd = f.fileno()
+    except (AttributeError, OSError):  # io.UnsupportedOperation is an OSError
+        f.seek(0)
+        yield f.read()
+        return
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+        yield mm
+
+
+def _parse_header(f: BinaryIO, name: str) -> EdfHeader:
+    fixed = f.read(FIXED_HEADER_BYTES)
+    if len(fixed) < FIXED_HEADER_BYTES:
+        raise ValueError(f"Truncated EDF header: {name}")
+    if _field(fixed[0:8]) != "0":
+        raise ValueError(f"Not an EDF file (version {fixed[0:8]!r}): {name}")
+    n_signals = int(_number(_field(fixed[252:256]), "number of signals"))
+    signal_header = f.read(n_signals * FIXED_HEADER_BYTES)
+    if len(signal_header) < n_signals * FIXED_HEADER_BYTES:
+        raise ValueError(f"Truncated EDF signal header: {name}")
+
+    fields: dict[str, list[str]] = {}
+    offset = 0
+    for field, width in SIGNAL_FIELDS:
+        fields[field] = [
+            _field(signal_header[offset + i * width : offset + (i + 1) * width])
+            for i in range(n_signals)
+        ]
+        offset += n_signals * width
+
+    def numbers(field: str) -> np.ndarray:
+        return np.array([_number(v, field) for v in fields[field]], dtype=np.float64)
+
+    return EdfHeader(
+        version=_field(fixed[0:8]),
+        patient=_field(fixed[8:88]),
+        recording=_field(fixed[88:168]),
+        startdate=_field(fixed[168:176]),
+        starttime=_field(fixed[176:184]),
+        header_bytes=int(_number(_field(fixed[184:192]), "header bytes")),
+        reserved=_field(fixed[192:236]),
+        n_records=int(_number(_field(fixed[236:244]), "number of records")),
+        record_duration=_number(_field(fixed[244:252]), "record duration"),
+        labels=fields["label"],
+        physical_min=numbers("physical_min"),
+        physical_max=numbers("physical_max"),
+        digital_min=numbers("digital_min"),
+        digital_max=numbers("digital_max"),
+        samples_per_record=numbers("samples_per_record").astype(np.int64),
+    )
+
+
+def read_edf_header(source: Path | BinaryIO) -> EdfHeader:
+    """
+    Parse the fixed and per-signal EDF(+) header of `source` (path or binary file).
+
+    Raises:
+        ValueError: if the header is truncated or its numeric fields are invalid
+    """
+    with _opened(source) as f:
+        return _parse_header(f, getattr(source, "name", str(source)))
+
+
+def match_channels(
+    labels: list[str], electrodes: tuple[str, ...] = EEG_19_CHANNELS
+) -> list[int | None]:
+    """
+    Index into `labels` of each electrode (None if absent).
+
+    Follows `Eeg._findChannelIndex` for unipolar montages: the first label
+    matching `^(EEG )?<electrode>(-<ref>)?` (case-insensitive, with T3/T7,
+    T4/T8, T5/P7, T6/P8 and O1/01 synonyms) wins, so `EEG FP1-REF`,
+    `EEG FP1-LE` and `Fp1` all map to Fp1.
+    """
+    indices = []
+    for electrode in electrodes:
+        pattern = re.compile(
+            rf"^(EEG )?{_SYNONYMS.get(electrode, electrode)}(-[a-z]?[1-9]*)?",
+            flags=re.IGNORECASE,
+        )
+        indices.append(next((i for i, label in enumerate(labels) if pattern.search(label)), None))
+    return indices
+
+
+def read_edf(
+    source: Path | BinaryIO,
+    electrodes: tuple[str, ...] = EEG_19_CHANNELS,
+    dtype: np.dtype | type = np.float64,
+) -> EdfRecording:
+    """
+    Read the physical signals of `electrodes` from an EDF/EDF+ file.
+
+    Args:
+        source: EDF or EDF+ path or binary file object (the date/time header
+            fields are not validated)
+        electrodes: Electrodes to return, in order; absent ones are zero-filled
+            (as `Eeg.loadEdf` does)
+        dtype: Output dtype (float64 matches pyedflib)
+
+    Returns:
+        EdfRecording with data of shape (len(electrodes), samples)
+
+    Raises:
+        ValueError: on a malformed header, truncated data, no matching
+            electrode, or electrodes sampled at different rates
+    """
+    name = getattr(source, "name", str(source))
+    with _opened(source) as f:
+        header = _parse_header(f, name)
+        return _read_signals(f, header, electrodes, dtype, name)
+
+
+def _read_signals(
+    f: BinaryIO, header: EdfHeader, electrodes: tuple[str, ...], dtype, name: str
+) -> EdfRecording:
+    signals = header.signal_indices
+    matches = match_channels([header.labels[i] for i in signals], electrodes)
+    found = [signals[m] for m in matches if m is not None]
+    if not found:
+        raise ValueError(f"None of the electrodes {electrodes} found in {name}")
+    spr = header.samples_per_record[found]
+    if np.any(spr != spr[0]):
+        raise ValueError(f"Electrodes are sampled at different rates in {name}")
+    spr = int(spr[0])
+
+    with _data_buffer(f) as buffer:
+        available = (len(buffer) - header.header_bytes) // (2 * header.record_samples)
+        n_records = available if header.n_records < 0 else header.n_records
+        if n_records > available:
+            raise ValueError(
+                f"EDF data truncated: header declares {n_records} records, "
+                f"file holds {available}: {name}"
+            )
+        records = np.frombuffer(
+            buffer, dtype="<i2", count=n_records * header.record_samples, offset=header.header_bytes
+        ).reshape(n_records, header.record_samples)
+        # Column indices of each found signal's samples within a record
+        starts = np.concatenate([[0], np.cumsum(header.samples_per_record)[:-1]])[found]
+        digital = records[:, starts[:, None] + np.arange(spr)]  # gathers a copy
+        del records  # release the buffer before an mmap closes
+
+    # (records, signals, spr) -> (signals, samples), then edflib's scaling:
+    # bitvalue * (offset + digital) with offset = physical_max / bitvalue - digital_max
+    digital = digital.transpose(1, 0, 2).reshape(len(found), -1)
+    bitvalue = (header.physical_max[found] - header.physical_min[found]) / (
+        header.digital_max[found] - header.digital_min[found]
+    )
+    offset = header.physical_max[found] / bitvalue - header.digital_max[found]
+    physical = bitvalue[:, None] * (offset[:, None] + digital)
+
+    data = np.zeros((len(electrodes), physical.shape[1]), dtype=dtype)
+    channels, missing = [], []
+    row = 0
+    for electrode, m in zip(electrodes, matches, strict=True):
+        if m is None:
+            channels.append(electrode)
+            missing.append(electrode)
+            continue
+        data[len(channels)] = physical[row]
+        channels.append(header.labels[signals[m]])
+        row += 1
+    return EdfRecording(
+        data=data,
+        fs=header.sample_frequency(found[-1]),
+        channels=channels,
+        missing=missing,
+        header=header,
+    )
@@ -11,12 +11,18 @@ Primary goal:
 
 Functions:
 - validate_edf_header: returns parsed date/time fields and compliance flags.
+- repaired_header: header bytes with common separator mistakes fixed.
+- open_repaired_edf: read-only view of an EDF with the repaired header overlaid in
+  memory (no copy of the file, no write access needed).
 - repair_edf_header_copy: creates a repaired copy by replacing common separators.
-- load_with_fallback: tries standard loader, then repair+reload, then optional MNE.
+- load_with_fallback: tries standard loader, then in-memory repair+reload, then optional MNE
+  (optionally preceded by the NumPy reader in `edf_reader`, which needs no repair).
 """
 
 from __future__ import annotations
 
+import io
+import os
 import re
 import shutil
 from dataclasses import dataclass
@@ -24,6 +30,8 @@ from pathlib import Path
 
 import numpy as np
 
+from seizure_evaluation.utils.edf_reader import EdfRecording, read_edf
+
 DATE_OFFSET = 168  # EDF header startdate bytes [168:176]
 TIME_OFFSET = 176  # EDF header starttime bytes [176:184]
 FIELD_LEN = 8
@@ -66,10 +74,115 @@ def validate_edf_header(edf_path: Path) -> HeaderValidation:
     )
 
 
+def _repair_field(raw: bytes, pattern: re.Pattern) -> bytes:
+    text = raw.decode("ascii", errors="ignore")
+    # Replace common separators; keep the original unless the result is EDF-compliant
+    candidate = (text.replace(":", ".").replace("/", ".").replace("-", "."))[:FIELD_LEN].ljust(
+        FIELD_LEN
+    )
+    fixed = candidate if pattern.match(candidate) else text[:FIELD_LEN].ljust(FIELD_LEN)
+    return fixed.encode("ascii")
+
+
+def repaired_header(header: bytes) -> bytes:
+    """
+    Return `header` (the leading bytes of an EDF, at least 184) with date/time repaired.
+
+    - Replaces ':', '/', '-' with '.' in date/time fields.
+    - Only modifies bytes [168:176] and [176:184].
+    """
+    patched = bytearray(header)
+    for offset, pattern in ((DATE_OFFSET, _DATE_PAT), (TIME_OFFSET, _TIME_PAT)):
+        patched[offset : offset + FIELD_LEN] = _repair_field(
+            header[offset : offset + FIELD_LEN], pattern
+        )
+    return bytes(patched)
+
+
+class HeaderPatchedFile(io.RawIOBase):
+    """
+    Read-only EDF view: an in-memory header overlaid on the original file.
+
+    Reads of the first `len(header)` bytes come from `header`; everything else
+    is read from `edf_path`, which is opened read-only and never copied.
+    `fileno()` is the original file's descriptor: bytes past the patched header
+    are identical, so readers may memory-map the data records through it
+    (`edf_reader.read_edf` does).
+    """
+
+    def __init__(self, edf_path: Path, header: bytes):
+        super().__init__()
+        self.name = str(edf_path)
+        self._file = open(edf_path, "rb")  # noqa: SIM115 - closed in close()
+        self._header = header
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += os.fstat(self._file.fileno()).st_size
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self._pos = offset
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        n = 0
+        if self._pos < len(self._header):
+            chunk = self._header[self._pos : self._pos + len(view)]
+            view[: len(chunk)] = chunk
+            n = len(chunk)
+        if n < len(view):
+            self._file.seek(self._pos + n)
+            n += self._file.readinto(view[n:]) or 0
+        self._pos += n
+        return n
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+def open_repaired_edf(edf_path: Path) -> HeaderPatchedFile:
+    """
+    Open `edf_path` with its date/time header fields repaired in memory.
+
+    Only the first 184 bytes are read and patched; the file itself is neither
+    copied nor modified, so read-only and network storage work.
+
+    Raises:
+        ValueError: if the date/time fields are still not EDF-compliant after repair
+    """
+    with open(edf_path, "rb") as f:
+        header = repaired_header(f.read(TIME_OFFSET + FIELD_LEN))
+    for offset, pattern in ((DATE_OFFSET, _DATE_PAT), (TIME_OFFSET, _TIME_PAT)):
+        field = header[offset : offset + FIELD_LEN].decode("ascii", errors="ignore")
+        if not pattern.match(field):
+            raise ValueError(f"EDF header field {field!r} at byte {offset} cannot be repaired")
+    return HeaderPatchedFile(edf_path, header)
+
+
 def repair_edf_header_copy(edf_path: Path, output_path: Path | None = None) -> Path:
     """
     Create a repaired copy of EDF header where common separator mistakes are fixed.
 
+    Prefer `open_repaired_edf`, which patches the header in memory instead of
+    copying the whole file; this remains for tools that need a repaired file on disk.
+
     - Replaces ':', '/', '-' with '.' in date/time fields.
     - Only modifies bytes [168:176] and [176:184].
     - Leaves the original file intact; returns path to the repaired copy.
@@ -81,43 +194,39 @@ def repair_edf_header_copy(edf_path: Path, output_path: Path | None = None) -> P
     shutil.copy2(edf_path, output_path)
 
     with open(output_path, "r+b") as f:
-        # Date field
-        f.seek(DATE_OFFSET)
-        date_b = f.read(FIELD_LEN)
-        date_s = date_b.decode("ascii", errors="ignore")
-        # Replace common separators; validate against EDF pattern before writing
-        cand_date = (date_s.replace(":", ".").replace("/", ".").replace("-", "."))[
-            :FIELD_LEN
-        ].ljust(FIELD_LEN)
-        fixed_date = (
-            cand_date if _DATE_PAT.match(cand_date) else date_s[:FIELD_LEN].ljust(FIELD_LEN)
-        )
+        header = repaired_header(f.read(TIME_OFFSET + FIELD_LEN))
         f.seek(DATE_OFFSET)
-        f.write(fixed_date.encode("ascii"))
-
-        # Time field
-        f.seek(TIME_OFFSET)
-        time_b = f.read(FIELD_LEN)
-        time_s = time_b.decode("ascii", errors="ignore")
-        cand_time = (time_s.replace(":", ".").replace("/", ".").replace("-", "."))[
-            :FIELD_LEN
-        ].ljust(FIELD_LEN)
-        fixed_time = (
-            cand_time if _TIME_PAT.match(cand_time) else time_s[:FIELD_LEN].ljust(FIELD_LEN)
-        )
-        f.seek(TIME_OFFSET)
-        f.write(fixed_time.encode("ascii"))
+        f.write(header[DATE_OFFSET:])
 
     return output_path
 
 
-def load_with_fallback(edf_path: Path):
+def _report_missing(recording: EdfRecording, edf_path: Path) -> EdfRecording:
+    for electrode in recording.missing:
+        print(f"Missing electrode {electrode} in file {edf_path} replaced by zeros.")
+    return recording
+
+
+def load_with_fallback(edf_path: Path, native: bool = False):
     """
     Try to load EDF using epilepsy2bids.Eeg.loadEdf first.
-    If it fails due to known header issues, attempt repair+reload; finally optional MNE.
+    If it fails due to known header issues, repair the header in memory
+    (`open_repaired_edf`) and decode the patched view with `edf_reader.read_edf`
+    ("native+repaired"; same values as pyedflib, no file copy); finally optional MNE.
+
+    With `native=True`, `edf_reader.read_edf` (NumPy, tolerant of the malformed
+    startdate) is tried before all of these and reported as "native".
 
     Returns (eeg, method_str) or raises the last exception.
     """
+    if native:
+        try:
+            recording = read_edf(Path(edf_path))
+        except Exception as e:  # noqa: BLE001
+            print(f"Native EDF reader failed for {edf_path} ({e}); falling back to pyedflib")
+        else:
+            return _report_missing(recording, edf_path), "native"
+
     from epilepsy2bids.eeg import Eeg
 
     try:
@@ -129,19 +238,13 @@ def load_with_fallback(edf_path: Path):
             ("startdate" in msg) or ("not EDF" in msg) or ("not EDF(+)" in msg) or ("BDF" in msg)
         )
 
-        # Strategy 2: Header repair + reload
+        # Strategy 2: In-memory header repair + reload (pyedflib only opens paths,
+        # so the patched view is decoded by the NumPy reader)
         if header_issue:
             try:
-                repaired = repair_edf_header_copy(Path(edf_path))
-                try:
-                    eeg = Eeg.loadEdf(str(repaired))
-                    return eeg, "pyedflib+repaired"
-                finally:
-                    # Best-effort cleanup; ignore errors
-                    import contextlib
-
-                    with contextlib.suppress(Exception):
-                        Path(repaired).unlink(missing_ok=True)
+                with open_repaired_edf(Path(edf_path)) as repaired:
+                    recording = read_edf(repaired)
+                return _report_missing(recording, edf_path), "native+repaired"
             except Exception as e2:  # noqa: BLE001
                 last = e2
         else:
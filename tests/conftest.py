@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def random_model():
+    """Factory `(device, seed=0)` of SeizureTransformers with seeded random weights, in eval mode."""
+    torch = pytest.importorskip("torch")
+    architecture = pytest.importorskip("wu_2025.architecture")
+
+    def make(device, seed=0):
+        torch.manual_seed(seed)
+        return architecture.SeizureTransformer().to(device).eval()
+
+    return make
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests for the NumPy EDF/EDF+ reader and in-memory header repair.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pyedflib = pytest.importorskip("pyedflib")
+eeg_module = pytest.importorskip("epilepsy2bids.eeg")
+
+from seizure_evaluation.utils.edf_reader import (  # noqa: E402
+    EEG_19_CHANNELS,
+    match_channels,
+    read_edf,
+    read_edf_header,
+)
+from seizure_evaluation.utils.edf_repair import (  # noqa: E402
+    DATE_OFFSET,
+    load_with_fallback,
+    open_repaired_edf,
+    repaired_header,
+)
+
+# TUSZ-style referential labels, shuffled, with T7/P8 synonyms and extra channels
+TUSZ_LABELS = ["EKG1-REF"] + [
+    f"EEG {c.upper()}-REF".replace("T3", "T7").replace("T6", "P8") for c in EEG_19_CHANNELS[::-1]
+]
+
+
+def _write_edf(path: Path, labels, fs=250, seconds=7, file_type=None) -> Path:
+    rng = np.random.default_rng(0)
+    writer = pyedflib.EdfWriter(
+        str(path), len(labels), file_type=file_type or pyedflib.FILETYPE_EDFPLUS
+    )
+    writer.setSignalHeaders(
+        [
+            {
+                "label": label,
+                "dimension": "uV",
+                "sample_frequency": fs,
+                "physical_max": 3000.5,
+                "physical_min": -2999.25,
+                "digital_max": 32767,
+                "digital_min": -32768,
+                "transducer": "",
+                "prefilter": "",
+            }
+            for label in labels
+        ]
+    )
+    writer.writeSamples([rng.standard_normal(fs * seconds) * 500 for _ in labels])
+    writer.close()
+    return path
+
+
+class TestReadEdf:
+    @pytest.mark.parametrize("file_type", ["FILETYPE_EDF", "FILETYPE_EDFPLUS"])
+    def test_matches_epilepsy2bids(self, tmp_path, file_type):
+        path = _write_edf(tmp_path / "rec.edf", TUSZ_LABELS, file_type=getattr(pyedflib, file_type))
+        expected = eeg_module.Eeg.loadEdf(str(path))
+
+        recording = read_edf(path)
+
+        np.testing.assert_array_equal(recording.data, expected.data)
+        assert recording.fs == expected.fs == 250
+        assert recording.channels == expected.channels
+        assert recording.channels[0] == "EEG FP1-REF"
+        assert recording.missing == []
+
+    def test_malformed_startdate_is_tolerated_in_place(self, tmp_path):
+        path = _write_edf(tmp_path / "rec.edf", TUSZ_LABELS)
+        expected = read_edf(path).data
+        raw = bytearray(path.read_bytes())
+        raw[DATE_OFFSET : DATE_OFFSET + 8] = b"01:01:85"
+        path.write_bytes(bytes(raw))
+        with pytest.raises(OSError, match="startdate"):
+            eeg_module.Eeg.loadEdf(str(path))
+
+        recording = read_edf(path)
+
+        assert recording.header.startdate == "01:01:85"
+        np.testing.assert_array_equal(recording.data, expected)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["rec.edf"]  # no repaired copy
+        eeg, method = load_with_fallback(path, native=True)
+        assert method == "native"
+        np.testing.assert_array_equal(eeg.data, expected)
+
+    def test_missing_electrode_is_zero_filled(self, tmp_path):
+        labels = [label for label in TUSZ_LABELS if "CZ" not in label]
+        recording = read_edf(_write_edf(tmp_path / "rec.edf", labels))
+        cz = EEG_19_CHANNELS.index("Cz")
+        assert recording.missing == ["Cz"]
+        assert recording.channels[cz] == "Cz"
+        assert not recording.data[cz].any()
+        assert recording.data.shape == (19, 1750)
+
+    def test_truncated_data_raises(self, tmp_path):
+        path = _write_edf(tmp_path / "rec.edf", TUSZ_LABELS)
+        header = read_edf_header(path)
+        path.write_bytes(path.read_bytes()[: -2 * header.record_samples])
+        with pytest.raises(ValueError, match="truncated"):
+            read_edf(path)
+
+
+def _break_startdate(path: Path, date: bytes = b"01:01:85") -> Path:
+    raw = bytearray(path.read_bytes())
+    raw[DATE_OFFSET : DATE_OFFSET + 8] = date
+    path.write_bytes(bytes(raw))
+    return path
+
+
+class TestInMemoryRepair:
+    def test_repaired_header(self):
+        header = b"0".ljust(DATE_OFFSET) + b"01:01:8500.00.00"
+        assert repaired_header(header) == b"0".ljust(DATE_OFFSET) + b"01.01.8500.00.00"
+        valid = b"0".ljust(DATE_OFFSET) + b"01.01.8512.34.56"
+        assert repaired_header(valid) == valid
+
+    def test_patched_view_overlays_header_only(self, tmp_path):
+        path = _write_edf(tmp_path / "rec.edf", TUSZ_LABELS)
+        broken = _break_startdate(path).read_bytes()
+        expected = bytearray(broken)
+        expected[DATE_OFFSET : DATE_OFFSET + 8] = b"01.01.85"
+
+        with open_repaired_edf(path) as view:
+            assert view.read() == expected
+            view.seek(DATE_OFFSET - 4)
+            assert view.read(16) == expected[DATE_OFFSET - 4 : DATE_OFFSET + 12]
+            assert view.seek(-10, 2) == len(expected) - 10
+            assert view.read() == expected[-10:]
+        assert path.read_bytes() == broken  # the file itself is untouched
+
+    def test_load_with_fallback_repairs_without_copy(self, tmp_path):
+        path = _write_edf(tmp_path / "rec.edf", TUSZ_LABELS)
+        expected = eeg_module.Eeg.loadEdf(str(path))
+        _break_startdate(path)
+        tmp_path.chmod(0o555)  # read-only directory: a repaired copy could not be written
+        try:
+            eeg, method = load_with_fallback(path)
+        finally:
+            tmp_path.chmod(0o755)
+
+        assert method == "native+repaired"
+        np.testing.assert_array_equal(eeg.data, expected.data)
+        assert eeg.fs == expected.fs
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["rec.edf"]
+
+    def test_unrepairable_header_raises(self, tmp_path):
+        path = _break_startdate(_write_edf(tmp_path / "rec.edf", TUSZ_LABELS), b"Jan 1 85")
+        with pytest.raises(ValueError, match="cannot be repaired"):
+            open_repaired_edf(path)
+
+
+class TestMatchChannels:
+    def test_labels_synonyms_and_absent(self):
+        labels = ["EEG FP1-LE", "Fz", "EEG T7-REF", "EEG 01-REF", "EDF Annotations"]
+        assert match_channels(labels, ("Fp1", "Fz", "T3", "O1", "Cz")) == [0, 1, 2, 3, None]
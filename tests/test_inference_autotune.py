@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch-size/thread autotuner.
+"""
+
+import json
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from seizure_evaluation.inference import autotune as autotune_module  # noqa: E402
+from seizure_evaluation.inference.autotune import (  # noqa: E402
+    TuneResult,
+    autotune,
+    calibrate,
+    model_measure,
+)
+
+GIB = 2**30
+
+
+class FakeHost:
+    """Throughput saturates at batch 64; RSS grows 1 GiB per 32 windows."""
+
+    def __init__(self):
+        self.calls: list[tuple[int, int]] = []
+
+    def __call__(self, batch_size, threads):
+        self.calls.append((batch_size, threads))
+        per_window = 0.1 / threads if batch_size < 64 else 0.05 / threads
+        seconds = 0.2 + batch_size * per_window
+        return seconds, GIB * (1 + batch_size // 32)
+
+
+class TestCalibrate:
+    def test_picks_fastest_config_under_budget(self):
+        host = FakeHost()
+        best = calibrate(
+            host, rss_budget_bytes=100 * GIB, batch_sizes=[8, 16, 32, 64, 128, 256], threads=[4, 2]
+        )
+        assert (best.batch_size, best.threads) == (256, 4)
+
+    def test_budget_caps_batch_size(self):
+        host = FakeHost()
+        best = calibrate(
+            host, rss_budget_bytes=int(2.5 * GIB), batch_sizes=[8, 16, 32, 64, 128], threads=[4]
+        )
+        assert best.batch_size == 32
+        # Stops at the first batch over budget; larger batches are never tried
+        assert (128, 4) not in host.calls
+
+    def test_stops_when_throughput_plateaus(self):
+        calls = []
+
+        def flat(batch_size, threads):
+            calls.append(batch_size)
+            return batch_size / 10.0, GIB  # constant 10 windows/s
+
+        best = calibrate(flat, 100 * GIB, batch_sizes=[8, 16, 32, 64, 128], threads=[1], patience=2)
+        assert best.batch_size == 8
+        assert calls == [8, 16, 32]
+
+    def test_nothing_fits(self):
+        with pytest.raises(RuntimeError, match="RSS budget"):
+            calibrate(FakeHost(), rss_budget_bytes=GIB // 2, batch_sizes=[8], threads=[1])
+
+
+class TestAutotuneCache:
+    def test_second_run_skips_calibration(self, tmp_path):
+        cache_file = tmp_path / "autotune.json"
+        host = FakeHost()
+        first = autotune(host, 100 * GIB, batch_sizes=[8, 64], threads=[2], cache_file=cache_file)
+        n_calls = len(host.calls)
+
+        second = autotune(host, 100 * GIB, batch_sizes=[8, 64], threads=[2], cache_file=cache_file)
+        assert second == first
+        assert len(host.calls) == n_calls
+        assert autotune_module.host_key() in json.loads(cache_file.read_text())
+
+    def test_cache_is_keyed_by_settings(self, tmp_path):
+        cache_file = tmp_path / "autotune.json"
+        host = FakeHost()
+        autotune(
+            host, 100 * GIB, variant="fp32", batch_sizes=[8], threads=[1], cache_file=cache_file
+        )
+        autotune(
+            host, 100 * GIB, variant="int8", batch_sizes=[8], threads=[1], cache_file=cache_file
+        )
+        assert len(host.calls) == 2
+
+
+class TestModelMeasure:
+    def test_times_real_forward_passes(self):
+        model = torch.nn.Conv1d(19, 1, 3)
+        best = calibrate(
+            model_measure(model, repeats=1, window_size=256),
+            rss_budget_bytes=1024 * GIB,
+            batch_sizes=[1, 2],
+            threads=[1],
+        )
+        assert isinstance(best, TuneResult)
+        assert best.windows_per_sec > 0
+        assert best.peak_rss_bytes > 0
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio micro-batcher.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference.batcher import MicroBatcher  # noqa: E402
+
+WINDOW = 64
+
+
+class RecordingMean(torch.nn.Module):
+    """Channel mean; remembers the batch size of every forward."""
+
+    def __init__(self, fail=False):
+        super().__init__()
+        self.batch_sizes = []
+        self.fail = fail
+
+    def forward(self, x):
+        if self.fail:
+            raise RuntimeError("forward failed")
+        self.batch_sizes.append(x.shape[0])
+        return x.mean(dim=1)
+
+
+def _windows(n, seed):
+    return np.random.default_rng(seed).standard_normal((n, 19, WINDOW)).astype(np.float32)
+
+
+class TestMicroBatcher:
+    def test_concurrent_requests_share_batches(self):
+        model = RecordingMean()
+        requests = [_windows(n, seed) for seed, n in enumerate([1, 2, 1, 3, 1])]
+
+        async def run():
+            async with MicroBatcher(model, max_batch=8, max_latency_ms=200) as batcher:
+                outputs = await asyncio.gather(*(batcher.submit(w) for w in requests))
+                return outputs, batcher.stats()
+
+        outputs, stats = asyncio.run(run())
+        for windows, output in zip(requests, outputs, strict=True):
+            np.testing.assert_allclose(output, windows.mean(axis=1), atol=1e-6)
+        assert model.batch_sizes == [8]
+        assert stats["fill_ratio"] == 1.0
+        assert stats["requests_served"] == 5
+        assert stats["queue_depth"] == 0
+        assert 0 < stats["latency_p50_ms"] <= stats["latency_p99_ms"]
+
+    def test_large_request_split_and_small_request_not_split(self):
+        model = RecordingMean()
+        big, small = _windows(10, 0), _windows(3, 1)
+
+        async def run():
+            async with MicroBatcher(model, max_batch=4, max_latency_ms=50) as batcher:
+                return await asyncio.gather(batcher.submit(big), batcher.submit(small))
+
+        out_big, out_small = asyncio.run(run())
+        np.testing.assert_allclose(out_big, big.mean(axis=1), atol=1e-6)
+        np.testing.assert_allclose(out_small, small.mean(axis=1), atol=1e-6)
+        assert max(model.batch_sizes) <= 4
+        assert sum(model.batch_sizes) == 13
+
+    def test_latency_budget_flushes_partial_batch(self):
+        model = RecordingMean()
+
+        async def run():
+            async with MicroBatcher(model, max_batch=512, max_latency_ms=10) as batcher:
+                return await asyncio.wait_for(batcher.submit(_windows(2, 0)), timeout=5)
+
+        assert asyncio.run(run()).shape == (2, WINDOW)
+        assert model.batch_sizes == [2]
+
+    def test_request_taken_at_latency_deadline_is_not_lost(self):
+        model = RecordingMean()
+
+        class SlowGetQueue(asyncio.Queue):
+            """Second get() has taken its request when the latency deadline passes."""
+
+            delays = [0.0, 0.1]
+
+            async def get(self):
+                request = await super().get()
+                await asyncio.sleep(self.delays.pop(0) if self.delays else 0.0)
+                return request
+
+        async def run():
+            async with MicroBatcher(model, max_batch=8, max_latency_ms=20) as batcher:
+                batcher._queue = SlowGetQueue()
+                first = asyncio.ensure_future(batcher.submit(_windows(1, 0)))
+                await asyncio.sleep(0.005)
+                second = await asyncio.wait_for(batcher.submit(_windows(2, 1)), timeout=5)
+                return await first, second, batcher.stats()
+
+        first, second, stats = asyncio.run(run())
+        np.testing.assert_allclose(first, _windows(1, 0).mean(axis=1), atol=1e-6)
+        np.testing.assert_allclose(second, _windows(2, 1).mean(axis=1), atol=1e-6)
+        assert model.batch_sizes == [1, 2]
+        assert stats["queue_depth"] == 0
+
+    def test_forward_errors_reach_callers(self):
+        async def run():
+            async with MicroBatcher(RecordingMean(fail=True), max_batch=4) as batcher:
+                await batcher.submit(_windows(2, 0))
+
+        with pytest.raises(RuntimeError, match="forward failed"):
+            asyncio.run(run())
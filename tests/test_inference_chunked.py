@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for bounded-memory chunked inference and chunked polyphase resampling.
+"""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference.chunked import (  # noqa: E402
+    chunked_predict_probabilities,
+    streaming_mean_std,
+)
+from seizure_evaluation.inference.dataset import (  # noqa: E402
+    WindowDataset,
+    collate_for,
+    get_dataloader,
+)
+from seizure_evaluation.inference.predict import predict_probabilities  # noqa: E402
+from seizure_evaluation.inference.resampling import ChunkedResampler  # noqa: E402
+
+WINDOW = 15360
+
+
+class ChannelMean(torch.nn.Module):
+    def forward(self, x):
+        return torch.sigmoid(x.mean(dim=1))
+
+
+def _recording(fs, seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((19, int(fs * seconds) + 37)) * 40 + 3
+
+
+class TestStreamingStats:
+    def test_matches_numpy(self):
+        data = _recording(256, 20)
+        mean, std = streaming_mean_std(data, chunk_samples=1000)
+        np.testing.assert_allclose(mean[:, 0], data.mean(axis=1), rtol=1e-12)
+        np.testing.assert_allclose(std[:, 0], data.std(axis=1), rtol=1e-12)
+
+
+class TestChunkedResampler:
+    @pytest.mark.parametrize("fs", [250, 400, 512])
+    def test_segments_match_whole_recording(self, fs):
+        data = _recording(fs, 40)
+        resampler = ChunkedResampler(fs)
+        full = resampler.resample(data)
+        assert full.dtype == np.float32
+        assert full.shape[1] == int(data.shape[1] * 256 / fs)
+        np.testing.assert_array_equal(resampler.resample(data, chunk_samples=3000), full)
+
+        def read(i0, i1):
+            return data[:, i0:i1]
+
+        n = full.shape[1]
+        for start, stop in [(0, 1000), (1000, 4321), (n - 2000, n), (5000, 5001)]:
+            segment = resampler.segment(read, data.shape[1], start, stop)
+            np.testing.assert_array_equal(segment, full[:, start:stop])
+
+
+class TestChunkedPredict:
+    @pytest.mark.parametrize("filter_mode", ["window", "recording"])
+    def test_matches_default_path_at_256_hz(self, filter_mode):
+        data = _recording(256, 200)
+        loader = get_dataloader(data, fs=256, batch_size=4, filter_mode=filter_mode)
+        expected = predict_probabilities(ChannelMean(), loader, "cpu", data.shape[1])
+
+        actual = chunked_predict_probabilities(
+            ChannelMean(), data, 256, "cpu", batch_size=1, filter_mode=filter_mode
+        )
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-6)
+
+    def test_resampled_matches_unchunked_polyphase(self, tmp_path):
+        fs = 400
+        data = _recording(fs, 200)
+        normalized = (data - data.mean(axis=1, keepdims=True)) / data.std(axis=1, keepdims=True)
+        dataset = WindowDataset(ChunkedResampler(fs).resample(normalized), window_size=WINDOW)
+        loader = torch.utils.data.DataLoader(dataset, batch_size=4, collate_fn=collate_for())
+        expected = predict_probabilities(ChannelMean(), loader, "cpu", data.shape[1])
+
+        out_path = tmp_path / "preds.npy"
+        actual = chunked_predict_probabilities(
+            ChannelMean(), data, fs, "cpu", batch_size=2, out_path=out_path
+        )
+        assert isinstance(actual, np.memmap)
+        np.testing.assert_allclose(actual, expected, rtol=1e-4, atol=1e-5)
+        np.testing.assert_array_equal(np.load(out_path), actual)
+
+    def test_rejects_unknown_filter_mode(self):
+        with pytest.raises(ValueError, match="filter_mode"):
+            chunked_predict_probabilities(
+                ChannelMean(), _recording(256, 1), 256, "cpu", filter_mode="x"
+            )
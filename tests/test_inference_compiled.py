@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled (frozen TorchScript) model artifact cache.
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference import compiled  # noqa: E402
+from seizure_evaluation.inference.compiled import (  # noqa: E402
+    artifact_path,
+    load_compiled,
+    weights_hash,
+)
+from seizure_evaluation.inference.optimize import (  # noqa: E402
+    optimize_for_inference,
+    to_batch_first,
+)
+
+
+@pytest.fixture(scope="module")
+def cache_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("compiled")
+
+
+class TestArtifactKey:
+    def test_key_changes_with_weights_and_batch_size(self, tmp_path, random_model):
+        a = random_model("cpu", seed=0)
+        b = random_model("cpu", seed=1)
+        assert weights_hash(a) == weights_hash(random_model("cpu", seed=0))
+        assert artifact_path(tmp_path, a, 4) != artifact_path(tmp_path, b, 4)
+        assert artifact_path(tmp_path, a, 4) != artifact_path(tmp_path, a, 8)
+        assert f"torch{torch.__version__}".replace("+", "_") in artifact_path(tmp_path, a, 4).name
+
+
+class TestLoadCompiled:
+    def test_export_matches_eager_and_is_reused(self, cache_dir, monkeypatch, random_model):
+        model = load_compiled("cpu", batch_size=2, cache_dir=cache_dir, loader=random_model)
+        path = artifact_path(cache_dir, random_model("cpu"), 2)
+        assert path.exists()
+        assert path.with_suffix(".json").exists()
+
+        x = torch.randn(3, 19, 15360)  # batch size other than the traced one
+        with torch.no_grad():
+            torch.testing.assert_close(model(x), random_model("cpu")(x), atol=1e-5, rtol=0)
+
+        # Second load hits the cache without re-exporting
+        def fail(*args, **kwargs):
+            raise AssertionError("re-exported despite cached artifact")
+
+        monkeypatch.setattr(compiled, "export_torchscript", fail)
+        cached = load_compiled("cpu", batch_size=2, cache_dir=cache_dir, loader=random_model)
+        with torch.no_grad():
+            torch.testing.assert_close(cached(x), model(x))
+
+    def test_variants_sharing_weights_get_distinct_artifacts(self, tmp_path, random_model):
+        def batch_first(device):
+            return to_batch_first(random_model(device))
+
+        stock = load_compiled("cpu", batch_size=1, cache_dir=tmp_path, loader=random_model)
+        first = load_compiled("cpu", batch_size=1, cache_dir=tmp_path, loader=batch_first)
+        assert weights_hash(batch_first("cpu")) == weights_hash(random_model("cpu"))
+        assert len(list(tmp_path.glob("*.pt"))) == 2
+        folded = optimize_for_inference(random_model("cpu"))
+        assert artifact_path(tmp_path, folded, 1) not in set(tmp_path.glob("*.pt"))
+
+        x = torch.randn(2, 19, 15360)
+        with torch.no_grad():
+            torch.testing.assert_close(first(x), stock(x), atol=1e-4, rtol=0)
+
+    def test_rejects_export_outside_tolerance(self, tmp_path, random_model):
+        with pytest.raises(RuntimeError, match="deviates from eager"):
+            load_compiled("cpu", batch_size=1, cache_dir=tmp_path, loader=random_model, atol=-1.0)
+        assert not list(tmp_path.glob("*.pt"))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for model loading at reduced precision.
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference import models  # noqa: E402
+from seizure_evaluation.inference.models import load_model  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def window():
+    torch.manual_seed(1)
+    return torch.randn(1, 19, 15360)
+
+
+class TestLoadModel:
+    def test_fp32_is_unchanged_eval_model(self, window, random_model):
+        model = load_model("cpu", "fp32", loader=random_model)
+        reference = random_model("cpu")
+        assert not model.training
+        with torch.no_grad():
+            torch.testing.assert_close(model(window), reference(window))
+
+    def test_int8_quantizes_linear_layers(self, window, random_model):
+        model = load_model("cpu", "int8", loader=random_model)
+        reference = random_model("cpu")
+
+        linear1 = model.transformer_encoder.layers[0].linear1
+        assert type(linear1).__module__.startswith("torch.ao.nn.quantized.dynamic")
+        assert isinstance(model.conv_d, torch.nn.Conv1d)
+        with torch.no_grad():
+            out = model(window)
+            ref = reference(window)
+        assert out.dtype == torch.float32
+        assert (out - ref).abs().max() < 0.05
+
+    def test_rejects_unknown_precision(self, random_model):
+        with pytest.raises(ValueError, match="precision"):
+            load_model("cpu", "fp8", loader=random_model)
+
+    def test_int8_rejects_batch_first(self, random_model):
+        with pytest.raises(ValueError, match="batch_first"):
+            load_model("cpu", "int8", loader=random_model, batch_first=True)
+
+    def test_int8_is_cpu_only(self, random_model):
+        with pytest.raises(ValueError, match="CPU-only"):
+            load_model("cuda", "int8", loader=random_model)
+
+
+class TestBf16:
+    @pytest.mark.parametrize("batch_first", [False, True])
+    def test_bf16_output_is_fp32_probabilities(
+        self, window, monkeypatch, batch_first, random_model
+    ):
+        monkeypatch.setattr(models, "cpu_has_native_bf16", lambda: True)
+        model = load_model("cpu", "bf16", loader=random_model, batch_first=batch_first)
+        reference = random_model("cpu")
+
+        assert isinstance(model, models.Bf16AutocastModel)
+        with torch.no_grad():
+            out = model(window)
+            ref = reference(window)
+        assert out.dtype == torch.float32
+        assert out.shape == ref.shape
+        assert (out - ref).abs().max() < 0.05
+
+    def test_falls_back_to_fp32_without_native_bf16(self, monkeypatch, random_model):
+        monkeypatch.setattr(models, "cpu_has_native_bf16", lambda: False)
+        with pytest.warns(UserWarning, match="falling back to fp32"):
+            model = load_model("cpu", "bf16", loader=random_model)
+        assert not isinstance(model, models.Bf16AutocastModel)
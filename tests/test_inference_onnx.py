@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the ONNX export and onnxruntime backend.
+"""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from seizure_evaluation.inference.dataset import collate_for, get_dataloader  # noqa: E402
+from seizure_evaluation.inference.onnx_backend import (  # noqa: E402
+    OnnxRuntimeModel,
+    load_onnxruntime,
+)
+from seizure_evaluation.inference.optimize import to_batch_first  # noqa: E402
+from seizure_evaluation.inference.packing import RecordingPacker  # noqa: E402
+from seizure_evaluation.inference.predict import predict_probabilities  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def onnx_model(tmp_path_factory, random_model):
+    cache_dir = tmp_path_factory.mktemp("onnx")
+    return load_onnxruntime("cpu", cache_dir=cache_dir, loader=random_model, intra_op_threads=2)
+
+
+class TestOnnxRuntimeBackend:
+    def test_export_is_cached_and_matches_eager(self, onnx_model, random_model):
+        assert onnx_model.onnx_path.exists()
+        assert onnx_model.onnx_path.with_suffix(".json").exists()
+
+        x = torch.randn(1, 19, 15360)
+        with torch.no_grad():
+            expected = random_model("cpu")(x).numpy()
+        np.testing.assert_allclose(onnx_model(x), expected, atol=1e-4, rtol=0)
+
+        reloaded = load_onnxruntime("cpu", onnx_path=onnx_model.onnx_path)
+        assert isinstance(reloaded, OnnxRuntimeModel)
+        np.testing.assert_array_equal(reloaded(x), onnx_model(x))
+
+    def test_variants_sharing_weights_get_distinct_exports(self, onnx_model, random_model):
+        def batch_first(device):
+            return to_batch_first(random_model(device))
+
+        cache_dir = onnx_model.onnx_path.parent
+        variant = load_onnxruntime("cpu", cache_dir=cache_dir, loader=batch_first)
+        assert variant.onnx_path != onnx_model.onnx_path
+        assert len(list(cache_dir.glob("*.onnx"))) == 2
+
+        x = torch.randn(1, 19, 15360)
+        np.testing.assert_allclose(variant(x), onnx_model(x), atol=1e-4, rtol=0)
+
+    def test_drop_in_for_predict_and_packer(self, onnx_model):
+        rng = np.random.default_rng(0)
+        data = rng.standard_normal((19, 15360 + 100)).astype(np.float32)
+        dataloader = get_dataloader(data, fs=256, batch_size=2)
+        via_predict = predict_probabilities(onnx_model, dataloader, "cpu", data.shape[1])
+
+        packer = RecordingPacker(onnx_model, "cpu", collate_for("window"), batch_size=4)
+        completed = packer.add("a", dataloader.dataset, data.shape[1]) + packer.flush()
+        [(file_id, via_packer)] = completed
+        assert file_id == "a"
+        assert via_predict.shape == (data.shape[1],)
+        np.testing.assert_allclose(via_packer, via_predict, atol=1e-6)
+
+    def test_cpu_only(self):
+        with pytest.raises(ValueError, match="CPU-only"):
+            load_onnxruntime("cuda", onnx_path="unused.onnx")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Parity tests for inference-time BatchNorm folding.
+"""
+
+from pathlib import Path
+
+import pytest
+
+torch = pytest.importorskip("torch")
+wu_utils = pytest.importorskip("wu_2025.utils")
+
+from wu_2025.architecture import ResCNNBlock, SeizureTransformer  # noqa: E402
+
+from seizure_evaluation.inference.optimize import (  # noqa: E402
+    BatchFirstSeizureTransformer,
+    FoldedResCNNBlock,
+    optimize_for_inference,
+    to_batch_first,
+)
+
+STOCK_WEIGHTS = Path(wu_utils.__file__).parent / "model.pth"
+
+
+def _model_with_bn_stats(seed=0):
+    """Random model whose BatchNorms are not identities (fresh BN stats are 0/1)."""
+    torch.manual_seed(seed)
+    model = SeizureTransformer()
+    for module in model.modules():
+        if isinstance(module, torch.nn.BatchNorm1d):
+            module.running_mean.uniform_(-0.5, 0.5)
+            module.running_var.uniform_(0.5, 2.0)
+            module.weight.data.uniform_(0.5, 1.5)
+            module.bias.data.uniform_(-0.2, 0.2)
+    return model.eval()
+
+
+def _assert_parity(model, x):
+    optimized = optimize_for_inference(model)
+    with torch.no_grad():
+        expected = model(x)
+        actual = optimized(x)
+    torch.testing.assert_close(actual, expected, atol=1e-5, rtol=0)
+
+
+class TestOptimizeForInference:
+    def test_blocks_are_folded_and_original_untouched(self):
+        model = _model_with_bn_stats()
+        optimized = optimize_for_inference(model)
+
+        assert all(isinstance(m, FoldedResCNNBlock) for m in optimized.res_cnn_stack.members)
+        assert all(isinstance(m, ResCNNBlock) for m in model.res_cnn_stack.members)
+        assert not any(isinstance(m, torch.nn.Dropout2d) for m in optimized.res_cnn_stack.modules())
+
+    def test_folded_block_matches_block(self):
+        model = _model_with_bn_stats()
+        for block in model.res_cnn_stack.members:  # covers ker=3 and ker=2 (manual padding)
+            x = torch.randn(2, 512, 47)
+            with torch.no_grad():
+                torch.testing.assert_close(FoldedResCNNBlock(block)(x), block(x), atol=1e-5, rtol=0)
+
+    def test_model_parity_random_weights(self):
+        _assert_parity(_model_with_bn_stats(), torch.randn(2, 19, 15360))
+
+    @pytest.mark.skipif(not STOCK_WEIGHTS.exists(), reason="wu_2025 model.pth not available")
+    def test_model_parity_stock_weights(self):
+        torch.manual_seed(0)
+        _assert_parity(wu_utils.load_models("cpu").eval(), torch.randn(2, 19, 15360))
+
+
+class TestBatchFirst:
+    def test_loads_wu_state_dict_and_matches(self):
+        model = _model_with_bn_stats()
+        fast = BatchFirstSeizureTransformer().eval()
+        fast.load_state_dict(model.state_dict())  # same parameter names as model.pth
+        assert fast.transformer_encoder.layers[0].self_attn.batch_first
+
+        x = torch.randn(2, 19, 15360)
+        with torch.no_grad():
+            torch.testing.assert_close(fast(x), model(x), atol=1e-5, rtol=0)
+
+    def test_from_folded_model(self):
+        model = _model_with_bn_stats()
+        fast = to_batch_first(optimize_for_inference(model))
+        assert all(isinstance(m, FoldedResCNNBlock) for m in fast.res_cnn_stack.members)
+
+        x = torch.randn(1, 19, 15360)
+        with torch.no_grad():
+            torch.testing.assert_close(fast(x), model(x), atol=1e-5, rtol=0)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for cross-recording batch packing.
+"""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference.dataset import WindowDataset, collate_for  # noqa: E402
+from seizure_evaluation.inference.packing import RecordingPacker  # noqa: E402
+
+WINDOW = 64
+
+
+class ChannelMean(torch.nn.Module):
+    """Stand-in model: per-sample mean over channels, (B, C, T) -> (B, T)."""
+
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes: list[int] = []
+
+    def forward(self, x):
+        self.batch_sizes.append(x.shape[0])
+        return x.mean(dim=1)
+
+
+def _recording(seed: int, n_samples: int) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((3, n_samples))
+
+
+def _packer(model, batch_size):
+    return RecordingPacker(model, "cpu", collate=collate_for("recording"), batch_size=batch_size)
+
+
+class TestRecordingPacker:
+    def test_scatter_matches_per_file_outputs(self):
+        """Packed outputs per file equal running each file on its own."""
+        model = ChannelMean()
+        packer = _packer(model, batch_size=4)
+        lengths = {"a": 3 * WINDOW + 5, "b": WINDOW - 10, "c": 5 * WINDOW}
+        recordings = {fid: _recording(i, n) for i, (fid, n) in enumerate(lengths.items())}
+
+        completed = []
+        for fid, data in recordings.items():
+            completed += packer.add(fid, WindowDataset(data, window_size=WINDOW), data.shape[1])
+        completed += packer.flush()
+
+        assert [fid for fid, _ in completed] == ["a", "b", "c"]
+        for fid, preds in completed:
+            data = recordings[fid]
+            assert preds.dtype == np.float32
+            assert preds.shape == (data.shape[1],)
+            np.testing.assert_allclose(preds, data.mean(axis=0), rtol=1e-5, atol=1e-6)
+        assert packer.pending_files == []
+
+    def test_batches_are_full_until_flush(self):
+        model = ChannelMean()
+        packer = _packer(model, batch_size=4)
+        for i in range(5):  # 2 windows per file -> 10 windows
+            packer.add(f"f{i}", WindowDataset(_recording(i, 2 * WINDOW), window_size=WINDOW), 10)
+        assert model.batch_sizes == [4, 4]
+        assert packer.pending_files == ["f4"]
+
+        packer.flush()
+        assert model.batch_sizes == [4, 4, 2]
+        assert packer.windows_run == 10
+        # Model time is attributed to every completed recording and sums to the total
+        assert sorted(packer.inference_sec) == [f"f{i}" for i in range(5)]
+        assert sum(packer.inference_sec.values()) == pytest.approx(packer.seconds_run)
+
+    def test_rejects_duplicate_file_id(self):
+        packer = _packer(ChannelMean(), batch_size=8)
+        dataset = WindowDataset(_recording(0, WINDOW), window_size=WINDOW)
+        packer.add("a", dataset, WINDOW)
+        with pytest.raises(ValueError, match="Duplicate"):
+            packer.add("a", dataset, WINDOW)
+
+    def test_drop_pending_after_failure(self):
+        class Boom(torch.nn.Module):
+            def forward(self, x):
+                raise RuntimeError("boom")
+
+        packer = _packer(Boom(), batch_size=8)
+        packer.add("a", WindowDataset(_recording(0, WINDOW), window_size=WINDOW), WINDOW)
+        with pytest.raises(RuntimeError):
+            packer.flush()
+        assert packer.drop_pending() == ["a"]
+        assert packer.flush() == []
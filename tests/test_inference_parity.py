@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the checkpoint parity report.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference.parity import compare_results  # noqa: E402
+
+
+def _results(preds: dict[str, np.ndarray]) -> dict:
+    return {
+        fid: {"predictions": p, "seizure_events": [(1.0, 2.0)], "error": None}
+        for fid, p in preds.items()
+    }
+
+
+class TestCompareResults:
+    def test_identical_runs(self):
+        rng = np.random.default_rng(0)
+        preds = {"a": rng.random(1024), "b": rng.random(768)}
+        report = compare_results(_results(preds), _results(preds))
+
+        assert report["files_compared"] == 2
+        assert report["max_abs_dev"] == 0.0
+        assert report["auroc_delta"] == 0.0
+        assert report["decision_flip_fraction"] == 0.0
+        assert all(v == 0 for v in report["overlap"]["delta"].values())
+
+    def test_drift_and_missing_files(self):
+        base = {"a": np.full(2560, 0.9), "b": np.zeros(2560)}
+        cand = {"a": np.full(2560, 0.7), "c": np.zeros(2560)}
+        report = compare_results(_results(base), _results(cand))
+
+        assert report["files_compared"] == 1
+        assert report["files_only_in_baseline"] == ["b"]
+        assert report["files_only_in_candidate"] == ["c"]
+        assert report["max_abs_dev"] == pytest.approx(0.2)
+        assert report["decision_flip_fraction"] == 1.0
+        # Baseline fires one event over the whole file (hit); candidate never fires
+        assert report["overlap"]["baseline"]["hits"] == 1
+        assert report["overlap"]["candidate"]["misses"] == 1
+        assert report["overlap"]["delta"]["sensitivity"] == -100.0
+
+    def test_failed_files_are_skipped(self):
+        base = _results({"a": np.zeros(10)})
+        cand = {"a": {"predictions": None, "seizure_events": [], "error": "boom"}}
+        report = compare_results(base, cand)
+        assert report["files_compared"] == 0
+        assert "max_abs_dev" not in report
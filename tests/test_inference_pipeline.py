@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the prefetching decode/preprocess pipeline.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference.dataset import get_dataloader  # noqa: E402
+from seizure_evaluation.inference.pipeline import (  # noqa: E402
+    RecordingPrefetcher,
+    prepare_recording,
+)
+
+
+def _loader(edf_path: Path):
+    """Module-level (picklable) stand-in for tusz.cli.load_recording."""
+    if edf_path.stem == "bad":
+        raise ValueError("Wrong channels: 20")
+    n_samples = 15360 + 1000 * int(edf_path.stem[-1])
+    rng = np.random.default_rng(int(edf_path.stem[-1]))
+    return rng.standard_normal((19, n_samples)), 256, "pyedflib"
+
+
+class TestPrepareRecording:
+    @pytest.mark.parametrize("filter_mode", ["window", "recording"])
+    def test_matches_dataloader_batches(self, filter_mode):
+        rec = prepare_recording(0, Path("rec3.edf"), _loader, filter_mode=filter_mode)
+        data, fs, _ = _loader(Path("rec3.edf"))
+        expected = np.concatenate(
+            [b.numpy() for b in get_dataloader(data, fs, filter_mode=filter_mode)]
+        )
+
+        assert rec.error is None
+        assert rec.seq_len == data.shape[1]
+        assert rec.file_id == "rec3"
+        np.testing.assert_allclose(rec.windows.windows, expected, atol=1e-5)
+
+    def test_errors_are_captured(self):
+        rec = prepare_recording(5, Path("bad.edf"), _loader)
+        assert rec.windows is None
+        assert rec.error == "Wrong channels: 20"
+
+
+class TestRecordingPrefetcher:
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_yields_in_submission_order(self, workers):
+        jobs = [(i, Path(name)) for i, name in enumerate(["rec1.edf", "bad.edf", "rec2.edf"])]
+        prefetcher = RecordingPrefetcher(jobs, _loader, workers=workers, prefetch_depth=2)
+
+        prepared = list(prefetcher)
+
+        assert [r.idx for r in prepared] == [0, 1, 2]
+        assert [r.error is None for r in prepared] == [True, False, True]
+        assert prepared[2].seq_len == 15360 + 2000
+
+    def test_rejects_zero_depth(self):
+        with pytest.raises(ValueError, match="prefetch_depth"):
+            RecordingPrefetcher([], _loader, prefetch_depth=0)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for preallocated-buffer prediction against wu_2025.utils.predict.
+"""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+wu_utils = pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference.dataset import get_dataloader  # noqa: E402
+from seizure_evaluation.inference.predict import predict, predict_probabilities  # noqa: E402
+
+
+class ChannelMean(torch.nn.Module):
+    def forward(self, x):
+        return torch.sigmoid(4 * x.mean(dim=1))
+
+
+@pytest.fixture
+def recording():
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((19, 15360 * 3 + 500)) * 30
+    data[:, 20000:26000] += 200 * np.sin(np.linspace(0, 600, 6000))
+    return data
+
+
+class TestPredictProbabilities:
+    def test_matches_concatenated_outputs(self, recording):
+        model = ChannelMean()
+        seq_len = recording.shape[1]
+        loader = get_dataloader(recording, 256, batch_size=2)
+
+        preds = predict_probabilities(model, loader, "cpu", seq_len)
+
+        expected = torch.cat([model(b) for b in loader]).flatten()[:seq_len].numpy()
+        assert preds.dtype == np.float32
+        assert preds.shape == (seq_len,)
+        np.testing.assert_array_equal(preds, expected)
+
+    def test_memmap_output(self, recording, tmp_path):
+        out_path = tmp_path / "preds.npy"
+        loader = get_dataloader(recording, 256, batch_size=3)
+        preds = predict_probabilities(ChannelMean(), loader, "cpu", 1000, out_path=out_path)
+
+        assert isinstance(preds, np.memmap)
+        on_disk = np.load(out_path, mmap_mode="r")
+        assert on_disk.shape == (4 * 15360,)
+        np.testing.assert_array_equal(on_disk[:1000], preds)
+
+
+class TestPredict:
+    def test_matches_wu_predict(self, recording):
+        class Blocks(torch.nn.Module):
+            """Confident 4 s event early in every window, plus a 1 s blip."""
+
+            def forward(self, x):
+                out = torch.full((x.shape[0], x.shape[2]), 0.1) + 0 * x.mean(dim=1)
+                out[:, 1000:2024] = 0.95
+                out[:, 5000:5256] = 0.95
+                return out
+
+        model = Blocks()
+        seq_len = recording.shape[1]
+        expected = wu_utils.predict(
+            model, wu_utils.get_dataloader(recording, 256, batch_size=2), "cpu", seq_len
+        )
+        actual = predict(model, get_dataloader(recording, 256, batch_size=2), "cpu", seq_len)
+        np.testing.assert_array_equal(actual, expected)
+        assert actual.any()
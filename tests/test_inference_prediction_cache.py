@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed prediction cache.
+"""
+
+import os
+
+import numpy as np
+
+from seizure_evaluation.inference import prediction_cache as pc
+from seizure_evaluation.inference.prediction_cache import PredictionCache
+
+
+def _write(path, content, mtime_ns):
+    path.write_bytes(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestFileDigest:
+    def test_size_and_mtime_fast_path(self, tmp_path, monkeypatch):
+        edf = tmp_path / "a.edf"
+        _write(edf, b"header+data", 1_000_000_000)
+        cache = PredictionCache(tmp_path / "cache")
+        digest = cache.file_digest(edf)
+
+        calls = []
+        real = pc.sha256_file
+        monkeypatch.setattr(pc, "sha256_file", lambda p: calls.append(p) or real(p))
+        # Unchanged file: reused, also by a new cache instance (persisted index)
+        assert PredictionCache(tmp_path / "cache").file_digest(edf) == digest
+        assert calls == []
+
+        # Same size, new mtime and content: rehashed
+        _write(edf, b"HEADER+data", 2_000_000_000)
+        assert cache.file_digest(edf) != digest
+        assert len(calls) == 1
+
+    def test_key_depends_on_every_part(self, tmp_path):
+        cache = PredictionCache(tmp_path)
+        base = cache.key("edf", "model", {"filter_mode": "window"})
+        assert base == cache.key("edf", "model", {"filter_mode": "window"})
+        assert base != cache.key("edf2", "model", {"filter_mode": "window"})
+        assert base != cache.key("edf", "model2", {"filter_mode": "window"})
+        assert base != cache.key("edf", "model", {"filter_mode": "recording"})
+
+
+class TestPredictionCache:
+    def test_round_trip_and_stats(self, tmp_path):
+        cache = PredictionCache(tmp_path)
+        predictions = np.linspace(0, 1, 1000, dtype=np.float32)
+        assert cache.get("ab" * 32) is None
+        cache.put("ab" * 32, predictions, {"load_method": "pyedflib"})
+
+        cached, meta = cache.get("ab" * 32)
+        np.testing.assert_array_equal(cached, predictions)
+        assert meta == {"load_method": "pyedflib"}
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+        assert stats["size_bytes"] > 4000
+
+    def test_lru_eviction_under_budget(self, tmp_path):
+        entry = 4000 + 128  # float32 payload + .npy header
+        cache = PredictionCache(tmp_path, max_bytes=2 * entry)
+        keys = [f"{i:02d}" * 32 for i in range(3)]
+        for i, key in enumerate(keys[:2]):
+            cache.put(key, np.zeros(1000, dtype=np.float32), {})
+            os.utime(cache._path(key), (i, i))
+        cache.get(keys[0])  # keys[0] becomes most recently used
+
+        cache.put(keys[2], np.zeros(1000, dtype=np.float32), {})
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[2]) is not None
+        assert cache.stats()["evictions"] == 1
+        assert not cache._path(keys[1]).with_suffix(".json").exists()
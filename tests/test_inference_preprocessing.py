@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the batched SOS preprocessing path against wu_2025.
+"""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+wu_utils = pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference.dataset import WindowDataset, get_dataloader  # noqa: E402
+from seizure_evaluation.inference.preprocessing import (  # noqa: E402
+    design_preprocessing_sos,
+    preprocess_windows,
+)
+
+
+def _reference_windows(data: np.ndarray, window_size: int = 15360) -> np.ndarray:
+    dataset = wu_utils.SeizureDataset(data, fs=256, window_size=window_size)
+    return np.stack([dataset[i].numpy() for i in range(len(dataset))])
+
+
+class TestDesignSos:
+    def test_cascade_shape(self):
+        """Bandpass (order 3 -> 3 sections) plus two notch sections."""
+        sos = design_preprocessing_sos(256)
+        assert sos.shape == (5, 6)
+        assert sos.dtype == np.float32
+
+    def test_cached_per_fs(self):
+        assert design_preprocessing_sos(256) is design_preprocessing_sos(256)
+
+
+class TestPreprocessWindows:
+    def test_matches_per_window_lfilter(self):
+        """One sosfilt call over a batch equals Wu's three lfilter calls per window."""
+        rng = np.random.default_rng(0)
+        windows = rng.standard_normal((3, 19, 15360))
+        dataset = wu_utils.SeizureDataset(np.zeros((19, 15360)), fs=256)
+        expected = np.stack([dataset.preprocess_clip(w) for w in windows])
+
+        actual = preprocess_windows(windows)
+
+        assert actual.dtype == np.float32
+        assert actual.shape == windows.shape
+        np.testing.assert_allclose(actual, expected, atol=2e-3)
+
+
+class TestGetDataloader:
+    @pytest.mark.parametrize("fs,n_samples", [(256, 15360 * 2 + 1000), (250, 30000)])
+    def test_batches_match_wu_dataloader(self, fs, n_samples):
+        """Batches (including the zero-padded tail window) match wu_2025."""
+        rng = np.random.default_rng(1)
+        data = rng.standard_normal((19, n_samples)) * 50.0
+
+        expected = np.concatenate([b.numpy() for b in wu_utils.get_dataloader(data, fs, 2)])
+        actual = np.concatenate([b.numpy() for b in get_dataloader(data, fs, batch_size=2)])
+
+        assert actual.dtype == np.float32
+        assert actual.shape == expected.shape
+        np.testing.assert_allclose(actual, expected, atol=2e-3)
+
+    def test_recording_filter_mode(self):
+        """Whole-recording filtering matches window mode on the first window only."""
+        rng = np.random.default_rng(2)
+        data = rng.standard_normal((19, 15360 * 3)) * 50.0
+
+        window = np.concatenate([b.numpy() for b in get_dataloader(data, 256, batch_size=4)])
+        recording = np.concatenate(
+            [b.numpy() for b in get_dataloader(data, 256, batch_size=4, filter_mode="recording")]
+        )
+
+        assert recording.shape == window.shape
+        assert recording.dtype == np.float32
+        np.testing.assert_allclose(recording[0], window[0], atol=1e-5)
+        assert not np.allclose(recording[1], window[1], atol=1e-3)
+
+    def test_rejects_unknown_filter_mode(self):
+        with pytest.raises(ValueError, match="filter_mode"):
+            get_dataloader(np.ones((19, 15360)), 256, filter_mode="bogus")
+
+
+class TestWindowDataset:
+    @pytest.mark.parametrize("n_samples", [1000, 15360, 15360 * 3, 15360 * 3 + 17])
+    @pytest.mark.parametrize("overlap_ratio", [0.0, 0.5, 0.3])
+    def test_matches_wu_windowing(self, n_samples, overlap_ratio):
+        """Same window count, start offsets and zero-padded tail as wu_2025."""
+        rng = np.random.default_rng(3)
+        data = rng.standard_normal((19, n_samples))
+        ref = wu_utils.SeizureDataset(data, fs=256, overlap_ratio=overlap_ratio)
+        ref.preprocess_clip = lambda clip: clip  # compare raw windows only
+        ds = WindowDataset(data, overlap_ratio=overlap_ratio)
+
+        assert len(ds) == len(ref)
+        for i in range(len(ds)):
+            np.testing.assert_allclose(ds[i].numpy(), ref[i].numpy(), rtol=1e-6)
+
+    def test_windows_are_views_of_one_buffer(self):
+        ds = WindowDataset(np.ones((19, 15360 * 2 + 5)), overlap_ratio=0.5)
+        assert ds.buffer.dtype == np.float32
+        assert ds.buffer.shape[1] % ds.window_size == 0
+        for i in range(len(ds)):
+            window = ds[i]
+            assert window.dtype == torch.float32
+            assert np.shares_memory(window.numpy(), ds.buffer)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for cached polyphase filter banks and the polyphase resampling option.
+"""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference.dataset import (  # noqa: E402
+    build_dataset,
+    normalize_and_resample,
+)
+from seizure_evaluation.inference.resampling import ChunkedResampler, filter_bank  # noqa: E402
+
+
+def _bandlimited(fs, seconds=30, seed=0):
+    """Sum of sinusoids well below 128 Hz, where FFT and polyphase should agree."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(fs * seconds)) / fs
+    freqs = rng.uniform(0.5, 40.0, size=(19, 4, 1))
+    phases = rng.uniform(0, 2 * np.pi, size=(19, 4, 1))
+    return 50.0 * np.sin(2 * np.pi * freqs * t + phases).sum(axis=1) + 7.0
+
+
+class TestFilterBank:
+    def test_cached_float32_read_only(self):
+        up, down, taps = filter_bank(250)
+        assert (up, down) == (128, 125)
+        assert taps.dtype == np.float32
+        assert not taps.flags.writeable
+        assert filter_bank(250)[2] is taps
+        assert ChunkedResampler(250).taps is taps
+
+    def test_identity(self):
+        assert filter_bank(256) == (1, 1, None)
+
+
+class TestPolyphaseMethod:
+    @pytest.mark.parametrize("fs", [250, 400, 512])
+    def test_close_to_fft_away_from_edges(self, fs):
+        data = _bandlimited(fs)
+        fft = normalize_and_resample(data, fs, method="fft")
+        poly = normalize_and_resample(data, fs, method="polyphase")
+        assert poly.dtype == np.float32
+        assert poly.shape == fft.shape
+        edge = 256  # both methods treat the recording boundaries differently
+        np.testing.assert_allclose(poly[:, edge:-edge], fft[:, edge:-edge], atol=1e-2)
+
+    def test_identity_at_256_hz(self):
+        data = _bandlimited(256)
+        np.testing.assert_allclose(
+            normalize_and_resample(data, 256, method="polyphase"),
+            normalize_and_resample(data, 256),
+            rtol=1e-5,
+            atol=1e-6,
+        )
+
+    def test_unknown_method_rejected(self):
+        with pytest.raises(ValueError, match="resample method"):
+            build_dataset(_bandlimited(256, seconds=2), 256, resample_method="linear")
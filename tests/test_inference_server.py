@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the warm inference server and its thin client.
+"""
+
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference.client import InferenceClient  # noqa: E402
+from seizure_evaluation.inference.dataset import get_dataloader  # noqa: E402
+from seizure_evaluation.inference.predict import predict_probabilities  # noqa: E402
+from seizure_evaluation.inference.server import InferenceService, make_server  # noqa: E402
+from seizure_evaluation.ovlp.post_processing import (  # noqa: E402
+    apply_seizure_transformer_postprocessing,
+)
+
+
+class ChannelMean(torch.nn.Module):
+    def forward(self, x):
+        return torch.sigmoid(4 * x.mean(dim=1))
+
+
+def _recording(n=15360 * 2 + 500, seed=0):
+    return np.random.default_rng(seed).standard_normal((19, n))
+
+
+def _fake_loader(edf_path):
+    if not edf_path.name.endswith(".edf"):
+        raise FileNotFoundError(edf_path)
+    return _recording(seed=1), 256, "pyedflib"
+
+
+@pytest.fixture(params=["unix", "tcp"])
+def client(request, tmp_path):
+    service = InferenceService(ChannelMean(), batch_size=2, recording_loader=_fake_loader)
+    if request.param == "unix":
+        server = make_server(service, socket_path=tmp_path / "s.sock")
+        client = InferenceClient(tmp_path / "s.sock", timeout=30)
+    else:
+        server = make_server(service, port=0)
+        client = InferenceClient(port=server.server_address[1], timeout=30)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield client
+    server.shutdown()
+    server.server_close()
+
+
+def _expected(data, fs=256):
+    loader = get_dataloader(data, fs=fs, batch_size=2)
+    return predict_probabilities(ChannelMean(), loader, "cpu", data.shape[1])
+
+
+class TestServer:
+    def test_array_probabilities_match_local_prediction(self, client):
+        data = _recording()
+        actual = client.predict_array(data, fs=256)
+        assert actual.dtype == np.float32
+        np.testing.assert_array_equal(actual, _expected(data))
+
+    def test_edf_events(self, client, tmp_path):
+        result = client.predict_edf(tmp_path / "rec.edf", output="events", threshold=0.6)
+        expected = _expected(_recording(seed=1))
+        events = apply_seizure_transformer_postprocessing(expected, threshold=0.6)
+        assert result["events"] == [list(e) for e in events]
+        assert result["n_samples"] == expected.size
+        assert result["load_method"] == "pyedflib"
+
+    def test_errors_are_reported(self, client, tmp_path):
+        with pytest.raises(RuntimeError, match="400.*shape"):
+            client.predict_array(np.zeros((3, 100)), fs=256)
+        with pytest.raises(RuntimeError, match="400"):
+            client.predict_edf(tmp_path / "missing.txt")
+        assert client.health()["requests"] == 0
+
+
+def test_micro_batched_service_matches_serial():
+    data = [_recording(seed=s) for s in range(3)]
+    service = InferenceService(ChannelMean(), batch_size=8, max_latency_ms=50)
+    try:
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            outputs = list(pool.map(lambda d: service.predict_array(d, 256), data))
+        stats = service.status()["batcher"]
+    finally:
+        service.close()
+    for d, output in zip(data, outputs, strict=True):
+        np.testing.assert_allclose(output, _expected(d), rtol=1e-6)
+    assert stats["windows_run"] == 9
+    assert stats["requests_served"] == 3
+
+
+class TestUnixSocketPath:
+    def test_stale_socket_is_replaced(self, tmp_path):
+        path = tmp_path / "s.sock"
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()  # leaves the socket file behind
+
+        server = make_server(InferenceService(ChannelMean()), socket_path=path)
+        server.server_close()
+
+    def test_regular_file_is_left_alone(self, tmp_path):
+        path = tmp_path / "predictions.npy"
+        path.write_bytes(b"not a socket")
+
+        with pytest.raises(FileExistsError, match="not a socket"):
+            make_server(InferenceService(ChannelMean()), socket_path=path)
+        assert path.read_bytes() == b"not a socket"
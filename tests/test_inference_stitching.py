@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for overlap-add stitching of window outputs.
+"""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference.dataset import (  # noqa: E402
+    WindowDataset,
+    build_dataset,
+    collate_for,
+    materialize_windows,
+)
+from seizure_evaluation.inference.packing import RecordingPacker  # noqa: E402
+from seizure_evaluation.inference.predict import predict_probabilities  # noqa: E402
+from seizure_evaluation.inference.stitching import overlap_add, stitch_weights  # noqa: E402
+
+WINDOW = 64
+
+
+class ChannelMean(torch.nn.Module):
+    """Stand-in model: per-sample mean over channels, (B, C, T) -> (B, T)."""
+
+    def forward(self, x):
+        return x.mean(dim=1)
+
+
+def _naive_overlap_add(outputs, starts, seq_len, weights):
+    num = np.zeros(seq_len + outputs.shape[1])
+    den = np.zeros_like(num)
+    for row, start in zip(outputs, starts, strict=True):
+        num[start : start + len(row)] += row * weights
+        den[start : start + len(row)] += weights
+    return num[:seq_len] / den[:seq_len]
+
+
+class TestOverlapAdd:
+    def test_contiguous_is_plain_concatenation(self):
+        outputs = np.random.default_rng(0).random((3, WINDOW), dtype=np.float32)
+        stitched = overlap_add(outputs, np.arange(3) * WINDOW, 150)
+        np.testing.assert_array_equal(stitched, outputs.reshape(-1)[:150])
+
+    @pytest.mark.parametrize("kind", ["hann", "mean"])
+    def test_matches_per_window_loop(self, kind):
+        outputs = np.random.default_rng(1).random((5, WINDOW), dtype=np.float32)
+        starts = np.arange(5) * (WINDOW // 2)
+        seq_len = 150
+        expected = _naive_overlap_add(outputs, starts, seq_len, stitch_weights(WINDOW, kind))
+
+        stitched = overlap_add(outputs, starts, seq_len, kind=kind)
+        assert stitched.dtype == np.float32
+        assert stitched.shape == (seq_len,)
+        np.testing.assert_allclose(stitched, expected, rtol=1e-6)
+
+    def test_consistent_windows_reconstruct_timeline(self):
+        timeline = np.random.default_rng(2).random(200)
+        starts = np.arange(0, 200 - WINDOW + 1, 48)
+        outputs = np.stack([timeline[s : s + WINDOW] for s in starts])
+        stitched = overlap_add(outputs, starts, starts[-1] + WINDOW)
+        np.testing.assert_allclose(stitched, timeline[: starts[-1] + WINDOW], rtol=1e-6)
+
+    def test_rejects_unknown_weights(self):
+        with pytest.raises(ValueError, match="stitch"):
+            stitch_weights(WINDOW, "triangle")
+
+
+class TestOverlappedInference:
+    """A consistent model gives the same timeline with and without overlap."""
+
+    @pytest.mark.parametrize("overlap_ratio", [0.25, 0.5])
+    def test_predict_and_packer_match_non_overlapped(self, overlap_ratio):
+        data = np.random.default_rng(3).standard_normal((3, 5 * WINDOW + 10))
+        reference = WindowDataset(data, window_size=WINDOW)
+        overlapped = WindowDataset(data, window_size=WINDOW, overlap_ratio=overlap_ratio)
+        assert len(overlapped) > len(reference)
+
+        def run_predict(dataset):
+            loader = torch.utils.data.DataLoader(
+                dataset, batch_size=4, collate_fn=collate_for("recording")
+            )
+            return predict_probabilities(ChannelMean(), loader, "cpu", data.shape[1])
+
+        expected = run_predict(reference)
+        np.testing.assert_allclose(run_predict(overlapped), expected, rtol=1e-5, atol=1e-6)
+
+        packer = RecordingPacker(ChannelMean(), "cpu", collate_for("recording"), batch_size=3)
+        [(_, packed)] = packer.add("a", overlapped, data.shape[1]) + packer.flush()
+        np.testing.assert_allclose(packed, expected, rtol=1e-5, atol=1e-6)
+
+    def test_overlapped_predictions_accumulate_in_out_path(self, tmp_path):
+        data = np.random.default_rng(6).standard_normal((3, 5 * WINDOW + 10))
+        loader = torch.utils.data.DataLoader(
+            WindowDataset(data, window_size=WINDOW, overlap_ratio=0.5),
+            batch_size=4,
+            collate_fn=collate_for("recording"),
+        )
+        in_memory = predict_probabilities(ChannelMean(), loader, "cpu", data.shape[1])
+        out_path = tmp_path / "probs.npy"
+        mapped = predict_probabilities(ChannelMean(), loader, "cpu", data.shape[1], out_path)
+        assert isinstance(mapped, np.memmap)
+        np.testing.assert_array_equal(mapped, in_memory)
+        np.testing.assert_array_equal(np.load(out_path), in_memory)
+
+    def test_native_length_beyond_resampled_timeline(self):
+        # At fs != 256 callers pass the native sample count, which exceeds the
+        # 256 Hz timeline; no sample past the last window may be 0 / 0
+        fs, seq_len = 512, 2 * 4 * 15360
+        data = np.random.default_rng(5).standard_normal((19, seq_len))
+
+        def run(overlap_ratio):
+            dataset, _ = build_dataset(
+                data, fs, filter_mode="recording", overlap_ratio=overlap_ratio
+            )
+            loader = torch.utils.data.DataLoader(
+                dataset, batch_size=4, collate_fn=collate_for("recording")
+            )
+            flat = predict_probabilities(ChannelMean(), loader, "cpu", seq_len)
+            packer = RecordingPacker(ChannelMean(), "cpu", collate_for("recording"), batch_size=3)
+            [(_, packed)] = packer.add("a", dataset, seq_len) + packer.flush()
+            return flat, packed
+
+        reference, _ = run(0.0)
+        for stitched in run(0.5):
+            assert np.isfinite(stitched).all()
+            assert len(stitched) == len(reference) == 4 * 15360
+            np.testing.assert_allclose(stitched, reference, rtol=1e-5, atol=1e-6)
+
+    def test_materialized_windows_keep_starts(self):
+        data = np.random.default_rng(4).standard_normal((19, 3 * 15360))
+        dataset, collate = build_dataset(data, fs=256, overlap_ratio=0.5)
+        stack = materialize_windows(dataset, collate)
+        np.testing.assert_array_equal(stack.window_starts(), [0, 7680, 15360, 23040, 30720])
+
+        plain = materialize_windows(*build_dataset(data, fs=256))
+        assert plain.starts is None
+        np.testing.assert_array_equal(plain.window_starts(), [0, 15360, 30720])
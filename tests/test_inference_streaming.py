@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming detector, its incremental post-processing and replay.
+"""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference.dataset import get_dataloader  # noqa: E402
+from seizure_evaluation.inference.predict import predict_probabilities  # noqa: E402
+from seizure_evaluation.inference.resampling import (  # noqa: E402
+    ChunkedResampler,
+    StreamingResampler,
+)
+from seizure_evaluation.inference.streaming import (  # noqa: E402
+    StreamingPostProcessor,
+    StreamingSeizureDetector,
+    replay,
+)
+from seizure_evaluation.ovlp.post_processing import (  # noqa: E402
+    apply_seizure_transformer_postprocessing,
+)
+
+WINDOW = 15360
+
+
+class ChannelMean(torch.nn.Module):
+    """Per-sample model (output at t depends only on input at t)."""
+
+    def forward(self, x):
+        return torch.sigmoid(4 * x.mean(dim=1))
+
+
+class Power(torch.nn.Module):
+    """High probability where the (filtered, normalized) signal power is large."""
+
+    def forward(self, x):
+        return torch.sigmoid(x.pow(2).mean(dim=1) - 3)
+
+
+class WindowOffset(torch.nn.Module):
+    """Adds the window's mean, so outputs depend on the window position."""
+
+    def forward(self, x):
+        return torch.sigmoid(x.mean(dim=1) + x.mean(dim=(1, 2))[:, None])
+
+
+class BatchSizes(WindowOffset):
+    """WindowOffset that remembers the batch size of every forward."""
+
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def forward(self, x):
+        self.batch_sizes.append(x.shape[0])
+        return super().forward(x)
+
+
+def _recording(fs, seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((19, int(fs * seconds))) * 30 + 5
+
+
+def _push_randomly(detector, data, seed=0, max_chunk=3000):
+    rng = np.random.default_rng(seed)
+    updates, i = [], 0
+    while i < data.shape[1]:
+        n = int(rng.integers(1, max_chunk))
+        updates.append(detector.push(data[:, i : i + n]))
+        i += n
+    updates.append(detector.finish())
+    return updates
+
+
+def _probabilities(updates):
+    expected_start = 0
+    for update in updates:
+        assert update.start_sample == expected_start
+        expected_start += len(update.probabilities)
+    return np.concatenate([u.probabilities for u in updates])
+
+
+class TestStreamingResampler:
+    @pytest.mark.parametrize("fs", [250, 256, 512])
+    def test_matches_whole_recording(self, fs):
+        data = _recording(fs, 20)
+        resampler = StreamingResampler(fs, 19)
+        rng = np.random.default_rng(1)
+        parts, i = [], 0
+        while i < data.shape[1]:
+            n = int(rng.integers(1, 700))
+            parts.append(resampler.push(data[:, i : i + n]))
+            i += n
+        parts.append(resampler.finish())
+        np.testing.assert_array_equal(
+            np.concatenate(parts, axis=1), ChunkedResampler(fs).resample(data)
+        )
+
+
+class TestStreamingPostProcessor:
+    @pytest.mark.parametrize("seed", range(4))
+    def test_events_match_offline(self, seed):
+        rng = np.random.default_rng(seed)
+        # Runs of high/low probability with short glitches of varying length
+        lengths = rng.integers(1, 1200, size=60)
+        levels = rng.choice([0.1, 0.95], size=60)
+        probs = np.repeat(levels, lengths) + rng.normal(0, 0.05, size=lengths.sum())
+
+        processor = StreamingPostProcessor()
+        emitted, i = [], 0
+        while i < len(probs):
+            n = int(rng.integers(1, 500))
+            emitted += processor.push(probs[i : i + n])
+            i += n
+        emitted += processor.finish()
+
+        expected = apply_seizure_transformer_postprocessing(probs)
+        assert processor.events == expected
+        assert [e.kind for e in emitted] == ["onset", "offset"] * len(expected)
+        assert [e.time_sec for e in emitted] == [t for event in expected for t in event]
+
+
+class TestStreamingSeizureDetector:
+    def test_fixed_stats_match_offline_recording_mode(self):
+        fs = 250
+        data = _recording(fs, 150)
+        mean, std = data.mean(axis=1), data.std(axis=1)
+        detector = StreamingSeizureDetector(ChannelMean(), fs, hop_sec=2.5, mean=mean, std=std)
+        streamed = _probabilities(_push_randomly(detector, data))
+        assert len(streamed) == int(data.shape[1] * 256 / fs)
+
+        loader = get_dataloader(
+            data, fs, batch_size=4, filter_mode="recording", resample_method="polyphase"
+        )
+        offline = predict_probabilities(ChannelMean(), loader, "cpu", len(streamed))
+        np.testing.assert_allclose(streamed, offline, rtol=1e-5, atol=1e-5)
+
+    def test_each_hop_scores_the_latest_window(self):
+        data = _recording(256, 75)
+        stats = {"mean": data.mean(axis=1), "std": data.std(axis=1)}
+        hop = 1024
+        detector = StreamingSeizureDetector(WindowOffset(), 256, hop_sec=hop / 256, **stats)
+        streamed = _probabilities(_push_randomly(detector, data, max_chunk=5000))
+        assert len(streamed) == data.shape[1]
+        assert detector.model_runs == 1 + (data.shape[1] - WINDOW) // hop + 1
+
+        # The samples emitted by the hop ending at `stop` come from the window [stop - W, stop)
+        stop = WINDOW + 3 * hop
+        reference = StreamingSeizureDetector(WindowOffset(), 256, hop_sec=hop / 256, **stats)
+        reference.push(data[:, :stop])
+        window = torch.from_numpy(reference._window()[None])
+        expected = WindowOffset()(window).numpy()[0, -hop:]
+        np.testing.assert_allclose(streamed[stop - hop : stop], expected, rtol=1e-6)
+
+    def test_large_chunk_runs_in_capped_batches(self):
+        data = _recording(256, 90)
+        stats = {"mean": data.mean(axis=1), "std": data.std(axis=1)}
+        model = BatchSizes()
+        detector = StreamingSeizureDetector(model, 256, hop_sec=1.0, batch_size=8, **stats)
+        update = detector.push(data)  # 31 windows due at once
+        assert max(model.batch_sizes) == 8
+        assert sum(model.batch_sizes) == 31
+
+        reference = StreamingSeizureDetector(WindowOffset(), 256, hop_sec=1.0, **stats)
+        expected = reference.push(data)
+        np.testing.assert_allclose(update.probabilities, expected.probabilities, rtol=1e-6)
+        assert update.events == expected.events
+
+    def test_short_stream_is_zero_padded(self):
+        data = _recording(256, 10)
+        detector = StreamingSeizureDetector(ChannelMean(), 256)
+        updates = _push_randomly(detector, data)
+        assert all(len(u.probabilities) == 0 for u in updates[:-1])
+        assert len(updates[-1].probabilities) == data.shape[1]
+
+    def test_latency_bounds(self):
+        detector = StreamingSeizureDetector(ChannelMean(), 250, hop_sec=1.0)
+        bounds = detector.latency_bound_sec
+        assert 1.0 < bounds["probabilities"] < 1.1
+        assert bounds["onset_event"] == pytest.approx(bounds["offset_event"] + 2.0)
+
+
+class TestReplay:
+    def test_paced_replay_reports_events(self):
+        fs = 256
+        data = _recording(fs, 90)
+        # 10 s high-amplitude 5 Hz burst, phase-shifted per channel (constant mean power)
+        t = np.arange(10 * fs) / fs
+        phases = 2 * np.pi * np.arange(19)[:, None] / 19
+        data[:, 70 * fs : 80 * fs] += 300 * np.sin(2 * np.pi * 5 * t + phases)
+        now = [0.0]
+
+        report = replay(
+            StreamingSeizureDetector(Power(), fs, hop_sec=1.0),
+            data,
+            fs,
+            chunk_sec=1.0,
+            speed=10.0,
+            clock=lambda: now[0],
+            sleep=lambda s: now.__setitem__(0, now[0] + s),
+        )
+        assert report.wall_sec == pytest.approx(9.0)
+        assert len(report.probabilities) == data.shape[1]
+        assert report.events == apply_seizure_transformer_postprocessing(report.probabilities)
+        assert report.events
+        summary = report.summary()
+        assert summary["chunks"] == 90
+        assert [e["kind"] for e in summary["event_log"]][:2] == ["onset", "offset"]
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the preprocessed-window cache.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference.dataset import get_dataloader  # noqa: E402
+from seizure_evaluation.inference.pipeline import prepare_recording  # noqa: E402
+from seizure_evaluation.inference.window_cache import WindowCache  # noqa: E402
+
+LOADED: list[str] = []
+
+
+def _loader(edf_path: Path):
+    LOADED.append(edf_path.stem)
+    rng = np.random.default_rng(len(edf_path.stem))
+    return rng.standard_normal((19, 2 * 15360 + 700)), 250, "pyedflib"
+
+
+@pytest.fixture
+def edf(tmp_path):
+    LOADED.clear()
+    path = tmp_path / "rec.edf"
+    path.write_bytes(b"edf content")
+    return path
+
+
+def _batches(windows):
+    return np.concatenate([b.numpy() for b in get_dataloader(windows, fs=None, batch_size=2)])
+
+
+class TestWindowCache:
+    @pytest.mark.parametrize("filter_mode", ["window", "recording"])
+    def test_hit_skips_decoding_and_matches_uncached(self, tmp_path, edf, filter_mode):
+        cache = WindowCache(tmp_path / "cache")
+        uncached = prepare_recording(0, edf, _loader, filter_mode=filter_mode)
+        first = prepare_recording(0, edf, _loader, filter_mode=filter_mode, window_cache=cache)
+        LOADED.clear()
+        second = prepare_recording(0, edf, _loader, filter_mode=filter_mode, window_cache=cache)
+
+        assert LOADED == []
+        assert isinstance(second.windows.windows, np.memmap)
+        assert (second.seq_len, second.load_method) == (uncached.seq_len, "pyedflib")
+        np.testing.assert_array_equal(first.windows.windows, uncached.windows.windows)
+        np.testing.assert_array_equal(_batches(second.windows), uncached.windows.windows)
+        assert (first.window_cache_status, second.window_cache_status) == ("stored", "hit")
+        for prepared in (first, second):
+            cache.record(prepared.window_cache_status)
+        assert cache.stats()["hits"] == 1 and cache.stats()["stores"] == 1
+
+    def test_config_and_content_are_part_of_the_key(self, tmp_path, edf):
+        cache = WindowCache(tmp_path / "cache")
+        prepare_recording(0, edf, _loader, window_cache=cache)
+        assert cache.get(edf, filter_mode="recording") is None
+        assert cache.get(edf, resample_method="polyphase") is None
+        assert cache.get(edf) is not None
+
+        edf.write_bytes(b"other edf content")
+        assert cache.get(edf) is None
+
+    def test_float16_entries(self, tmp_path, edf):
+        cache = WindowCache(tmp_path / "cache", dtype="float16")
+        reference = prepare_recording(0, edf, _loader).windows.windows
+        first = prepare_recording(0, edf, _loader, window_cache=cache)
+        second = prepare_recording(0, edf, _loader, window_cache=cache)
+
+        assert second.windows.windows.dtype == np.float16
+        batches = _batches(second.windows)
+        assert batches.dtype == np.float32
+        # Miss and hit serve the same rounded values
+        np.testing.assert_array_equal(_batches(first.windows), batches)
+        np.testing.assert_allclose(batches, reference, rtol=1e-3, atol=1e-3)
+
+    def test_overlap_starts_round_trip(self, tmp_path, edf):
+        cache = WindowCache(tmp_path / "cache")
+        first = prepare_recording(0, edf, _loader, overlap_ratio=0.5, window_cache=cache)
+        second = prepare_recording(0, edf, _loader, overlap_ratio=0.5, window_cache=cache)
+        np.testing.assert_array_equal(second.windows.window_starts(), [0, 7680, 15360, 23040])
+        np.testing.assert_array_equal(second.windows.starts, first.windows.starts)
+
+    def test_rejects_unknown_dtype(self, tmp_path):
+        with pytest.raises(ValueError, match="dtype"):
+            WindowCache(tmp_path, dtype="int8")
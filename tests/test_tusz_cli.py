@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Tests for the tusz-eval driver loop (model and EDF loading stubbed out).
+"""
+
+import json
+import pickle
+import sys
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("wu_2025.utils")
+
+from seizure_evaluation.inference.autotune import TuneResult  # noqa: E402
+from seizure_evaluation.tusz import cli, merge  # noqa: E402
+
+LENGTHS = {"rec_a": 15360 * 2 + 100, "rec_b": 4000, "rec_c": 15360 * 3}
+
+
+class ChannelMean(torch.nn.Module):
+    def forward(self, x):
+        return torch.sigmoid(x.mean(dim=1))
+
+
+def _fake_load_recording(edf_path):
+    if edf_path.stem == "rec_bad":
+        raise ValueError("Wrong channels: 20")
+    seed = sorted(LENGTHS).index(edf_path.stem)
+    data = np.random.default_rng(seed).standard_normal((19, LENGTHS[edf_path.stem]))
+    return data, 256, "pyedflib"
+
+
+def _fake_load_models(device):
+    return ChannelMean()
+
+
+@pytest.fixture
+def fake_tusz(tmp_path, monkeypatch):
+    data_dir = tmp_path / "edf"
+    data_dir.mkdir()
+    for name in [*LENGTHS, "rec_bad"]:
+        (data_dir / f"{name}.edf").write_bytes(b"")
+    monkeypatch.setattr(cli, "load_recording", _fake_load_recording)
+    monkeypatch.setattr(cli, "load_models", _fake_load_models)
+    return data_dir, tmp_path / "out"
+
+
+def _run(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["tusz-eval", *argv])
+    cli.main()
+
+
+@pytest.mark.parametrize("prefetch_workers", ["0", "2"])
+def test_packed_results_match_per_file_processing(fake_tusz, monkeypatch, prefetch_workers):
+    data_dir, out_dir = fake_tusz
+    _run(
+        monkeypatch,
+        "--data_dir",
+        str(data_dir),
+        "--out_dir",
+        str(out_dir),
+        "--batch_size",
+        "4",
+        "--prefetch_workers",
+        prefetch_workers,
+    )
+
+    with open(out_dir / "checkpoint.pkl", "rb") as f:
+        checkpoint = pickle.load(f)
+    results = checkpoint["results"]
+    assert checkpoint["next_idx"] == 4
+    assert set(results) == {*LENGTHS, "rec_bad"}
+    assert results["rec_bad"]["error"] == "Wrong channels: 20"
+    assert results["rec_bad"]["predictions"] is None
+
+    model = ChannelMean()
+    for file_id, n_samples in LENGTHS.items():
+        entry = results[file_id]
+        assert entry["error"] is None
+        assert entry["load_method"] == "pyedflib"
+        assert len(entry["predictions"]) == n_samples
+        expected, error, _ = cli.process_single_file(
+            data_dir / f"{file_id}.edf", model, "cpu", batch_size=512
+        )
+        assert error is None
+        np.testing.assert_allclose(entry["predictions"], expected, rtol=1e-5, atol=1e-6)
+
+
+def test_local_workers_merge_matches_serial(fake_tusz, monkeypatch):
+    data_dir, out_dir = fake_tusz
+    serial_dir = out_dir.parent / "serial"
+    _run(monkeypatch, "--data_dir", str(data_dir), "--out_dir", str(serial_dir))
+    _run(
+        monkeypatch,
+        "--data_dir",
+        str(data_dir),
+        "--out_dir",
+        str(out_dir),
+        "--workers",
+        "2",
+        "--threads_per_worker",
+        "1",
+    )
+
+    with open(serial_dir / "checkpoint.pkl", "rb") as f:
+        serial = pickle.load(f)
+    with open(out_dir / "checkpoint.pkl", "rb") as f:
+        sharded = pickle.load(f)
+
+    assert sharded["next_idx"] == serial["next_idx"] == 4
+    assert list(sharded["results"]) == list(serial["results"])
+    assert sorted(p.name for p in (out_dir / "shards").iterdir()) == ["shard_00", "shard_01"]
+    for file_id, entry in serial["results"].items():
+        other = sharded["results"][file_id]
+        assert other["error"] == entry["error"]
+        if entry["predictions"] is not None:
+            np.testing.assert_allclose(other["predictions"], entry["predictions"], rtol=1e-5)
+
+
+def test_local_workers_refuse_resume_with_other_worker_count(fake_tusz, monkeypatch):
+    data_dir, out_dir = fake_tusz
+    for size, path in enumerate(sorted(data_dir.glob("*.edf")), start=1):
+        path.write_bytes(b"x" * size)  # distinct sizes spread the files over the workers
+    args = ["--data_dir", str(data_dir), "--out_dir", str(out_dir), "--threads_per_worker", "1"]
+    _run(monkeypatch, *args, "--workers", "2")
+    with open(out_dir / "shards" / "shard_00" / "checkpoint.pkl", "rb") as f:
+        shard = pickle.load(f)["shard"]
+    assert shard["index"] == 0
+    assert shard["num_shards"] == 2
+    assert all(name.endswith(".edf") and "/" not in name for name in shard["files"])
+
+    # The same split resumes, even with the data dir spelled differently;
+    # another worker count would mis-index next_idx
+    monkeypatch.chdir(data_dir.parent)
+    _run(monkeypatch, *args[2:], "--data_dir", "./edf", "--workers", "2")
+    with pytest.raises(ValueError, match="different file list"):
+        _run(monkeypatch, *args, "--workers", "3")
+
+
+def test_autotune_times_the_compiled_model(fake_tusz, monkeypatch):
+    data_dir, out_dir = fake_tusz
+    compiled_batch_sizes, tuned = [], {}
+
+    def fake_load_compiled(device, batch_size, cache_dir, loader):
+        compiled_batch_sizes.append(batch_size)
+        return loader(device)
+
+    def fake_autotune(measure, budget, variant, threads, cache_file):
+        tuned["variant"] = variant
+        measure(2, 1)
+        return TuneResult(batch_size=4, threads=1, windows_per_sec=1.0, peak_rss_bytes=0)
+
+    monkeypatch.setattr(cli, "load_compiled", fake_load_compiled)
+    monkeypatch.setattr(cli, "autotune", fake_autotune)
+    monkeypatch.setattr(torch, "set_num_threads", lambda n: None)
+    _run(
+        monkeypatch,
+        "--data_dir",
+        str(data_dir),
+        "--out_dir",
+        str(out_dir),
+        "--autotune",
+        "--compile",
+        "--batch_size",
+        "2",
+    )
+    assert "compile=True" in tuned["variant"]
+    # Calibration at the initial batch size, then the run at the tuned one
+    assert compiled_batch_sizes == [2, 4]
+
+
+def test_multi_node_shards_merge_to_serial_layout(fake_tusz, monkeypatch):
+    data_dir, out_dir = fake_tusz
+    serial_dir = out_dir.parent / "serial"
+    _run(monkeypatch, "--data_dir", str(data_dir), "--out_dir", str(serial_dir))
+
+    shard_files = []
+    for index in range(2):
+        shard_dir = out_dir.parent / f"node{index}"
+        _run(
+            monkeypatch,
+            "--data_dir",
+            str(data_dir),
+            "--out_dir",
+            str(shard_dir),
+            "--shard-index",
+            str(index),
+            "--num-shards",
+            "2",
+        )
+        shard_files.append(str(shard_dir / "checkpoint.pkl"))
+
+    monkeypatch.setattr(
+        sys, "argv", ["tusz-merge", "--shards", *shard_files, "--out_dir", str(out_dir)]
+    )
+    assert merge.main() == 0
+
+    with open(serial_dir / "checkpoint.pkl", "rb") as f:
+        serial = pickle.load(f)
+    with open(out_dir / "checkpoint.pkl", "rb") as f:
+        merged = pickle.load(f)
+    assert merged["next_idx"] == serial["next_idx"]
+    assert list(merged["results"]) == list(serial["results"])
+
+    # Dropping a shard is detected and blocks the merge
+    monkeypatch.setattr(
+        sys, "argv", ["tusz-merge", "--shards", shard_files[0], "--out_dir", str(out_dir / "x")]
+    )
+    assert merge.main() == 1
+    assert not (out_dir / "x" / "checkpoint.pkl").exists()
+
+
+def test_chunked_mode_matches_default(fake_tusz, monkeypatch):
+    data_dir, out_dir = fake_tusz
+    default_dir = out_dir.parent / "default"
+    _run(monkeypatch, "--data_dir", str(data_dir), "--out_dir", str(default_dir))
+    _run(
+        monkeypatch,
+        "--data_dir",
+        str(data_dir),
+        "--out_dir",
+        str(out_dir),
+        "--chunked",
+        "--batch_size",
+        "2",
+    )
+
+    with open(default_dir / "checkpoint.pkl", "rb") as f:
+        default = pickle.load(f)["results"]
+    with open(out_dir / "checkpoint.pkl", "rb") as f:
+        chunked = pickle.load(f)["results"]
+
+    assert list(chunked) == list(default)
+    assert chunked["rec_bad"]["error"] == "Wrong channels: 20"
+    for file_id in LENGTHS:
+        assert (out_dir / "predictions" / f"{file_id}.npy").exists()
+        np.testing.assert_allclose(
+            chunked[file_id]["predictions"], default[file_id]["predictions"], rtol=1e-5, atol=1e-6
+        )
+
+
+def test_prediction_cache_skips_decoding_on_rerun(fake_tusz, monkeypatch):
+    data_dir, out_dir = fake_tusz
+    for path in data_dir.glob("*.edf"):
+        path.write_bytes(path.stem.encode())  # distinct content per recording
+    cache_dir = out_dir.parent / "cache"
+    loaded = []
+
+    def counting_loader(edf_path):
+        loaded.append(edf_path.stem)
+        return _fake_load_recording(edf_path)
+
+    models_loaded = []
+
+    def counting_models(device):
+        models_loaded.append(device)
+        return _fake_load_models(device)
+
+    weights = out_dir.parent / "model.pth"
+    weights.write_bytes(b"weights")
+    monkeypatch.setattr(cli, "load_recording", counting_loader)
+    monkeypatch.setattr(cli, "load_models", counting_models)
+    monkeypatch.setattr(cli, "default_weights_file", lambda: weights)
+    cache_args = ["--prediction_cache", "--prediction_cache_dir", str(cache_dir)]
+    first_dir, second_dir = out_dir / "first", out_dir / "second"
+    _run(monkeypatch, "--data_dir", str(data_dir), "--out_dir", str(first_dir), *cache_args)
+    assert sorted(loaded) == sorted([*LENGTHS, "rec_bad"])
+    assert len(models_loaded) == 1
+
+    loaded.clear()
+    _run(monkeypatch, "--data_dir", str(data_dir), "--out_dir", str(second_dir), *cache_args)
+    assert loaded == ["rec_bad"]  # failures are not cached
+    assert len(models_loaded) == 2  # rec_bad missed
+
+    # Fully cached: neither decoding nor the model is needed
+    loaded.clear()
+    models_loaded.clear()
+    (data_dir / "rec_bad.edf").rename(out_dir.parent / "rec_bad.edf")
+    _run(
+        monkeypatch, "--data_dir", str(data_dir), "--out_dir", str(out_dir / "cached"), *cache_args
+    )
+    assert loaded == []
+    assert models_loaded == []
+    (out_dir.parent / "rec_bad.edf").rename(data_dir / "rec_bad.edf")
+
+    with open(first_dir / "checkpoint.pkl", "rb") as f:
+        first = pickle.load(f)["results"]
+    with open(second_dir / "checkpoint.pkl", "rb") as f:
+        second = pickle.load(f)["results"]
+    assert list(second) == list(first)
+    for file_id in LENGTHS:
+        np.testing.assert_array_equal(second[file_id]["predictions"], first[file_id]["predictions"])
+        assert second[file_id]["load_method"] == "pyedflib"
+
+    # A different preprocessing flag misses the cache
+    loaded.clear()
+    _run(
+        monkeypatch,
+        "--data_dir",
+        str(data_dir),
+        "--out_dir",
+        str(out_dir / "third"),
+        "--filter_mode",
+        "recording",
+        *cache_args,
+    )
+    assert len(loaded) == len(LENGTHS) + 1
+
+
+class OnnxLikeChannelMean:
+    """Non-`nn.Module` model (no state_dict), like `OnnxRuntimeModel`."""
+
+    def eval(self):
+        return self
+
+    def __call__(self, batch):
+        return torch.sigmoid(torch.as_tensor(batch).mean(dim=1)).numpy()
+
+
+def test_prediction_cache_keys_user_onnx_model_by_content(fake_tusz, monkeypatch):
+    data_dir, out_dir = fake_tusz
+    for path in data_dir.glob("*.edf"):
+        path.write_bytes(path.stem.encode())
+    onnx_file = out_dir.parent / "model.onnx"
+    onnx_file.write_bytes(b"export 1")
+    loaded = []
+
+    def counting_loader(edf_path):
+        loaded.append(edf_path.stem)
+        return _fake_load_recording(edf_path)
+
+    monkeypatch.setattr(cli, "load_recording", counting_loader)
+    monkeypatch.setattr(cli, "default_weights_file", lambda: None)
+    monkeypatch.setattr(cli, "load_onnxruntime", lambda device, **kwargs: OnnxLikeChannelMean())
+    args = [
+        "--data_dir",
+        str(data_dir),
+        "--backend",
+        "onnxruntime",
+        "--onnx_model",
+        str(onnx_file),
+        "--prediction_cache",
+        "--prediction_cache_dir",
+        str(out_dir.parent / "cache"),
+    ]
+    _run(monkeypatch, *args, "--out_dir", str(out_dir / "first"))
+    loaded.clear()
+    _run(monkeypatch, *args, "--out_dir", str(out_dir / "second"))
+    assert loaded == ["rec_bad"]
+
+    # Another export at the same path misses the cache
+    onnx_file.write_bytes(b"second export")
+    loaded.clear()
+    _run(monkeypatch, *args, "--out_dir", str(out_dir / "third"))
+    assert len(loaded) == len(LENGTHS) + 1
+
+
+def test_window_cache_skips_decoding_on_rerun(fake_tusz, monkeypatch):
+    data_dir, out_dir = fake_tusz
+    for path in data_dir.glob("*.edf"):
+        path.write_bytes(path.stem.encode())
+    loaded = []
+
+    def counting_loader(edf_path):
+        loaded.append(edf_path.stem)
+        return _fake_load_recording(edf_path)
+
+    monkeypatch.setattr(cli, "load_recording", counting_loader)
+    cache_args = ["--window_cache", "--window_cache_dir", str(out_dir.parent / "windows")]
+    first_dir, second_dir = out_dir / "first", out_dir / "second"
+    _run(monkeypatch, "--data_dir", str(data_dir), "--out_dir", str(first_dir), *cache_args)
+    loaded.clear()
+    _run(monkeypatch, "--data_dir", str(data_dir), "--out_dir", str(second_dir), *cache_args)
+    assert loaded == ["rec_bad"]
+
+    with open(first_dir / "checkpoint.pkl", "rb") as f:
+        first = pickle.load(f)["results"]
+    with open(second_dir / "checkpoint.pkl", "rb") as f:
+        second = pickle.load(f)["results"]
+    for file_id in LENGTHS:
+        np.testing.assert_array_equal(second[file_id]["predictions"], first[file_id]["predictions"])
+        assert second[file_id]["load_method"] == "pyedflib"
+
+    def window_cache_stats(run_dir):
+        return json.loads((run_dir / "results.json").read_text())["window_cache"]
+
+    assert window_cache_stats(first_dir)["stores"] == len(LENGTHS)
+    assert window_cache_stats(second_dir)["hits"] == len(LENGTHS)
+    assert window_cache_stats(second_dir)["misses"] == 1  # rec_bad is never stored
+
+    # Counts from prefetch and shard worker processes reach results.json
+    monkeypatch.setattr(cli, "load_recording", _fake_load_recording)  # picklable
+    sharded_dir = out_dir / "sharded"
+    _run(
+        monkeypatch,
+        "--data_dir",
+        str(data_dir),
+        "--out_dir",
+        str(sharded_dir),
+        "--workers",
+        "2",
+        "--threads_per_worker",
+        "1",
+        "--prefetch_workers",
+        "1",
+        *cache_args,
+    )
+    stats = window_cache_stats(sharded_dir)
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (len(LENGTHS), 1, 0)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-node sharding and shard checkpoint merging.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from seizure_evaluation.tusz.sharding import (
+    balanced_shards,
+    edf_duration_sec,
+    merge_shard_checkpoints,
+)
+
+
+def _write_edf_header(path: Path, n_records: int, record_duration: float) -> Path:
+    header = bytearray(b" " * 256)
+    header[236:244] = f"{n_records:<8d}".encode("ascii")
+    header[244:252] = f"{record_duration:<8g}".encode("ascii")
+    path.write_bytes(bytes(header))
+    return path
+
+
+def _entry(value: float) -> dict:
+    return {"predictions": [value], "seizure_events": [], "error": None, "load_method": "pyedflib"}
+
+
+class TestEdfDuration:
+    def test_reads_header(self, tmp_path):
+        path = _write_edf_header(tmp_path / "a.edf", 300, 1.0)
+        assert edf_duration_sec(path) == 300.0
+
+    def test_falls_back_to_size(self, tmp_path):
+        path = tmp_path / "broken.edf"
+        path.write_bytes(b"x" * 100)
+        assert edf_duration_sec(path) == 100.0
+
+
+class TestBalancedShards:
+    def test_partition_is_complete_and_balanced(self, tmp_path):
+        durations = [3600, 1800, 1800, 600, 600, 600, 300, 300]
+        files = [_write_edf_header(tmp_path / f"f{i}.edf", d, 1.0) for i, d in enumerate(durations)]
+        shards = balanced_shards(files, 3)
+
+        assert sorted(p for shard in shards for p in shard) == sorted(files)
+        totals = [sum(edf_duration_sec(p) for p in shard) for shard in shards]
+        assert max(totals) - min(totals) <= 600
+        assert all(shard == sorted(shard) for shard in shards)
+
+    def test_deterministic_regardless_of_input_order(self, tmp_path):
+        files = [_write_edf_header(tmp_path / f"f{i}.edf", 100 * (i % 4), 1.0) for i in range(9)]
+        assert balanced_shards(files, 4) == balanced_shards(list(reversed(files)), 4)
+
+    def test_rejects_zero_shards(self):
+        with pytest.raises(ValueError):
+            balanced_shards([], 0)
+
+
+class TestMergeShardCheckpoints:
+    def _shard(self, index, num_shards, files, results):
+        return {
+            "results": results,
+            "next_idx": len(files),
+            "shard": {"index": index, "num_shards": num_shards, "files": files},
+        }
+
+    def test_merge_orders_by_relative_path(self):
+        shards = [
+            self._shard(1, 2, ["s2/b.edf"], {"b": _entry(2)}),
+            self._shard(0, 2, ["s1/c.edf", "s3/a.edf"], {"a": _entry(1), "c": _entry(3)}),
+        ]
+        merged, report = merge_shard_checkpoints(shards)
+
+        assert list(merged["results"]) == ["c", "b", "a"]
+        assert merged["next_idx"] == 3
+        assert report["duplicates"] == {}
+        assert report["missing"] == []
+        assert report["missing_shards"] == []
+
+    def test_detects_missing_duplicates_and_absent_shards(self):
+        shards = [
+            self._shard(0, 3, ["a.edf", "b.edf"], {"a": _entry(1)}),
+            self._shard(1, 3, ["c.edf"], {"c": _entry(3), "a": _entry(9)}),
+        ]
+        merged, report = merge_shard_checkpoints(shards)
+
+        assert report["missing"] == ["b"]
+        assert report["duplicates"] == {"a": [0, 1]}
+        assert report["missing_shards"] == [2]
+        assert merged["results"]["a"]["predictions"] == [1]